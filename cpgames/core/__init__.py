@@ -1,7 +1,9 @@
 '''initialize'''
-from .games import (
-    SkiGame, MazeGame, PacmanGame, GemGemGame, TankWarGame, SokobanGame, PingpongGame, TRexRushGame, 
-    BomberManGame, WhacAMoleGame, CatchCoinsGame, FlappyBirdGame, AngryBirdsGame, MagicTowerGame, AircraftWarGame, BunnyBadgerGame,
-    MineSweeperGame, GreedySnakeGame, PuzzlePiecesGame, TowerDefenseGame, AlienInvasionGame, BreakoutcloneGame,
-    TwoZeroFourEightGame, BloodFootballGame
-)
\ No newline at end of file
+from .games import GameRegistry, SUPPORTED_GAMES
+from .runner import GameProcess, GameWorker, GameWorkerPool
+
+
+'''the game classes are imported lazily, e.g., `from cpgames.core import SkiGame` only imports the ski package'''
+def __getattr__(name):
+    from . import games
+    return getattr(games, name)
@@ -1,25 +1,18 @@
 '''initialize'''
-from .ski import SkiGame
-from .maze import MazeGame
-from .pacman import PacmanGame
-from .gemgem import GemGemGame
-from .tankwar import TankWarGame
-from .sokoban import SokobanGame
-from .pingpong import PingpongGame
-from .trexrush import TRexRushGame
-from .bomberman import BomberManGame
-from .whacamole import WhacAMoleGame
-from .catchcoins import CatchCoinsGame
-from .flappybird import FlappyBirdGame
-from .angrybirds import AngryBirdsGame
-from .magictower import MagicTowerGame
-from .aircraftwar import AircraftWarGame
-from .bunnybadger import BunnyBadgerGame
-from .minesweeper import MineSweeperGame
-from .greedysnake import GreedySnakeGame
-from .puzzlepieces import PuzzlePiecesGame
-from .towerdefense import TowerDefenseGame
-from .alieninvasion import AlienInvasionGame
-from .breakoutclone import BreakoutcloneGame
-from .bloodfootball import BloodFootballGame
-from .twozerofoureight import TwoZeroFourEightGame
+from .registry import GameRegistry, SUPPORTED_GAMES
+
+
+'''the game classes are imported lazily, e.g., `from cpgames.core.games import SkiGame` only imports the ski package'''
+def __getattr__(name):
+    registry = _getdefaultregistry()
+    key = registry.findkey(name)
+    if key is None: raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return registry.load(key)
+
+
+'''the registry shared by the module level lazy imports'''
+_default_registry = None
+def _getdefaultregistry():
+    global _default_registry
+    if _default_registry is None: _default_registry = GameRegistry(package=__name__)
+    return _default_registry
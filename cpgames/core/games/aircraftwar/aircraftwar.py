@@ -1,7 +1,7 @@
 import os
 import pygame
 import random
-from ...utils import QuitGame
+from ...utils import QuitGame, SharedTextCache
 from ..base import PygameBaseGame
 from .modules import Bullet, Ship, Asteroid, StartInterface, EndInterface
 
@@ -262,16 +262,16 @@ class AircraftWarGame(PygameBaseGame):
             
             score_1_text = f'Player 1 Score: {score_1}'
             lives_1_text = f'Lives: {player1.lives}'
-            text_1_score = font_score.render(score_1_text, True, (0, 0, 255))
-            text_1_lives = font_score.render(lives_1_text, True, (0, 0, 255))
+            text_1_score = SharedTextCache.render(font_score, score_1_text, (0, 0, 255))
+            text_1_lives = SharedTextCache.render(font_score, lives_1_text, (0, 0, 255))
             self.screen.blit(text_1_score, (10, 10))
             self.screen.blit(text_1_lives, (10, 40))
 
             if self.game_type == 2 and player2:
                 score_2_text = f'Player 2 Score: {score_2}'
                 lives_2_text = f'Lives: {player2.lives}'
-                text_2_score = font_score.render(score_2_text, True, (255, 0, 0))
-                text_2_lives = font_score.render(lives_2_text, True, (255, 0, 0))
+                text_2_score = SharedTextCache.render(font_score, score_2_text, (255, 0, 0))
+                text_2_lives = SharedTextCache.render(font_score, lives_2_text, (255, 0, 0))
                 self.screen.blit(text_2_score, (self.cfg.SCREENSIZE[0] - text_2_score.get_width() - 10, 10))
                 self.screen.blit(text_2_lives, (self.cfg.SCREENSIZE[0] - text_2_lives.get_width() - 10, 40))
 
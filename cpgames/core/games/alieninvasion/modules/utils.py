@@ -1,5 +1,5 @@
 import pygame
-from ....utils import QuitGame
+from ....utils import QuitGame, SharedTextCache
 import random
 
 # A simple class for background stars
@@ -23,21 +23,10 @@ class BackgroundStar:
 
 def showText(screen, text, color, font, x, y):
     """
-    Renders text with a subtle glow effect (by drawing multiple offset layers).
+    Renders text with a subtle glow effect (four slightly brighter offset copies under the text).
+    The composed text comes from the shared text cache, so unchanged HUD strings are not re-rendered.
     """
-    # Offset values for "glow" effect
-    offsets = [(1, 1), (-1, -1), (1, -1), (-1, 1)] # Simple 4-way offset
-    glow_color = (min(255, color[0]+50), min(255, color[1]+50), min(255, color[2]+50)) # Slightly brighter
-    dark_color = (max(0, color[0]-50), max(0, color[1]-50), max(0, color[2]-50)) # Slightly darker
-
-    # Draw "shadow" or outline for glow
-    for ox, oy in offsets:
-        text_surface_glow = font.render(text, True, glow_color)
-        screen.blit(text_surface_glow, (x + ox, y + oy))
-
-    # Draw main text
-    text_surface = font.render(text, True, color)
-    screen.blit(text_surface, (x, y))
+    SharedTextCache.blit(screen, font, text, color, (x, y), effect='glow')
 
 
 def showLife(screen, num_life, color):
@@ -2,8 +2,9 @@
 import math
 import pygame
 from ....utils import QuitGame
-from .misc import VectorAddition, VelocityVector
+from .physics import PhysicsWorld
 from .sprites import Pig, Bird, Block, Slingshot, Slab, Button, Label
+from .trajectory import TrajectoryPredictor
 
 
 class GameLevels():
@@ -25,12 +26,11 @@ class GameLevels():
         if len(pigs) == 0: return status_codes['victory']
         elif len(birds) == 0: return status_codes['failure']
         else: return status_codes['gaming']
-    '''Are all elements stationary?'''
-    def still(self, sprites_list, threshold=0.15):
-        for sprite in sprites_list:
-            if sprite.velocity.magnitude >= threshold:
-                return False
-        return True
+    '''Axis of a collision between two round bodies whose centres are (dx, dy) apart: cos and sin of twice its angle, and the unit normal'''
+    def collisionaxis(self, dx, dy, dist):
+        if dist == 0: return 1, 0, 1, 0
+        nx, ny = dx / dist, dy / dist
+        return nx * nx - ny * ny, 2 * nx * ny, nx, ny
     '''Collision Detection'''
     def collision(self, sprite1, sprite2):
         is_collision = False
@@ -39,117 +39,110 @@ class GameLevels():
             dx, dy = sprite1.loc_info[0] - sprite2.loc_info[0], sprite1.loc_info[1] - sprite2.loc_info[1]
             dist = math.hypot(dx, dy)
             if dist < sprite1.loc_info[2] + sprite2.loc_info[2]:
-                tangent = math.atan2(dy, dx)
-                angle = 0.5 * math.pi + tangent
-                angle1, angle2 = 2 * tangent - sprite1.velocity.angle, 2 * tangent - sprite2.velocity.angle
+                # The bodies swap speeds, each one leaving along its own direction mirrored about the line between the centres
+                cos2, sin2, nx, ny = self.collisionaxis(dx, dy, dist)
                 magnitude1, magnitude2 = sprite2.velocity.magnitude, sprite1.velocity.magnitude
-                sprite1.velocity, sprite2.velocity = VelocityVector(magnitude1, angle1), VelocityVector(magnitude2, angle2)
-                sprite1.velocity.magnitude *= elasticity
-                sprite2.velocity.magnitude *= elasticity
+                sprite1.velocity, sprite2.velocity = sprite1.velocity.mirrored(magnitude1 * elasticity, cos2, sin2), sprite2.velocity.mirrored(magnitude2 * elasticity, cos2, sin2)
                 overlap = 0.5 * (sprite1.loc_info[2] + sprite2.loc_info[2] - dist + 1)
-                sprite1.loc_info[0] += math.sin(angle) * overlap
-                sprite1.loc_info[1] -= math.cos(angle) * overlap
-                sprite2.loc_info[0] -= math.sin(angle) * overlap
-                sprite2.loc_info[1] += math.cos(angle) * overlap
+                sprite1.loc_info[0] += nx * overlap
+                sprite1.loc_info[1] += ny * overlap
+                sprite2.loc_info[0] -= nx * overlap
+                sprite2.loc_info[1] -= ny * overlap
                 is_collision = True
         elif sprite1.type in ['pig', 'bird'] and sprite2.type in ['block']:
             dx, dy = sprite1.loc_info[0] - sprite2.loc_info[0], sprite1.loc_info[1] - sprite2.loc_info[1]
             dist = math.hypot(dx, dy)
             if dist < sprite1.loc_info[2] + sprite2.rect.width:
-                tangent = math.atan2(dy, dx)
-                angle = 0.5 * math.pi + tangent
-                angle1, angle2 = 2 * tangent - sprite1.velocity.angle, 2 * tangent - sprite2.velocity.angle
+                cos2, sin2, nx, ny = self.collisionaxis(dx, dy, dist)
                 magnitude1, magnitude2 = sprite2.velocity.magnitude, sprite1.velocity.magnitude
-                sprite1.velocity, sprite2.velocity = VelocityVector(magnitude1, angle1), VelocityVector(magnitude2, angle2)
-                sprite1.velocity.magnitude *= elasticity
-                sprite2.velocity.magnitude *= block_elasticity
+                sprite1.velocity, sprite2.velocity = sprite1.velocity.mirrored(magnitude1 * elasticity, cos2, sin2), sprite2.velocity.mirrored(magnitude2 * block_elasticity, cos2, sin2)
                 overlap = 0.5 * (sprite1.loc_info[2] + sprite2.rect.width - dist + 1)
-                sprite1.loc_info[0] += math.sin(angle) * overlap
-                sprite1.loc_info[1] -= math.cos(angle) * overlap
-                sprite2.loc_info[0] -= math.sin(angle) * overlap
-                sprite2.loc_info[1] += math.cos(angle) * overlap
+                sprite1.loc_info[0] += nx * overlap
+                sprite1.loc_info[1] += ny * overlap
+                sprite2.loc_info[0] -= nx * overlap
+                sprite2.loc_info[1] -= ny * overlap
                 is_collision = True
         elif sprite1.type in ['block'] and sprite2.type in ['block']:
             if (sprite1.loc_info[1] + sprite1.rect.height > sprite2.loc_info[1]) and (sprite1.loc_info[1] < sprite2.loc_info[1] + sprite2.rect.height):
                 if (sprite1.loc_info[0] < sprite2.loc_info[0] + sprite2.rect.width) and (sprite1.loc_info[0] + sprite1.rect.width > sprite2.loc_info[0] + sprite2.rect.width):
                     sprite1.loc_info[0] = 2 * (sprite2.loc_info[0] + sprite2.rect.width) - sprite1.loc_info[0]
-                    sprite1.velocity.angle = -sprite1.velocity.angle
+                    sprite1.velocity.vx = -sprite1.velocity.vx
                     sprite1.rotate_angle = -sprite1.velocity.angle
-                    sprite1.velocity.magnitude *= block_elasticity
-                    sprite2.velocity.angle = -sprite2.velocity.angle
+                    sprite1.velocity.scale(block_elasticity)
+                    sprite2.velocity.vx = -sprite2.velocity.vx
                     sprite2.rotate_angle = -sprite2.velocity.angle
-                    sprite2.velocity.magnitude *= block_elasticity
+                    sprite2.velocity.scale(block_elasticity)
                     is_collision = True
                 elif (sprite1.loc_info[0] + sprite1.rect.width > sprite2.loc_info[0]) and (sprite1.loc_info[0] < sprite2.loc_info[0]):
                     sprite1.loc_info[0] = 2 * (sprite2.loc_info[0] - sprite1.rect.width) - sprite1.loc_info[0]
-                    sprite1.velocity.angle = -sprite1.velocity.angle
+                    sprite1.velocity.vx = -sprite1.velocity.vx
                     sprite1.rotate_angle = -sprite1.velocity.angle
-                    sprite1.velocity.magnitude *= block_elasticity
-                    sprite2.velocity.angle = -sprite2.velocity.angle
+                    sprite1.velocity.scale(block_elasticity)
+                    sprite2.velocity.vx = -sprite2.velocity.vx
                     sprite2.rotate_angle = -sprite2.velocity.angle
-                    sprite2.velocity.magnitude *= block_elasticity
+                    sprite2.velocity.scale(block_elasticity)
                     is_collision = True
             if (sprite1.loc_info[0] + sprite1.rect.width > sprite2.loc_info[0]) and (sprite1.loc_info[0] < sprite2.loc_info[0] + sprite2.rect.width):
                 if (sprite1.loc_info[1] + sprite1.rect.height > sprite2.loc_info[1]) and (sprite1.loc_info[1] < sprite2.loc_info[1]):
                     sprite1.loc_info[1] = 2 * (sprite2.loc_info[1] - sprite1.rect.height) - sprite1.loc_info[1]
-                    sprite1.velocity.angle = math.pi - sprite1.velocity.angle
+                    sprite1.velocity.vy = -sprite1.velocity.vy
                     sprite1.rotate_angle = math.pi - sprite1.velocity.angle
-                    sprite1.velocity.magnitude *= block_elasticity
-                    sprite2.velocity.angle = math.pi - sprite2.velocity.angle
+                    sprite1.velocity.scale(block_elasticity)
+                    sprite2.velocity.vy = -sprite2.velocity.vy
                     sprite2.rotate_angle = math.pi - sprite2.velocity.angle
-                    sprite2.velocity.magnitude *= block_elasticity
+                    sprite2.velocity.scale(block_elasticity)
                     is_collision = True
                 elif (sprite1.loc_info[1] < sprite2.loc_info[1] + sprite2.rect.height) and (sprite1.loc_info[1] + sprite1.rect.height > sprite2.loc_info[1] + sprite2.rect.height):
                     sprite1.loc_info[1] = 2 * (sprite2.loc_info[1] + sprite2.rect.height) - sprite1.loc_info[1]
-                    sprite1.velocity.angle = math.pi - sprite1.velocity.angle
+                    sprite1.velocity.vy = -sprite1.velocity.vy
                     sprite1.rotate_angle = math.pi - sprite1.velocity.angle
-                    sprite1.velocity.magnitude *= block_elasticity
-                    sprite2.velocity.angle = math.pi - sprite2.velocity.angle
+                    sprite1.velocity.scale(block_elasticity)
+                    sprite2.velocity.vy = -sprite2.velocity.vy
                     sprite2.rotate_angle = math.pi - sprite2.velocity.angle
-                    sprite2.velocity.magnitude *= block_elasticity
+                    sprite2.velocity.scale(block_elasticity)
                     is_collision = True
         elif sprite1.type in ['pig', 'bird'] and sprite2.type in ['wall']:
             if (sprite1.loc_info[1] + sprite1.loc_info[2] > sprite2.y) and (sprite1.loc_info[1] < sprite2.y + sprite2.height):
                 if (sprite1.loc_info[0] < sprite2.x + sprite2.width) and (sprite1.loc_info[0] + sprite1.loc_info[2] > sprite2.x + sprite2.width):
                     sprite1.loc_info[0] = 2 * (sprite2.x + sprite2.width) - sprite1.loc_info[0]
-                    sprite1.velocity.angle = -sprite1.velocity.angle
-                    sprite1.velocity.magnitude *= elasticity
+                    sprite1.velocity.vx = -sprite1.velocity.vx
+                    sprite1.velocity.scale(elasticity)
                 elif (sprite1.loc_info[0] + sprite1.loc_info[2] > sprite2.x) and (sprite1.loc_info[0] < sprite2.x):
                     sprite1.loc_info[0] = 2 * (sprite2.x - sprite1.loc_info[2]) - sprite1.loc_info[0]
-                    sprite1.velocity.angle = -sprite1.velocity.angle
-                    sprite1.velocity.magnitude *= elasticity
+                    sprite1.velocity.vx = -sprite1.velocity.vx
+                    sprite1.velocity.scale(elasticity)
             if (sprite1.loc_info[0] + sprite1.loc_info[2] > sprite2.x) and (sprite1.loc_info[0] < sprite2.x + sprite2.width):
                 if (sprite1.loc_info[1] + sprite1.loc_info[2] > sprite2.y) and (sprite1.loc_info[1] < sprite2.y):
                     sprite1.loc_info[1] = 2 * (sprite2.y - sprite1.loc_info[2]) - sprite1.loc_info[1]
-                    sprite1.velocity.angle = math.pi - sprite1.velocity.angle
-                    sprite1.velocity.magnitude *= elasticity
+                    sprite1.velocity.vy = -sprite1.velocity.vy
+                    sprite1.velocity.scale(elasticity)
                 elif (sprite1.loc_info[1] < sprite2.y + sprite2.height) and (sprite1.loc_info[1] + sprite1.loc_info[2] > sprite2.y + sprite2.height):
                     sprite1.loc_info[1] = 2 * (sprite2.y + sprite2.height) - sprite1.loc_info[1]
-                    sprite1.velocity.angle = math.pi - sprite1.velocity.angle
-                    sprite1.velocity.magnitude *= elasticity
+                    sprite1.velocity.vy = -sprite1.velocity.vy
+                    sprite1.velocity.scale(elasticity)
         elif sprite1.type in ['block'] and sprite2.type in ['wall']:
             if (sprite1.loc_info[1] + sprite1.rect.height > sprite2.y) and (sprite1.loc_info[1] < sprite2.y + sprite2.height):
                 if (sprite1.loc_info[0] < sprite2.x + sprite2.width) and (sprite1.loc_info[0] + sprite1.rect.width > sprite2.x + sprite2.width):
                     sprite1.loc_info[0] = 2 * (sprite2.x + sprite2.width) - sprite1.loc_info[0]
-                    sprite1.velocity.angle = -sprite1.velocity.angle
+                    sprite1.velocity.vx = -sprite1.velocity.vx
                     sprite1.rotate_angle = -sprite1.velocity.angle
-                    sprite1.velocity.magnitude *= elasticity
+                    sprite1.velocity.scale(elasticity)
                 elif (sprite1.loc_info[0] + sprite1.rect.width > sprite2.x) and (sprite1.loc_info[0] < sprite2.x):
                     sprite1.loc_info[0] = 2 * (sprite2.x - sprite1.rect.width) - sprite1.loc_info[0]
-                    sprite1.velocity.angle = -sprite1.velocity.angle
+                    sprite1.velocity.vx = -sprite1.velocity.vx
                     sprite1.rotate_angle = -sprite1.velocity.angle
-                    sprite1.velocity.magnitude *= elasticity
+                    sprite1.velocity.scale(elasticity)
             if (sprite1.loc_info[0] + sprite1.rect.width > sprite2.x) and (sprite1.loc_info[0] < sprite2.x + sprite2.width):
                 if (sprite1.loc_info[1] + sprite1.rect.height > sprite2.y) and (sprite1.loc_info[1] < sprite2.y):
                     sprite1.loc_info[1] = 2 * (sprite2.y - sprite1.rect.height) - sprite1.loc_info[1]
-                    sprite1.velocity.angle = math.pi - sprite1.velocity.angle
+                    sprite1.velocity.vy = -sprite1.velocity.vy
                     sprite1.rotate_angle = math.pi - sprite1.velocity.angle
-                    sprite1.velocity.magnitude *= elasticity
+                    sprite1.velocity.scale(elasticity)
                 elif (sprite1.loc_info[1] < sprite2.y + sprite2.height) and (sprite1.loc_info[1] + sprite1.rect.height > sprite2.y + sprite2.height):
                     sprite1.loc_info[1] = 2 * (sprite2.y + sprite2.height) - sprite1.loc_info[1]
-                    sprite1.velocity.angle = math.pi - sprite1.velocity.angle
+                    sprite1.velocity.vy = -sprite1.velocity.vy
                     sprite1.rotate_angle = math.pi - sprite1.velocity.angle
-                    sprite1.velocity.magnitude *= elasticity
+                    sprite1.velocity.scale(elasticity)
         else:
             raise TypeError('Unsupport detect the collision of %s and %s...' % (sprite1.type, sprite2.type))
         return sprite1, sprite2, is_collision
@@ -271,6 +264,12 @@ class GameLevels():
         pigs_remaining_label.addtext(f"PIGS REMAINING: {len(pigs)}", 25, self.cfg.FONT_PATHS_DICT_NOINIT['Comic_Kings'], (236, 240, 241))
         dannz_label = Label(self.screen, self.screen_size[0] - 270, self.screen_size[1] - 20, 300, 100)
         dannz_label.addtext('DANNZ', 60, self.cfg.FONT_PATHS_DICT_NOINIT['arfmoochikncheez'], (113, 125, 126))
+        # Broadphase grid and sleeping state of the bodies
+        world = PhysicsWorld()
+        for sprite in birds + pigs + blocks: world.addbody(sprite)
+        for wall in walls: world.addwall(wall)
+        # Aiming arcs are shared by the birds of the level and cached per pull
+        predictor = TrajectoryPredictor(self.screen_size, gravity=birds[0].gravity.vy, inverse_friction=birds[0].inverse_friction, elasticity=birds[0].elasticity, walls=[(wall.x, wall.y, wall.width, wall.height) for wall in walls])
         # Game main loop
         clock = pygame.time.Clock()
         blocks_to_remove, pigs_to_remove = [], []
@@ -300,8 +299,8 @@ class GameLevels():
                 pygame.draw.rect(self.screen, color, (0, i * 300, self.screen_size[0], 300))
             pygame.draw.rect(self.screen, (77, 86, 86), (0, self.screen_size[1], self.screen_size[0], 50))
             # --Judge whether the game is over, if not, import a new bird
-            if (not birds[0].is_loaded) and self.still(pigs + birds + blocks):
-                birds.pop(0)
+            if (not birds[0].is_loaded) and world.is_still:
+                world.remove(birds.pop(0))
                 if self.status(pigs, birds) == 2:
                     self.score += len(birds) * 100
                     self.switchlevelinterface()
@@ -309,6 +308,7 @@ class GameLevels():
                     self.failureinterface()
                 birds[0].load(slingshot)
                 birds[0].start_flying = False
+                world.wake(birds[0])
             # --Reset the bird's position
             if birds[0].is_selected:
                 birds[0].reposition(slingshot)
@@ -316,82 +316,94 @@ class GameLevels():
                 birds[0].is_loaded = False
             # --Slingshot
             slingshot.draw(birds[0])
+            # --Only the pairs whose bounds share a grid cell are tested, in the same order as the full scan
+            world.refresh()
+            pig_indices = {pig: i for i, pig in enumerate(pigs)}
+            block_indices = {block: i for i, block in enumerate(blocks)}
             # --Judge whether the pig hits the wooden stake
             for i in range(len(pigs)):
-                for j in range(len(blocks)):
-                    pig_magnitude_1, block_magnitude_1 = pigs[i].velocity.magnitude, blocks[j].velocity.magnitude
-                    pigs[i], blocks[j], is_collision = self.collision(pigs[i], blocks[j])
-                    pig_magnitude_2, block_magnitude_2 = pigs[i].velocity.magnitude, blocks[j].velocity.magnitude
+                for block in world.candidates(pigs[i], block_indices):
+                    pig_magnitude_1, block_magnitude_1 = pigs[i].velocity.magnitude, block.velocity.magnitude
+                    pigs[i], block, is_collision = self.collision(pigs[i], block)
+                    pig_magnitude_2, block_magnitude_2 = pigs[i].velocity.magnitude, block.velocity.magnitude
                     if is_collision:
+                        world.collided(pigs[i], block)
                         if abs(pig_magnitude_2 - pig_magnitude_2) > 2:
-                            blocks_to_remove.append(blocks[j])
-                            blocks[j].setdestroy()
+                            blocks_to_remove.append(block)
+                            block.setdestroy()
                         if abs(block_magnitude_2 - block_magnitude_1) > 2:
                             pigs_to_remove.append(pigs[i])
                             pigs[i].setdead()
             # --Judge whether the bird hits the wooden stake
             for i in range(len(birds)):
                 if not (birds[i].is_loaded or birds[i].velocity.magnitude == 0):
-                    for j in range(len(blocks)):
-                        bird_magnitude_1, block_magnitude_1 = birds[i].velocity.magnitude, blocks[j].velocity.magnitude
-                        birds[i], blocks[j], is_collision = self.collision(birds[i], blocks[j])
-                        bird_magnitude_2, block_magnitude_2 = birds[i].velocity.magnitude, blocks[j].velocity.magnitude
+                    for block in world.candidates(birds[i], block_indices):
+                        bird_magnitude_1, block_magnitude_1 = birds[i].velocity.magnitude, block.velocity.magnitude
+                        birds[i], block, is_collision = self.collision(birds[i], block)
+                        bird_magnitude_2, block_magnitude_2 = birds[i].velocity.magnitude, block.velocity.magnitude
                         if is_collision:
+                            world.collided(birds[i], block)
                             if abs(bird_magnitude_1 - bird_magnitude_2) > 2:
-                                if blocks[j] not in blocks_to_remove:
-                                    blocks_to_remove.append(blocks[j])
-                                    blocks[j].setdestroy()
+                                if block not in blocks_to_remove:
+                                    blocks_to_remove.append(block)
+                                    block.setdestroy()
             # --Judge whether the bird hits the wooden stake
             for i in range(len(pigs)):
-                pigs[i].move()
-                for j in range(i+1, len(pigs)):
-                    pig1_magnitude_1, pig2_magnitude_1 = pigs[i].velocity.magnitude, pigs[j].velocity.magnitude
-                    pigs[i], pigs[j], is_collision = self.collision(pigs[i], pigs[j])
-                    pig1_magnitude_2, pig2_magnitude_2 = pigs[i].velocity.magnitude, pigs[j].velocity.magnitude
+                if not pigs[i].is_sleeping: pigs[i].move()
+                for pig in world.candidates(pigs[i], pig_indices, start=i+1):
+                    pig1_magnitude_1, pig2_magnitude_1 = pigs[i].velocity.magnitude, pig.velocity.magnitude
+                    pigs[i], pig, is_collision = self.collision(pigs[i], pig)
+                    pig1_magnitude_2, pig2_magnitude_2 = pigs[i].velocity.magnitude, pig.velocity.magnitude
+                    if is_collision: world.collided(pigs[i], pig)
                     if abs(pig1_magnitude_1 - pig1_magnitude_2) > 2:
-                        if pigs[j] not in pigs_to_remove:
-                            pigs_to_remove.append(pigs[j])
-                            pigs[j].setdead()
+                        if pig not in pigs_to_remove:
+                            pigs_to_remove.append(pig)
+                            pig.setdead()
                     if abs(pig2_magnitude_1 - pig2_magnitude_2) > 2:
                         if pigs[i] not in pigs_to_remove:
                             pigs_to_remove.append(pigs[i])
                             pigs[i].setdead()
-                for wall in walls: pigs[i] = self.collision(pigs[i], wall)[0]
+                for wall in world.nearwalls(pigs[i]): pigs[i] = self.collision(pigs[i], wall)[0]
                 pigs[i].draw()
             # --Judge whether the bird hits the pig or the wall
             for i in range(len(birds)):
                 if (not birds[i].is_loaded) and (birds[i].velocity.magnitude):
-                    birds[i].move()
-                    for j in range(len(pigs)):
-                        bird_magnitude_1, pig_magnitude_1 = birds[i].velocity.magnitude, pigs[j].velocity.magnitude
-                        birds[i], pigs[j], is_collision = self.collision(birds[i], pigs[j])
-                        bird_magnitude_2, pig_magnitude_2 = birds[i].velocity.magnitude, pigs[j].velocity.magnitude
+                    # A sleeping bird keeps its last velocity and skips the wall test, moving it would let it sink through a slab
+                    if not birds[i].is_sleeping: birds[i].move()
+                    for pig in world.candidates(birds[i], pig_indices):
+                        bird_magnitude_1, pig_magnitude_1 = birds[i].velocity.magnitude, pig.velocity.magnitude
+                        birds[i], pig, is_collision = self.collision(birds[i], pig)
+                        bird_magnitude_2, pig_magnitude_2 = birds[i].velocity.magnitude, pig.velocity.magnitude
                         if is_collision:
+                            world.collided(birds[i], pig)
                             if abs(bird_magnitude_2 - bird_magnitude_1) > 2:
-                                if pigs[j] not in pigs_to_remove:
-                                    pigs_to_remove.append(pigs[j])
-                                    pigs[j].setdead()
-                if birds[i].is_loaded: birds[i].projectpath()
-                for wall in walls: birds[i] = self.collision(birds[i], wall)[0]
+                                if pig not in pigs_to_remove:
+                                    pigs_to_remove.append(pig)
+                                    pig.setdead()
+                if birds[i].is_loaded: birds[i].projectpath(predictor)
+                for wall in world.nearwalls(birds[i]): birds[i] = self.collision(birds[i], wall)[0]
                 birds[i].draw()
             # --Judge whether the wooden pile hits the wooden pile or the wooden pile hits the wall
             for i in range(len(blocks)):
-                for j in range(i+1, len(blocks)):
-                    block1_magnitude_1, block2_magnitude_1 = blocks[i].velocity.magnitude, blocks[j].velocity.magnitude
-                    blocks[i], blocks[j], is_collision = self.collision(blocks[i], blocks[j])
-                    block1_magnitude_2, block2_magnitude_2 = blocks[i].velocity.magnitude, blocks[j].velocity.magnitude
+                for block in world.candidates(blocks[i], block_indices, start=i+1):
+                    block1_magnitude_1, block2_magnitude_1 = blocks[i].velocity.magnitude, block.velocity.magnitude
+                    blocks[i], block, is_collision = self.collision(blocks[i], block)
+                    block1_magnitude_2, block2_magnitude_2 = blocks[i].velocity.magnitude, block.velocity.magnitude
                     if is_collision:
+                        world.collided(blocks[i], block)
                         if abs(block1_magnitude_2 - block1_magnitude_1) > 2:
-                            if blocks[j] not in blocks_to_remove:
-                                blocks_to_remove.append(blocks[j])
-                                blocks[j].setdestroy()
+                            if block not in blocks_to_remove:
+                                blocks_to_remove.append(block)
+                                block.setdestroy()
                         if abs(block2_magnitude_2 - block2_magnitude_1) > 2:
                             if blocks[i] not in blocks_to_remove:
                                 blocks_to_remove.append(blocks[i])
                                 blocks[i].setdestroy()
-                blocks[i].move()
-                for wall in walls: blocks[i] = self.collision(blocks[i], wall)[0]
+                if not blocks[i].is_sleeping: blocks[i].move()
+                for wall in world.nearwalls(blocks[i]): blocks[i] = self.collision(blocks[i], wall)[0]
                 blocks[i].draw()
+            # --Bodies which stopped moving go to sleep, the still check only looks at the awake ones
+            world.updatesleep()
             # --墙
             for wall in walls: wall.draw()
             # --Display text
@@ -406,14 +418,16 @@ class GameLevels():
             pygame.display.update()
             clock.tick(self.cfg.FPS)
             # --Delete invalid elements
-            if self.still(birds + pigs + blocks):
+            if world.is_still:
                 for pig in pigs_to_remove:
                     if pig in pigs:
                         pigs.remove(pig)
+                        world.remove(pig)
                         self.score += 100
                 for block in blocks_to_remove:
                     if block in blocks:
                         blocks.remove(block)
+                        world.remove(block)
                         self.score += 50
                 pigs_to_remove = []
                 blocks_to_remove = []
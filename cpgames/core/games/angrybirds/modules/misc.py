@@ -1,17 +1,34 @@
-
 import math
 
 
-'''Define velocity vector'''
+'''Define velocity vector, stored as (vx, vy) in screen coordinates (x to the right, y downwards)'''
 class VelocityVector():
-    def __init__(self, magnitude=0, angle=math.radians(0)):
-        self.angle = angle
-        self.magnitude = magnitude
-
-'''Vector addition'''
-def VectorAddition(vector1, vector2):
-    x = math.sin(vector1.angle) * vector1.magnitude + math.sin(vector2.angle) * vector2.magnitude
-    y = math.cos(vector1.angle) * vector1.magnitude + math.cos(vector2.angle) * vector2.magnitude
-    angle = 0.5 * math.pi - math.atan2(y, x)
-    magnitude = math.hypot(x, y)
-    return VelocityVector(magnitude, angle)
\ No newline at end of file
+    __slots__ = ('vx', 'vy')
+    def __init__(self, vx=0, vy=0):
+        self.vx = vx
+        self.vy = vy
+    '''Build a velocity from its polar form, the angle is measured clockwise from straight up (only the slingshot still works in polar)'''
+    @classmethod
+    def frompolar(cls, magnitude, angle):
+        return cls(magnitude * math.sin(angle), -magnitude * math.cos(angle))
+    '''Speed'''
+    @property
+    def magnitude(self):
+        return math.hypot(self.vx, self.vy)
+    '''Polar angle, clockwise from straight up'''
+    @property
+    def angle(self):
+        return math.atan2(self.vx, -self.vy)
+    '''Scale the speed in place'''
+    def scale(self, factor):
+        self.vx *= factor
+        self.vy *= factor
+    '''Copy of the vector'''
+    def copy(self):
+        return VelocityVector(self.vx, self.vy)
+    '''Velocity with the given speed along this direction mirrored about an axis, cos2 and sin2 are the cosine and sine of twice the axis angle'''
+    def mirrored(self, magnitude, cos2, sin2):
+        speed = self.magnitude
+        # A body at rest points straight up, like the default polar vector did
+        ux, uy = (self.vx / speed, self.vy / speed) if speed else (0, -1)
+        return VelocityVector(-magnitude * (cos2 * ux + sin2 * uy), magnitude * (cos2 * uy - sin2 * ux))
@@ -0,0 +1,114 @@
+import math
+import pygame
+from ....utils import SpatialHashGrid
+
+
+'''Broadphase and sleeping state of the bodies of a level'''
+class PhysicsWorld():
+    def __init__(self, cell_size=128, padding=16, sleep_frames=30, sleep_distance=1.0, still_threshold=0.15):
+        # Bodies are bucketed by their bounds grown by their speed plus padding, so the pairs collected at the start of a
+        # frame still cover the bodies after they moved or were pushed apart during that frame
+        self.grid = SpatialHashGrid(cell_size=cell_size)
+        self.rects = dict()
+        self.neighbours = dict()
+        self.padding = padding
+        # A body which stayed within sleep_distance of the same point for sleep_frames frames is put to sleep
+        self.sleep_frames = sleep_frames
+        self.sleep_distance = sleep_distance
+        self.still_threshold = still_threshold
+        self.awake_bodies = dict()
+        self.walls = []
+        # Whether every awake body is under the still threshold, updated at the end of every step
+        self.is_still = False
+    '''Add a moving body (pig, bird or block)'''
+    def addbody(self, sprite):
+        sprite.is_sleeping = False
+        sprite.sleep_count = 0
+        sprite.sleep_anchor = (sprite.loc_info[0], sprite.loc_info[1])
+        self.awake_bodies[sprite] = None
+        self.rects[sprite] = self.bounds(sprite)
+        self.grid.insert(sprite, self.rects[sprite])
+    '''Add a static wall'''
+    def addwall(self, wall):
+        self.walls.append(wall)
+        self.rects[wall] = self.bounds(wall)
+        self.grid.insert(wall, self.rects[wall])
+    '''Remove a body, the sleeping bodies around it are woken up since they may have been resting on it'''
+    def remove(self, sprite):
+        if sprite not in self.grid: return
+        for other in self.grid.candidates(self.rects[sprite]):
+            if other.type != 'wall': self.wake(other)
+        self.awake_bodies.pop(sprite, None)
+        self.rects.pop(sprite)
+        self.grid.remove(sprite)
+    '''Conservative bounds of everything a sprite can touch in one frame'''
+    def bounds(self, sprite):
+        if sprite.type == 'wall':
+            return pygame.Rect(sprite.x - 1, sprite.y - 1, sprite.width + 2, sprite.height + 2)
+        if sprite.type == 'block':
+            # Round bodies test their distance to the block position against the block width, blocks test boxes between themselves
+            reach = max(sprite.rect.width, sprite.rect.height)
+        else:
+            reach = sprite.loc_info[2]
+        reach += self.padding + sprite.velocity.magnitude
+        return pygame.Rect(math.floor(sprite.loc_info[0] - reach), math.floor(sprite.loc_info[1] - reach), math.ceil(2 * reach) + 1, math.ceil(2 * reach) + 1)
+    '''Re-bucket the awake bodies and collect the pairs whose bounds overlap, called once at the start of every step'''
+    def refresh(self):
+        for sprite in self.awake_bodies:
+            self.rects[sprite] = self.bounds(sprite)
+            self.grid.update(sprite, self.rects[sprite])
+        # Pairs of two sleeping bodies are never collected, they were resting together and there is nothing to resolve
+        self.neighbours = dict()
+        for sprite in self.awake_bodies:
+            rect = self.rects[sprite]
+            for other in self.grid.candidates(rect):
+                if other is sprite or not rect.colliderect(self.rects[other]): continue
+                self.neighbours.setdefault(sprite, dict())[other] = None
+                if other.type != 'wall': self.neighbours.setdefault(other, dict())[sprite] = None
+    '''Sprites of a list which may touch sprite this frame, in list order. index_map maps the sprites of the list to their index, start skips the ones before it'''
+    def candidates(self, sprite, index_map, start=0):
+        found = []
+        for other in self.neighbours.get(sprite, ()):
+            idx = index_map.get(other)
+            if idx is not None and idx >= start: found.append((idx, other))
+        found.sort(key=lambda item: item[0])
+        return [other for _, other in found]
+    '''Walls which may touch a sprite this frame'''
+    def nearwalls(self, sprite):
+        if sprite.is_sleeping: return []
+        return [other for other in self.neighbours.get(sprite, ()) if other.type == 'wall']
+    '''Wake bodies up, e.g. after they were hit'''
+    def wake(self, *sprites):
+        for sprite in sprites:
+            if not sprite.is_sleeping: continue
+            sprite.is_sleeping = False
+            sprite.sleep_count = 0
+            sprite.sleep_anchor = (sprite.loc_info[0], sprite.loc_info[1])
+            self.awake_bodies[sprite] = None
+    '''Wake the two bodies of a collision up unless it only exchanged a resting jitter'''
+    def collided(self, sprite1, sprite2):
+        if max(sprite1.velocity.magnitude, sprite2.velocity.magnitude) < self.still_threshold: return
+        self.wake(sprite1, sprite2)
+    '''Put the bodies which stopped moving to sleep and update is_still, only the awake bodies are visited'''
+    def updatesleep(self):
+        is_still = True
+        for sprite in list(self.awake_bodies):
+            if sprite.velocity.magnitude >= self.still_threshold: is_still = False
+            # The bird on the slingshot never sleeps
+            if getattr(sprite, 'is_loaded', False) or getattr(sprite, 'is_selected', False):
+                sprite.sleep_count = 0
+                continue
+            x, y = sprite.loc_info[0], sprite.loc_info[1]
+            if math.hypot(x - sprite.sleep_anchor[0], y - sprite.sleep_anchor[1]) > self.sleep_distance:
+                sprite.sleep_anchor = (x, y)
+                sprite.sleep_count = 0
+                continue
+            sprite.sleep_count += 1
+            if sprite.sleep_count >= self.sleep_frames:
+                # The velocity is kept, collisions swap velocities and a bird which got a zero one would stop in the air
+                sprite.is_sleeping = True
+                self.awake_bodies.pop(sprite)
+                self.rects[sprite] = self.bounds(sprite)
+                self.grid.update(sprite, self.rects[sprite])
+        self.is_still = is_still
+        return is_still
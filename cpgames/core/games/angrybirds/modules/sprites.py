@@ -2,7 +2,8 @@
 import math
 import pygame
 import random
-from .misc import VelocityVector, VectorAddition
+from .misc import VelocityVector
+from .trajectory import TrajectoryPredictor
 
 
 '''Pig'''
@@ -21,7 +22,7 @@ class Pig(pygame.sprite.Sprite):
         self.switch_freq = 20
         self.animate_count = 0
         self.inverse_friction = 0.99
-        self.gravity = VelocityVector(0.2, math.pi)
+        self.gravity = VelocityVector(0, 0.2)
         # Screen size
         self.screen_size = screen.get_rect().size
         self.screen_size = (self.screen_size[0], self.screen_size[1] - 50)
@@ -40,28 +41,29 @@ class Pig(pygame.sprite.Sprite):
     '''Mobile Pig'''
     def move(self):
         # Change the pig's velocity vector according to gravity
-        self.velocity = VectorAddition(self.velocity, self.gravity)
-        self.loc_info[0] += self.velocity.magnitude * math.sin(self.velocity.angle)
-        self.loc_info[1] -= self.velocity.magnitude * math.cos(self.velocity.angle)
-        self.velocity.magnitude *= self.inverse_friction
+        self.velocity.vx += self.gravity.vx
+        self.velocity.vy += self.gravity.vy
+        self.loc_info[0] += self.velocity.vx
+        self.loc_info[1] += self.velocity.vy
+        self.velocity.scale(self.inverse_friction)
         # Width exceeds the screen
         if self.loc_info[0] > self.screen_size[0] - self.loc_info[2]:
             self.loc_info[0] = 2 * (self.screen_size[0] - self.loc_info[2]) - self.loc_info[0]
-            self.velocity.angle *= -1
-            self.velocity.magnitude *= self.elasticity
+            self.velocity.vx = -self.velocity.vx
+            self.velocity.scale(self.elasticity)
         elif self.loc_info[0] < self.loc_info[2]:
             self.loc_info[0] = 2 * self.loc_info[2] - self.loc_info[0]
-            self.velocity.angle *= -1
-            self.velocity.magnitude *= self.elasticity
+            self.velocity.vx = -self.velocity.vx
+            self.velocity.scale(self.elasticity)
         
         if self.loc_info[1] > self.screen_size[1] - self.loc_info[2]:
             self.loc_info[1] = 2 * (self.screen_size[1] - self.loc_info[2]) - self.loc_info[1]
-            self.velocity.angle = math.pi - self.velocity.angle
-            self.velocity.magnitude *= self.elasticity
+            self.velocity.vy = -self.velocity.vy
+            self.velocity.scale(self.elasticity)
         elif self.loc_info[1] < self.loc_info[2]:
             self.loc_info[1] = 2 * self.loc_info[2] - self.loc_info[1]
-            self.velocity.angle = math.pi - self.velocity.angle
-            self.velocity.magnitude *= self.elasticity
+            self.velocity.vy = -self.velocity.vy
+            self.velocity.scale(self.elasticity)
     '''The pig died'''
     def setdead(self):
         self.is_dead = True
@@ -87,7 +89,8 @@ class Bird(pygame.sprite.Sprite):
         self.is_loaded = False
         self.is_selected = False
         self.inverse_friction = 0.99
-        self.gravity = VelocityVector(0.2, math.pi)
+        self.gravity = VelocityVector(0, 0.2)
+        self.predictor = None
         
         self.screen_size = screen.get_rect().size
         self.screen_size = (self.screen_size[0], self.screen_size[1] - 50)
@@ -118,43 +121,45 @@ class Bird(pygame.sprite.Sprite):
         if self.selected:
             self.loc_info[0], self.loc_info[1] = pos[0], pos[1]
             dx, dy = slingshot.x - self.loc_info[0], slingshot.y - self.loc_info[1]
-            self.velocity.magnitude = min(int(math.hypot(dx, dy) / 2), 80)
-            self.velocity.angle = math.pi / 2 + math.atan2(dy, dx)
-    '''Show the path of launching the bird'''
-    def projectpath(self):
+            self.velocity = VelocityVector.frompolar(min(int(math.hypot(dx, dy) / 2), 80), math.pi / 2 + math.atan2(dy, dx))
+    '''Show the path of launching the bird, and where it first hits a wall if the predictor knows the walls'''
+    def projectpath(self, predictor=None):
         if self.is_loaded:
-            path = []
-            bird = Bird(self.screen, self.images, self.loc_info, velocity=self.velocity)
-            for i in range(30):
-                bird.move()
-                if i % 5 == 0: path.append((bird.loc_info[0], bird.loc_info[1]))
+            if predictor is None:
+                if self.predictor is None:
+                    self.predictor = TrajectoryPredictor(self.screen_size, gravity=self.gravity.vy, inverse_friction=self.inverse_friction, elasticity=self.elasticity)
+                predictor = self.predictor
+            path, impact = predictor.predict(self.loc_info[0], self.loc_info[1], self.velocity.vx, self.velocity.vy, self.loc_info[2])
             for point in path:
                 pygame.draw.ellipse(self.screen, self.color, (point[0], point[1], 2, 2))
+            if impact is not None:
+                pygame.draw.circle(self.screen, self.color, (int(impact[0]), int(impact[1])), int(self.loc_info[2]), 1)
     
     def move(self):
         # Change the bird's velocity vector according to gravity
-        self.velocity = VectorAddition(self.velocity, self.gravity)
-        self.loc_info[0] += self.velocity.magnitude * math.sin(self.velocity.angle)
-        self.loc_info[1] -= self.velocity.magnitude * math.cos(self.velocity.angle)
-        self.velocity.magnitude *= self.inverse_friction
+        self.velocity.vx += self.gravity.vx
+        self.velocity.vy += self.gravity.vy
+        self.loc_info[0] += self.velocity.vx
+        self.loc_info[1] += self.velocity.vy
+        self.velocity.scale(self.inverse_friction)
         # Width exceeds the screen
         if self.loc_info[0] > self.screen_size[0] - self.loc_info[2]:
             self.loc_info[0] = 2 * (self.screen_size[0] - self.loc_info[2]) - self.loc_info[0]
-            self.velocity.angle *= -1
-            self.velocity.magnitude *= self.elasticity
+            self.velocity.vx = -self.velocity.vx
+            self.velocity.scale(self.elasticity)
         elif self.loc_info[0] < self.loc_info[2]:
             self.loc_info[0] = 2 * self.loc_info[2] - self.loc_info[0]
-            self.velocity.angle *= -1
-            self.velocity.magnitude *= self.elasticity
+            self.velocity.vx = -self.velocity.vx
+            self.velocity.scale(self.elasticity)
         # Height exceeds the screen
         if self.loc_info[1] > self.screen_size[1] - self.loc_info[2]:
             self.loc_info[1] = 2 * (self.screen_size[1] - self.loc_info[2]) - self.loc_info[1]
-            self.velocity.angle = math.pi - self.velocity.angle
-            self.velocity.magnitude *= self.elasticity
+            self.velocity.vy = -self.velocity.vy
+            self.velocity.scale(self.elasticity)
         elif self.loc_info[1] < self.loc_info[2]:
             self.loc_info[1] = 2 * self.loc_info[2] - self.loc_info[1]
-            self.velocity.angle = math.pi - self.velocity.angle
-            self.velocity.magnitude *= self.elasticity
+            self.velocity.vy = -self.velocity.vy
+            self.velocity.scale(self.elasticity)
 
 
 '''Wooden blocks in the map'''
@@ -171,7 +176,7 @@ class Block(pygame.sprite.Sprite):
         self.elasticity = 0.7
         self.is_destroyed = False
         self.inverse_friction = 0.99
-        self.gravity = VelocityVector(0.2, math.pi)
+        self.gravity = VelocityVector(0, 0.2)
   
         self.block_images = []
         for image in images: self.block_images.append(pygame.transform.scale(image, (100, 100)))
@@ -193,32 +198,33 @@ class Block(pygame.sprite.Sprite):
     
     def move(self):
         # Change the velocity vector of the block according to gravity
-        self.velocity = VectorAddition(self.velocity, self.gravity)
-        self.loc_info[0] += self.velocity.magnitude * math.sin(self.velocity.angle)
-        self.loc_info[1] -= self.velocity.magnitude * math.cos(self.velocity.angle)
-        self.velocity.magnitude *= self.inverse_friction
+        self.velocity.vx += self.gravity.vx
+        self.velocity.vy += self.gravity.vy
+        self.loc_info[0] += self.velocity.vx
+        self.loc_info[1] += self.velocity.vy
+        self.velocity.scale(self.inverse_friction)
    
         if self.loc_info[0] > self.screen_size[0] - self.rect.width:
             self.loc_info[0] = 2 * (self.screen_size[0] - self.rect.width) - self.loc_info[0]
-            self.velocity.angle *= -1
+            self.velocity.vx = -self.velocity.vx
             self.rotate_angle = -self.velocity.angle
-            self.velocity.magnitude *= self.elasticity
+            self.velocity.scale(self.elasticity)
         elif self.loc_info[0] < self.rect.width:
             self.loc_info[0] = 2 * self.rect.width - self.loc_info[0]
-            self.velocity.angle *= -1
+            self.velocity.vx = -self.velocity.vx
             self.rotate_angle = -self.velocity.angle
-            self.velocity.magnitude *= self.elasticity
+            self.velocity.scale(self.elasticity)
     
         if self.loc_info[1] > self.screen_size[1] - self.rect.height:
             self.loc_info[1] = 2 * (self.screen_size[1] - self.rect.height) - self.loc_info[1]
-            self.velocity.angle = math.pi - self.velocity.angle
+            self.velocity.vy = -self.velocity.vy
             self.rotate_angle = math.pi - self.velocity.angle
-            self.velocity.magnitude *= self.elasticity
+            self.velocity.scale(self.elasticity)
         elif self.loc_info[1] < self.rect.height:
             self.loc_info[1] = 2 * self.rect.height - self.loc_info[1]
-            self.velocity.angle = math.pi - self.velocity.angle
+            self.velocity.vy = -self.velocity.vy
             self.rotate_angle = math.pi - self.velocity.angle
-            self.velocity.magnitude *= self.elasticity
+            self.velocity.scale(self.elasticity)
 
 
 
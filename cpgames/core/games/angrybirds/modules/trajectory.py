@@ -0,0 +1,72 @@
+from collections import OrderedDict
+
+
+'''Predicts the flight of a launched bird without pygame, stepping exactly like Bird.move'''
+class TrajectoryPredictor():
+    def __init__(self, screen_size, gravity=0.2, inverse_friction=0.99, elasticity=0.8, walls=(), num_steps=30, sample_interval=5, max_steps=180, max_arcs=32):
+        self.screen_size = screen_size
+        self.gravity = gravity
+        self.inverse_friction = inverse_friction
+        self.elasticity = elasticity
+        # Walls are (x, y, width, height), the static geometry the first collision is searched against
+        self.walls = [tuple(wall) for wall in walls]
+        self.num_steps = num_steps
+        self.sample_interval = sample_interval
+        self.max_steps = max_steps
+        # (x, y, vx, vy, radius) -> (arc, impact), the least recently used arc is dropped first
+        self.arcs = OrderedDict()
+        self.max_arcs = max_arcs
+    '''Set the static walls, the cached arcs are dropped'''
+    def setwalls(self, walls):
+        self.walls = [tuple(wall) for wall in walls]
+        self.arcs.clear()
+    '''One step of Bird.move from a state (x, y, vx, vy), returns the new state'''
+    def step(self, x, y, vx, vy, radius):
+        vy += self.gravity
+        x, y = x + vx, y + vy
+        vx, vy = vx * self.inverse_friction, vy * self.inverse_friction
+        if x > self.screen_size[0] - radius:
+            x = 2 * (self.screen_size[0] - radius) - x
+            vx, vy = -vx * self.elasticity, vy * self.elasticity
+        elif x < radius:
+            x = 2 * radius - x
+            vx, vy = -vx * self.elasticity, vy * self.elasticity
+        if y > self.screen_size[1] - radius:
+            y = 2 * (self.screen_size[1] - radius) - y
+            vx, vy = vx * self.elasticity, -vy * self.elasticity
+        elif y < radius:
+            y = 2 * radius - y
+            vx, vy = vx * self.elasticity, -vy * self.elasticity
+        return x, y, vx, vy
+    '''Whether a round body at (x, y) touches a wall, with the same tests as GameLevels.collision'''
+    def touches(self, x, y, radius, wall):
+        wall_x, wall_y, width, height = wall
+        if (y + radius > wall_y) and (y < wall_y + height):
+            if (x < wall_x + width) and (x + radius > wall_x + width): return True
+            if (x + radius > wall_x) and (x < wall_x): return True
+        if (x + radius > wall_x) and (x < wall_x + width):
+            if (y + radius > wall_y) and (y < wall_y): return True
+            if (y < wall_y + height) and (y + radius > wall_y + height): return True
+        return False
+    '''Aiming arc and first wall hit of a bird launched from (x, y) with velocity (vx, vy).
+    Returns (points, impact): points are sampled every sample_interval steps over the first num_steps, impact is (x, y) or None'''
+    def predict(self, x, y, vx, vy, radius):
+        key = (x, y, vx, vy, radius)
+        if key in self.arcs:
+            self.arcs.move_to_end(key)
+            return self.arcs[key]
+        points, impact = [], None
+        # Every test of touches needs the body inside the wall grown by the radius to the left and above, reject the rest cheaply
+        boxes = [(wall[0] - radius, wall[0] + wall[2], wall[1] - radius, wall[1] + wall[3], wall) for wall in self.walls]
+        for idx in range(max(self.num_steps, self.max_steps if boxes else 0)):
+            x, y, vx, vy = self.step(x, y, vx, vy, radius)
+            if idx < self.num_steps and idx % self.sample_interval == 0: points.append((x, y))
+            if impact is None:
+                for left, right, top, bottom, wall in boxes:
+                    if left < x < right and top < y < bottom and self.touches(x, y, radius, wall):
+                        impact = (x, y)
+                        break
+            if impact is not None and idx >= self.num_steps - 1: break
+        self.arcs[key] = (points, impact)
+        if len(self.arcs) > self.max_arcs: self.arcs.popitem(last=False)
+        return points, impact
@@ -1,6 +1,6 @@
 
 import pygame
-from ...utils import InitPygame, PygameResourceLoader
+from ...utils import InitPygame, PygameResourceLoader, PygameResourcePreloader, ShowLoadingProgress
 
 
 
@@ -23,9 +23,18 @@ class PygameBaseGame():
         font_paths_dict = self.config.FONT_PATHS_DICT if hasattr(self.config, 'FONT_PATHS_DICT') else None
         image_paths_dict = self.config.IMAGE_PATHS_DICT if hasattr(self.config, 'IMAGE_PATHS_DICT') else None
         sound_paths_dict = self.config.SOUND_PATHS_DICT if hasattr(self.config, 'SOUND_PATHS_DICT') else None
+        # {'image': [...], 'sound': [...]}, the top level keys needed by the first frame, the others are streamed in
+        critical_resource_keys = self.config.CRITICAL_RESOURCE_KEYS if hasattr(self.config, 'CRITICAL_RESOURCE_KEYS') else None
+        preloader = PygameResourcePreloader(
+            image_paths_dict=image_paths_dict,
+            sound_paths_dict=sound_paths_dict,
+            critical_keys=critical_resource_keys,
+        ).start()
+        ShowLoadingProgress(self.screen, preloader)
         self.resource_loader = PygameResourceLoader(
             bgm_path=bgm_path,
             font_paths_dict=font_paths_dict, 
             image_paths_dict=image_paths_dict, 
             sound_paths_dict=sound_paths_dict, 
-        )
\ No newline at end of file
+            preloader=preloader,
+        )
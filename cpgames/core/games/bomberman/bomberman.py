@@ -2,7 +2,7 @@
 import os
 import random
 import pygame
-from ...utils import QuitGame
+from ...utils import QuitGame, SharedTextCache
 from ..base import PygameBaseGame
 from .modules import Wall, Background, Fruit, Bomb, Hero, showText, Button, Interface, mapParser
 
@@ -84,7 +84,7 @@ class BomberManGame(PygameBaseGame):
         
             Interface(screen, cfg, mode='game_start')
            
-            font = pygame.font.SysFont('Consolas', 15)
+            font = SharedTextCache.getfont('Consolas', 15, system_font=True)
             for gamemap_path in cfg.GAMEMAPPATHS:
                
                 map_parser = mapParser(gamemap_path, bg_images=resource_loader.images['background'], wall_images=resource_loader.images['wall'], blocksize=cfg.BLOCKSIZE)
@@ -1,14 +1,10 @@
 
 import pygame
-from ....utils import QuitGame
+from ....utils import QuitGame, SharedTextCache
 
 
 def showText(screen, font, text, color, position):
-    text_render = font.render(text, True, color)
-    rect = text_render.get_rect()
-    rect.left, rect.top = position
-    screen.blit(text_render, rect)
-    return rect.right
+    return SharedTextCache.blit(screen, font, text, color, position).right
 
 
 
@@ -19,11 +15,8 @@ def Button(screen, position, text, buttoncolor=(120, 120, 120), linecolor=(20, 2
     pygame.draw.line(screen, linecolor, (left, top+bheight), (left+bwidth, top+bheight), 5)
     pygame.draw.line(screen, linecolor, (left+bwidth, top+bheight), (left+bwidth, top), 5)
     pygame.draw.rect(screen, buttoncolor, (left, top, bwidth, bheight))
-    font = pygame.font.SysFont('Consolas', 30)
-    text_render = font.render(text, 1, textcolor)
-    rect = text_render.get_rect()
-    rect.centerx, rect.centery = left + bwidth / 2, top + bheight / 2
-    return screen.blit(text_render, rect)
+    font = SharedTextCache.getfont('Consolas', 30, system_font=True)
+    return SharedTextCache.blit(screen, font, text, textcolor, (left + bwidth / 2, top + bheight / 2), anchor='center')
 
 
 def Interface(screen, cfg, mode='game_start'):
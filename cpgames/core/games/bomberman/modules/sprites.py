@@ -2,6 +2,7 @@
 import copy
 import random
 import pygame
+from ....utils import SharedTextCache
 
 
 
@@ -78,7 +79,7 @@ class Bomb(pygame.sprite.Sprite):
         self.harm_value = 1
  
         self.is_being = True
-        self.font = pygame.font.SysFont('Consolas', 20)
+        self.font = SharedTextCache.getfont('Consolas', 20, system_font=True)
         self.digitalcolor = digitalcolor
 
     def draw(self, screen, dt, map_parser):
@@ -89,9 +90,7 @@ class Bomb(pygame.sprite.Sprite):
             if self.explode_millisecond < 0:
                 self.start_explode = True
             screen.blit(self.image, self.rect)
-            text = self.font.render(str(self.explode_second), True, self.digitalcolor)
-            rect = text.get_rect(center=(self.rect.centerx-5, self.rect.centery+5))
-            screen.blit(text, rect)
+            SharedTextCache.blit(screen, self.font, self.explode_second, self.digitalcolor, (self.rect.centerx-5, self.rect.centery+5), anchor='center')
             return False
         else:
           
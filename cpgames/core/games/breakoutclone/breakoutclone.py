@@ -1,7 +1,7 @@
 
 import os
 import pygame
-from ...utils import QuitGame
+from ...utils import QuitGame, SharedTextCache
 from ..base import PygameBaseGame
 from .modules import Paddle, Ball, Brick, loadLevel
 
@@ -125,8 +125,7 @@ class BreakoutcloneGame(PygameBaseGame):
             ball.draw(self.screen, self.cfg.WHITE)
             for brick in brick_sprites:
                 brick.draw(self.screen, self.cfg.YELLOW)
-            text_render = self.font_small.render('SCORE: %s, LIVES: %s' % (score, num_lives), False, self.cfg.BLUE)
-            self.screen.blit(text_render, (10, 10))
+            SharedTextCache.blit(self.screen, self.font_small, 'SCORE: %s, LIVES: %s' % (score, num_lives), self.cfg.BLUE, (10, 10), antialias=False)
             pygame.display.flip()
             clock.tick(self.cfg.FPS_GAMING)
   
@@ -3,7 +3,7 @@
 import os
 import pygame
 import random
-from ...utils import QuitGame
+from ...utils import QuitGame, SharedTextCache
 from ..base import PygameBaseGame
 from .modules import Hero, Food, ShowEndGameInterface
 from .constants import WHITE, BLACK, RED, GREEN, BLUE, LIGHT_BLUE, DARK_BLUE # Import colors from constants.py
@@ -45,26 +45,9 @@ class Config():
         'default_l': {'name': os.path.join(rootdir.replace('catchcoins', 'base'), 'resources/fonts/Gabriola.ttf'), 'size': 60},
     }
 
-'''Helper function to render text with an outline (New)'''
+'''Helper function to render text with an outline (New), the composited surface comes from the shared text cache'''
 def render_text_with_outline(font, text, text_color, outline_color, outline_thickness=2):
-    text_surface = font.render(text, True, text_color)
-    outline_surface = pygame.Surface(text_surface.get_size()).convert_alpha()
-    outline_surface.fill((0,0,0,0)) # Transparent
-
-    # Render outline by blitting shifted text
-    for dx in range(-outline_thickness, outline_thickness + 1):
-        for dy in range(-outline_thickness, outline_thickness + 1):
-            if dx != 0 or dy != 0: # Avoid re-rendering original text
-                outline_text = font.render(text, True, outline_color)
-                outline_surface.blit(outline_text, (dx + outline_thickness, dy + outline_thickness))
-
-    # Blit the original text on top
-    final_surface = pygame.Surface((text_surface.get_width() + 2 * outline_thickness,
-                                    text_surface.get_height() + 2 * outline_thickness)).convert_alpha()
-    final_surface.fill((0,0,0,0))
-    final_surface.blit(outline_surface, (0, 0))
-    final_surface.blit(text_surface, (outline_thickness, outline_thickness))
-    return final_surface
+    return SharedTextCache.render(font, text, text_color, effect='outline', effect_color=outline_color, offset=outline_thickness)
 
 
 '''接金币小游戏'''
@@ -1,2 +1,3 @@
 '''initialize'''
-from .game import gemSprite, gemGame
\ No newline at end of file
+from .game import gemSprite, gemGame
+from .board import gemBoard
\ No newline at end of file
@@ -0,0 +1,113 @@
+import random
+try:
+    import numpy as np
+except ImportError:
+    # numpy is optional, the board falls back to nested lists with the same results
+    np = None
+
+
+'''Board model: gem type indices in a [x][y] grid, -1 for an empty cell'''
+class gemBoard():
+    EMPTY = -1
+    def __init__(self, num_grid, num_types, use_numpy=True, **kwargs):
+        self.num_grid = num_grid
+        self.num_types = num_types
+        self.use_numpy = use_numpy and np is not None
+        # Rows then columns as lists of (x, y), scanned by the list fallback
+        self.lines = [[(x, y) for x in range(num_grid)] for y in range(num_grid)] + [[(x, y) for y in range(num_grid)] for x in range(num_grid)]
+        self.types = self.fromlists([[self.EMPTY] * num_grid for _ in range(num_grid)])
+    '''Build the type grid from nested lists indexed [x][y]'''
+    def fromlists(self, lists):
+        if self.use_numpy: return np.array(lists, dtype=np.int8)
+        return [list(column) for column in lists]
+    '''Type of the gem at (x, y)'''
+    def get(self, x, y):
+        return int(self.types[x][y])
+    '''Set the type of the gem at (x, y)'''
+    def set(self, x, y, gem_type):
+        self.types[x][y] = gem_type
+    '''Swap two cells'''
+    def swap(self, pos1, pos2):
+        type1, type2 = self.get(*pos1), self.get(*pos2)
+        self.set(pos1[0], pos1[1], type2)
+        self.set(pos2[0], pos2[1], type1)
+    '''Find every horizontal and vertical run of 3 or more in one pass, returns (number of runs, mask of matched cells)'''
+    def findMatches(self, types=None):
+        types = self.types if types is None else types
+        if self.use_numpy:
+            mask = np.zeros(types.shape, dtype=bool)
+            num_runs = 0
+            for axis in (0, 1):
+                grid = types if axis == 0 else types.T
+                view = mask if axis == 0 else mask.T
+                # starts[i] is True if cells i, i+1, i+2 along the axis hold the same gem
+                starts = (grid[:-2] == grid[1:-1]) & (grid[1:-1] == grid[2:]) & (grid[:-2] != self.EMPTY)
+                view[:-2] |= starts
+                view[1:-1] |= starts
+                view[2:] |= starts
+                # A run of length n has n - 2 consecutive starts, count the first of each
+                num_runs += int(starts[0].sum()) + int((starts[1:] & ~starts[:-1]).sum())
+            return num_runs, mask
+        mask = [[False] * self.num_grid for _ in range(self.num_grid)]
+        num_runs = 0
+        for line in self.lines:
+            run_start = 0
+            for i in range(1, len(line) + 1):
+                x0, y0 = line[run_start]
+                if i < len(line) and types[line[i][0]][line[i][1]] == types[x0][y0]: continue
+                if i - run_start >= 3 and types[x0][y0] != self.EMPTY:
+                    num_runs += 1
+                    for x, y in line[run_start:i]: mask[x][y] = True
+                run_start = i
+        return num_runs, mask
+    '''Whether the board has any run of 3'''
+    def hasMatch(self, types=None):
+        return self.findMatches(types)[0] > 0
+    '''Whether some adjacent swap creates a run, used to decide when the board must be reshuffled'''
+    def hasLegalMove(self):
+        types = self.types.copy() if self.use_numpy else [list(column) for column in self.types]
+        for x in range(self.num_grid):
+            for y in range(self.num_grid):
+                for nx, ny in ((x + 1, y), (x, y + 1)):
+                    if nx >= self.num_grid or ny >= self.num_grid or types[x][y] == types[nx][ny]: continue
+                    types[x][y], types[nx][ny] = types[nx][ny], types[x][y]
+                    found = self.hasMatch(types)
+                    types[x][y], types[nx][ny] = types[nx][ny], types[x][y]
+                    if found: return True
+        return False
+    '''Remove the matched cells and apply gravity to every column at once.
+    Returns (moves, spawns): moves are (x, from_y, to_y) of the surviving gems, spawns are (x, y, type) of the new gems, top first'''
+    def collapse(self, mask, rng=random):
+        moves, spawns = [], []
+        if self.use_numpy:
+            # Stable sort puts the removed cells on top and keeps the order of the survivors
+            order = np.argsort(~mask, axis=1, kind='stable')
+            num_removed = mask.sum(axis=1)
+            self.types = np.take_along_axis(self.types, order, axis=1)
+            for x in np.nonzero(num_removed)[0].tolist():
+                removed = int(num_removed[x])
+                for y in range(removed, self.num_grid):
+                    from_y = int(order[x, y])
+                    if from_y != y: moves.append((x, from_y, y))
+                for y in range(removed):
+                    gem_type = rng.randrange(self.num_types)
+                    self.types[x, y] = gem_type
+                    spawns.append((x, y, gem_type))
+            return moves, spawns
+        for x in range(self.num_grid):
+            survivors = [y for y in range(self.num_grid) if not mask[x][y]]
+            removed = self.num_grid - len(survivors)
+            if removed == 0: continue
+            column = [self.EMPTY] * removed + [self.types[x][y] for y in survivors]
+            for to_y, from_y in enumerate(survivors, start=removed):
+                if from_y != to_y: moves.append((x, from_y, to_y))
+            for y in range(removed):
+                column[y] = rng.randrange(self.num_types)
+                spawns.append((x, y, column[y]))
+            self.types[x] = column
+        return moves, spawns
+    '''Fill the board with random gems without any run and with at least one legal move'''
+    def randomize(self, rng=random):
+        while True:
+            self.types = self.fromlists([[rng.randrange(self.num_types) for _ in range(self.num_grid)] for _ in range(self.num_grid)])
+            if not self.hasMatch() and self.hasLegalMove(): return
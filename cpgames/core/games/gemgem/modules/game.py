@@ -1,7 +1,7 @@
 import time
-import random
 import pygame
-from ....utils import QuitGame
+from ....utils import QuitGame, SharedTextCache
+from .board import gemBoard
 
 
 '''Gem Sprite Class'''
@@ -64,6 +64,9 @@ class gemGame():
         if self.background_texture:
             # Scale background once to screen size if it's a static background
             self.background_texture = pygame.transform.scale(self.background_texture, self.cfg.SCREENSIZE)
+        # Gem types as indices into gem_types, the sprites only mirror this board
+        self.gem_types = list(self.gem_imgs.keys())
+        self.board = gemBoard(self.cfg.NUMGRID, len(self.gem_types))
 
         self.reset()
 
@@ -125,6 +128,9 @@ class gemGame():
                             self.add_score_alpha = 255 # Reset score animation
                             self.add_score_y_offset = 0
                             overall_moving = True # Keep overall moving as new gems need to drop
+                    elif not self.board.hasLegalMove(): # Dead board, drop in a new one
+                        self.createGems()
+                        overall_moving = True
 
 
             # Handle individual gem movement (swapping)
@@ -203,32 +209,8 @@ class gemGame():
 
     '''Initialize/Reset game board'''
     def reset(self):
-        # Randomly generate gems (initialize game map elements)
-        while True:
-            self.all_gems = []
-            self.gems_group = pygame.sprite.Group()
-            for x in range(self.cfg.NUMGRID):
-                self.all_gems.append([])
-                for y in range(self.cfg.NUMGRID):
-                    gem_type = random.choice(list(self.gem_imgs.keys()))
-                    # Initial position above the screen, they will drop down
-                    initial_y = self.cfg.YMARGIN + y * self.cfg.GRIDSIZE - self.cfg.NUMGRID * self.cfg.GRIDSIZE
-                    gem = gemSprite(
-                        image=self.gem_imgs[gem_type],
-                        gem_type=gem_type,
-                        size=(self.cfg.GRIDSIZE, self.cfg.GRIDSIZE),
-                        position=[self.cfg.XMARGIN + x * self.cfg.GRIDSIZE, initial_y]
-                    )
-                    # Set target_y for initial drop
-                    gem.target_y = self.cfg.YMARGIN + y * self.cfg.GRIDSIZE
-                    gem.fixed = False # They start unfixed
-                    gem.direction = 'down' # They start by falling down
-
-                    self.all_gems[x].append(gem)
-                    self.gems_group.add(gem)
-            # Ensure no initial matches
-            if self.isMatch()[0] == 0:
-                break
+        # Randomly generate gems (initialize game map elements), without initial matches
+        self.createGems()
         # Score
         self.score = 0
         # Reward for a match
@@ -236,15 +218,35 @@ class gemGame():
         # Time
         self.remaining_time = 300
 
+    '''Randomize the board and create the gem sprites, they start above the screen and drop down'''
+    def createGems(self):
+        self.board.randomize()
+        self.all_gems = []
+        self.gems_group = pygame.sprite.Group()
+        for x in range(self.cfg.NUMGRID):
+            self.all_gems.append([])
+            for y in range(self.cfg.NUMGRID):
+                gem_type = self.gem_types[self.board.get(x, y)]
+                # Initial position above the screen, they will drop down
+                initial_y = self.cfg.YMARGIN + y * self.cfg.GRIDSIZE - self.cfg.NUMGRID * self.cfg.GRIDSIZE
+                gem = gemSprite(
+                    image=self.gem_imgs[gem_type],
+                    gem_type=gem_type,
+                    size=(self.cfg.GRIDSIZE, self.cfg.GRIDSIZE),
+                    position=[self.cfg.XMARGIN + x * self.cfg.GRIDSIZE, initial_y]
+                )
+                # Set target_y for initial drop
+                gem.target_y = self.cfg.YMARGIN + y * self.cfg.GRIDSIZE
+                gem.fixed = False # They start unfixed
+                gem.direction = 'down' # They start by falling down
+
+                self.all_gems[x].append(gem)
+                self.gems_group.add(gem)
+
     '''Helper for outlined text rendering'''
     def draw_outlined_text(self, text, font, color, outline_color, position):
-        # Render outline
-        outline_text_surface = font.render(text, True, outline_color)
-        for dx, dy in [(1, 1), (1, -1), (-1, 1), (-1, -1)]:
-            self.screen.blit(outline_text_surface, (position[0] + dx, position[1] + dy))
-        # Render main text
-        main_text_surface = font.render(text, True, color)
-        self.screen.blit(main_text_surface, position)
+        # The four diagonal copies are the cache's glow effect in the outline color
+        SharedTextCache.blit(self.screen, font, text, color, position, effect='glow', effect_color=outline_color)
 
     '''Display remaining time'''
     def showRemainingTime(self):
@@ -282,73 +284,55 @@ class gemGame():
         self.add_score_alpha = max(0, self.add_score_alpha - 5) # Decrease alpha (faster fade)
         self.add_score_y_offset += 1.5 # Move up (faster movement)
 
-    '''Generate new gems after a match, handle gravity'''
-    def generateNewGems(self, matched_gems_coords):
-        # Matched_gems_coords is a list of [x, y] coordinates of all gems that were matched.
-        # This function processes each affected column.
-
-        affected_columns = set()
-        for x, y in matched_gems_coords:
-            gem = self.getGemByPos(x, y)
-            if gem:
-                self.gems_group.remove(gem) # Remove from sprite group for drawing
-                self.all_gems[x][y] = None # Mark as empty in the grid
-                affected_columns.add(x)
-
-        # Process each affected column to apply "gravity" and create new gems
-        for col_x in sorted(list(affected_columns)): # Process columns in ascending order
-            empty_slots_in_col = 0
-            # Iterate from bottom to top of the column to find empty slots and shift gems down
-            for row_y in range(self.cfg.NUMGRID - 1, -1, -1):
-                if self.all_gems[col_x][row_y] is None:
-                    empty_slots_in_col += 1
-                elif empty_slots_in_col > 0:
-                    # Move the gem down to fill the empty slot below it
-                    gem = self.getGemByPos(col_x, row_y)
-                    self.all_gems[col_x][row_y + empty_slots_in_col] = gem # Update grid position
-                    gem.target_y = self.cfg.YMARGIN + (row_y + empty_slots_in_col) * self.cfg.GRIDSIZE # Set new target Y
-                    gem.fixed = False # Mark as not fixed to trigger movement
-                    gem.direction = 'down' # Set direction
-                    self.all_gems[col_x][row_y] = None # Clear original spot in grid
-
-            # Create new gems at the top to fill the newly empty slots
-            for i in range(empty_slots_in_col):
-                # New gems fill the topmost empty slots in this column (row 0, 1, 2...)
-                new_gem_row_y = i
-                gem_type = random.choice(list(self.gem_imgs.keys()))
-                new_gem = gemSprite(
-                    image=self.gem_imgs[gem_type],
-                    gem_type=gem_type,
-                    size=(self.cfg.GRIDSIZE, self.cfg.GRIDSIZE),
-                    # Initial position: start above the board, offset by 'i' to stack them
-                    position=[self.cfg.XMARGIN + col_x * self.cfg.GRIDSIZE,
-                              self.cfg.YMARGIN - (empty_slots_in_col - i) * self.cfg.GRIDSIZE]
-                )
-                # Set the final resting target Y
-                new_gem.target_y = self.cfg.YMARGIN + new_gem_row_y * self.cfg.GRIDSIZE
-                new_gem.fixed = False # New gems need to fall
-                new_gem.direction = 'down' # They are falling down
-
-                self.all_gems[col_x][new_gem_row_y] = new_gem # Place new gem in grid
-                self.gems_group.add(new_gem) # Add to sprite group
+    '''Generate new gems after a match, handle gravity for all affected columns together'''
+    def generateNewGems(self, matched_mask):
+        # matched_mask[x][y] is True for every gem that was matched.
+        for x in range(self.cfg.NUMGRID):
+            for y in range(self.cfg.NUMGRID):
+                if matched_mask[x][y]:
+                    self.gems_group.remove(self.all_gems[x][y]) # Remove from sprite group for drawing
+        # The board drops the survivors and picks the new gems in one pass
+        moves, spawns = self.board.collapse(matched_mask)
+        columns_before = [list(column) for column in self.all_gems]
+        for col_x, from_y, to_y in moves:
+            # Move the gem down to fill the empty slots below it
+            gem = columns_before[col_x][from_y]
+            self.all_gems[col_x][to_y] = gem # Update grid position
+            gem.target_y = self.cfg.YMARGIN + to_y * self.cfg.GRIDSIZE # Set new target Y
+            gem.fixed = False # Mark as not fixed to trigger movement
+            gem.direction = 'down' # Set direction
+
+        empty_slots = [0] * self.cfg.NUMGRID
+        for col_x, _, _ in spawns:
+            empty_slots[col_x] += 1
+        # Create new gems at the top to fill the newly empty slots
+        for col_x, new_gem_row_y, type_idx in spawns:
+            gem_type = self.gem_types[type_idx]
+            new_gem = gemSprite(
+                image=self.gem_imgs[gem_type],
+                gem_type=gem_type,
+                size=(self.cfg.GRIDSIZE, self.cfg.GRIDSIZE),
+                # Initial position: start above the board, offset by the row to stack them
+                position=[self.cfg.XMARGIN + col_x * self.cfg.GRIDSIZE,
+                          self.cfg.YMARGIN - (empty_slots[col_x] - new_gem_row_y) * self.cfg.GRIDSIZE]
+            )
+            # Set the final resting target Y
+            new_gem.target_y = self.cfg.YMARGIN + new_gem_row_y * self.cfg.GRIDSIZE
+            new_gem.fixed = False # New gems need to fall
+            new_gem.direction = 'down' # They are falling down
+
+            self.all_gems[col_x][new_gem_row_y] = new_gem # Place new gem in grid
+            self.gems_group.add(new_gem) # Add to sprite group
 
 
     '''Remove matched gems and trigger new gem generation'''
     def removeMatched(self, res_match):
-        if res_match[0] > 0: # If a match was found
-            matched_coords = []
-            if res_match[0] == 1: # Horizontal match
-                start_x, start_y = res_match[1], res_match[2]
-                for dx in range(3):
-                    matched_coords.append([start_x + dx, start_y])
-            elif res_match[0] == 2: # Vertical match
-                start_x, start_y = res_match[1], res_match[2]
-                for dy in range(3):
-                    matched_coords.append([start_x, start_y + dy])
-            # Call the new generateNewGems with all matched coordinates
-            self.generateNewGems(matched_coords)
-            self.score += self.reward
-            return self.reward
+        if res_match[0] > 0: # If any run was found
+            # Every run (of 3 or more, overlapping ones included) is removed at once
+            self.generateNewGems(res_match[1])
+            add_score = self.reward * res_match[0]
+            self.score += add_score
+            return add_score
         return 0
 
     '''Draw the game board grids with hollow effect'''
@@ -409,26 +393,9 @@ class gemGame():
                     return [x, y]
         return None
 
-    '''Check for 3-in-a-row matches (horizontal or vertical)'''
+    '''Check for runs of 3 or more (horizontal and vertical), returns [number of runs, mask of matched gems]'''
     def isMatch(self):
-        # Check horizontal matches
-        for y in range(self.cfg.NUMGRID):
-            for x in range(self.cfg.NUMGRID - 2):
-                if self.getGemByPos(x, y) and \
-                   self.getGemByPos(x+1, y) and \
-                   self.getGemByPos(x+2, y) and \
-                   self.getGemByPos(x, y).type == self.getGemByPos(x+1, y).type == self.getGemByPos(x+2, y).type:
-                    return [1, x, y] # [type_of_match (1=horizontal), start_x, start_y]
-
-        # Check vertical matches
-        for x in range(self.cfg.NUMGRID):
-            for y in range(self.cfg.NUMGRID - 2):
-                if self.getGemByPos(x, y) and \
-                   self.getGemByPos(x, y+1) and \
-                   self.getGemByPos(x, y+2) and \
-                   self.getGemByPos(x, y).type == self.getGemByPos(x, y+1).type == self.getGemByPos(x, y+2).type:
-                    return [2, x, y] # [type_of_match (2=vertical), start_x, start_y]
-        return [0, 0, 0] # No match found
+        return list(self.board.findMatches())
 
     '''Get gem object by its grid coordinates (x, y)'''
     def getGemByPos(self, x, y):
@@ -471,9 +438,10 @@ class gemGame():
             gem1.fixed = False
             gem2.fixed = False
 
-            # Swap gem objects in the underlying all_gems grid immediately
+            # Swap gem objects in the underlying all_gems grid and board immediately
             self.all_gems[gem2_grid_pos[0]][gem2_grid_pos[1]] = gem1
             self.all_gems[gem1_grid_pos[0]][gem1_grid_pos[1]] = gem2
+            self.board.swap(gem1_grid_pos, gem2_grid_pos)
             return True
         return False # Not adjacent
 
@@ -1,5 +1,6 @@
 import pygame
 import random
+from ....utils import SharedTextCache
 
 '''画游戏网格'''
 def drawGameGrid(cfg, screen):
@@ -15,10 +16,7 @@ def drawGameGrid(cfg, screen):
 def showScore(cfg, score, screen, resource_loader):
     color = (255, 255, 255)
     font = resource_loader.fonts['score_font'] # Use the larger score font
-    text = font.render('Score: %s' % score, True, color)
-    rect = text.get_rect()
-    rect.topleft = (10, 10)
-    screen.blit(text, rect)
+    SharedTextCache.blit(screen, font, 'Score: %s' % score, color, (10, 10))
 
 
 '''粒子效果类 (New)'''
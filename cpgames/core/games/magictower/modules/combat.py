@@ -0,0 +1,41 @@
+'''计算勇士与怪物的战斗结果, 全部为整数运算, 回合顺序与Hero.battle一致: 勇士先攻击, 怪物还击, 怪物生命值归零时战斗立即结束'''
+def fight(life_value, attack_power, defense_power, monster):
+    # monster: [名字, 生命值, 攻击力, 防御力, 金币, 经验], 返回(能否打赢, 回合数, 勇士损失的生命值), 破不了防时回合数和损失都为None
+    rounds, damage = battlecost(attack_power, defense_power, monster)
+    if rounds is None: return False, None, None
+    return damage < life_value, rounds, damage
+
+
+'''只与攻防有关的部分: 勇士需要攻击的次数和受到的总伤害'''
+def battlecost(attack_power, defense_power, monster):
+    # 我方打怪物一次扣多少血
+    diff_our = attack_power - monster[3]
+    if diff_our <= 0: return None, None
+    # 怪物打我方一次扣多少血
+    diff_monster = max(monster[2] - defense_power, 0)
+    # 向上取整, 最后一击打死怪物后怪物不再还击
+    rounds = -(-monster[1] // diff_our)
+    return rounds, (rounds - 1) * diff_monster
+
+
+'''一层地图上所有怪物的战斗损失表, 只在勇士攻防变化时重新计算'''
+class DamageTable():
+    def __init__(self, monsters_dict, map_matrix):
+        self.monsters_dict = monsters_dict
+        # 本层出现过的怪物, 打死之后留在表里也没有影响
+        self.elems = sorted(set(elem for row in map_matrix for elem in row if elem in monsters_dict))
+        self.stats = None
+        self.table = {}
+    '''按勇士当前的攻防刷新损失表, 返回{元素: (回合数, 损失)}'''
+    def update(self, attack_power, defense_power):
+        if self.stats == (attack_power, defense_power): return self.table
+        self.stats = (attack_power, defense_power)
+        self.table = {elem: battlecost(attack_power, defense_power, self.monsters_dict[elem]) for elem in self.elems}
+        return self.table
+    '''查询某个怪物的(能否打赢, 回合数, 损失)'''
+    def lookup(self, elem, life_value, attack_power, defense_power):
+        table = self.update(attack_power, defense_power)
+        if elem not in table: table[elem] = battlecost(attack_power, defense_power, self.monsters_dict[elem])
+        rounds, damage = table[elem]
+        if rounds is None: return False, None, None
+        return damage < life_value, rounds, damage
@@ -2,7 +2,7 @@
 import pygame
 from .sprites import Hero
 from .maps import MapParser
-from ....utils import QuitGame
+from ....utils import QuitGame, SharedTextCache
 
 
 '''魔塔小游戏主要逻辑实现'''
@@ -44,6 +44,7 @@ class GameLevels():
                 filepath=self.cfg.MAPPATHS[self.map_level_pointer], 
                 element_images=self.map_element_images,
                 offset=(325, 55),
+                background=self.background_images['gamebg'],
             )
             self.map_parsers_dict[self.map_level_pointer] = self.map_parser
     '''运行'''
@@ -57,6 +58,11 @@ class GameLevels():
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
                     QuitGame()
+                # ----F键切换是否跳过战斗动画
+                elif event.type == pygame.KEYDOWN and event.key == pygame.K_f:
+                    self.hero.fast_battle = not self.hero.fast_battle
+                    self.hero.obtain_tips = 'Fast battle on' if self.hero.fast_battle else 'Fast battle off'
+                    self.hero.show_obtain_tips_count = 0
             key_pressed = pygame.key.get_pressed()
             move_events = []
             if key_pressed[pygame.K_w] or key_pressed[pygame.K_UP]:
@@ -75,10 +81,10 @@ class GameLevels():
             # --画游戏地图
             self.map_parser.draw(screen)
             # --左侧面板栏
-            font = pygame.font.Font(self.cfg.FONT_PATHS_NOPRELOAD_DICT['font_cn'], 20)
+            font = SharedTextCache.getfont(self.cfg.FONT_PATHS_NOPRELOAD_DICT['font_cn'], 20)
             font_renders = [
-                self.hero.font.render(str(self.map_level_pointer), True, (255, 255, 255)),
-                font.render('Game time: ' + str(pygame.time.get_ticks() // 60000) + ' Point ' + str(pygame.time.get_ticks() // 1000 % 60) + ' Second', True, (255, 255, 255)),
+                SharedTextCache.render(self.hero.font, str(self.map_level_pointer), (255, 255, 255)),
+                SharedTextCache.render(font, 'Game time: ' + str(pygame.time.get_ticks() // 60000) + ' Point ' + str(pygame.time.get_ticks() // 1000 % 60) + ' Second', (255, 255, 255)),
             ]
             rects = [fr.get_rect() for fr in font_renders]
             rects[0].topleft = (150, 530)
@@ -121,7 +127,7 @@ class GameLevels():
     def showforecastlevel(self, screen, scenes):
         # 主循环
         clock = pygame.time.Clock()
-        font = pygame.font.Font(self.cfg.FONT_PATHS_NOPRELOAD_DICT['font_cn'], 20)
+        font = SharedTextCache.getfont(self.cfg.FONT_PATHS_NOPRELOAD_DICT['font_cn'], 20)
         monsters = self.map_parser.getallmonsters()
         if len(monsters) < 1: return
         monsters_show_pointer, max_monsters_show_pointer = 1, round(len(monsters) / 4)
@@ -153,18 +159,18 @@ class GameLevels():
             left, top = self.cfg.SCREENSIZE[0] // 2 - width // 2 * self.cfg.BLOCKSIZE, self.cfg.SCREENSIZE[1] // 2 - height * self.cfg.BLOCKSIZE
             for col in range(width):
                 for row in range(height):
-                    image = self.resource_loader.images['mapelements']['0'][0]
-                    image = pygame.transform.scale(image, (self.cfg.BLOCKSIZE, self.cfg.BLOCKSIZE))
+                    image = self.map_parser.getimage('0')
                     screen.blit(image, (left + col * self.cfg.BLOCKSIZE, top + row * self.cfg.BLOCKSIZE))
             # ----边框
             pygame.draw.rect(screen, (199, 97, 20), (left - 4, top - 4, self.cfg.BLOCKSIZE * width + 8, self.cfg.BLOCKSIZE * height + 8), 7)
-            # ----展示选项
+            # ----展示选项, 损失直接查本层的损失表, 勇士攻防不变时不会重新计算
+            damage_table = self.map_parser.damage_table
             for idx, monster in enumerate(monsters[(monsters_show_pointer-1)*4: monsters_show_pointer*4]):
-                id_image = self.resource_loader.images['mapelements'][monster[6]][0]
-                id_image = pygame.transform.scale(id_image, (self.cfg.BLOCKSIZE - 10, self.cfg.BLOCKSIZE - 10))
+                can_win, _, damage = damage_table.lookup(monster[6], self.hero.life_value, self.hero.attack_power, self.hero.defense_power)
+                id_image = self.map_parser.getimage(monster[6], 0, (self.cfg.BLOCKSIZE - 10, self.cfg.BLOCKSIZE - 10))
                 screen.blit(id_image, (left + 10, top + 20 + idx * self.cfg.BLOCKSIZE))
-                text = f'Name: {monster[0]}  Life: {monster[1]}  Attack: {monster[2]}  Defense: {monster[3]}  Gold: {monster[4]}  Experience: {monster[5]}  Loss: {self.hero.winmonster(monster)[1]}'
-                font_render = font.render(text, True, (255, 255, 255))
+                text = f'Name: {monster[0]}  Life: {monster[1]}  Attack: {monster[2]}  Defense: {monster[3]}  Gold: {monster[4]}  Experience: {monster[5]}  Loss: {damage if can_win else "???"}'
+                font_render = SharedTextCache.render(font, text, (255, 255, 255))
                 rect = font_render.get_rect()
                 rect.left, rect.top = left + 15 + self.cfg.BLOCKSIZE, top + 30 + idx * self.cfg.BLOCKSIZE
                 screen.blit(font_render, rect)
@@ -175,7 +181,7 @@ class GameLevels():
                 show_tip_text = not show_tip_text
             if show_tip_text:
                 tip_text = 'Spacebar'
-                font_render = font.render(tip_text, True, (255, 255, 255))
+                font_render = SharedTextCache.render(font, tip_text, (255, 255, 255))
                 rect.left, rect.bottom = self.cfg.BLOCKSIZE * width + 30, self.cfg.BLOCKSIZE * (height + 1) + 10
                 screen.blit(font_render, rect)
             # --刷新
@@ -185,7 +191,7 @@ class GameLevels():
     def showjumplevel(self, screen, scenes):
         # 主循环
         clock, selected_level = pygame.time.Clock(), self.map_level_pointer
-        font = pygame.font.Font(self.cfg.FONT_PATHS_NOPRELOAD_DICT['font_cn'], 20)
+        font = SharedTextCache.getfont(self.cfg.FONT_PATHS_NOPRELOAD_DICT['font_cn'], 20)
         while True:
             screen.fill((0, 0, 0))
             screen.blit(self.background_images['gamebg'], (0, 0))
@@ -210,8 +216,7 @@ class GameLevels():
             left, top = self.cfg.SCREENSIZE[0] // 2 - width // 2 * self.cfg.BLOCKSIZE, self.cfg.SCREENSIZE[1] // 2 - height * self.cfg.BLOCKSIZE
             for col in range(width):
                 for row in range(height):
-                    image = self.resource_loader.images['mapelements']['0'][0]
-                    image = pygame.transform.scale(image, (self.cfg.BLOCKSIZE, self.cfg.BLOCKSIZE))
+                    image = self.map_parser.getimage('0')
                     screen.blit(image, (left + col * self.cfg.BLOCKSIZE, top + row * self.cfg.BLOCKSIZE))
             # ----边框
             pygame.draw.rect(screen, (199, 97, 20), (left - 4, top - 4, self.cfg.BLOCKSIZE * width + 8, self.cfg.BLOCKSIZE * height + 8), 7)
@@ -219,93 +224,94 @@ class GameLevels():
             for idx in list(range(self.max_map_level_pointer+1)):
                 if selected_level == idx:
                     text = f'➤No. {idx} layer'
-                    font_render = font.render(text, True, (255, 0, 0))
+                    font_render = SharedTextCache.render(font, text, (255, 0, 0))
                 else:
                     text = f'➤No. {idx} layer'
-                    font_render = font.render(text, True, (255, 255, 255))
+                    font_render = SharedTextCache.render(font, text, (255, 255, 255))
                 rect = font_render.get_rect()
                 rect.left, rect.top = left + 20 + idx // 6 * self.cfg.BLOCKSIZE * 2, top + 20 + (idx % 6) * 30
                 screen.blit(font_render, rect)
             # --刷新
             pygame.display.flip()
             clock.tick(self.cfg.FPS)
-    '''显示商店'''
-    def showbuyinterface(self, screen, scenes, shop_type):
-        # 购买函数
-        def buy(hero, coins_cost=0, experience_cost=0, add_life_value=0, add_attack_power=0, add_defense_power=0, add_level=0, add_yellow_keys=0, add_purple_keys=0, add_red_keys=0):
-            if hero.num_coins < coins_cost: return
-            if hero.experience < experience_cost: return
-            if add_yellow_keys < 0 and hero.num_yellow_keys < 1: return
-            if add_purple_keys < 0 and hero.num_purple_keys < 1: return
-            if add_red_keys < 0 and hero.num_red_keys < 1: return
-            hero.num_coins -= coins_cost
-            hero.experience -= experience_cost
-            hero.life_value += add_life_value + 1000 * add_level
-            hero.attack_power += add_attack_power + 7 * add_level
-            hero.defense_power += add_defense_power + 7 * add_level
-            hero.level += add_level
-            hero.num_yellow_keys += add_yellow_keys
-            hero.num_purple_keys += add_purple_keys
-            hero.num_red_keys += add_red_keys
-        # 选项定义
+    '''商店购买, 钱或经验不够时什么都不做'''
+    @staticmethod
+    def buy(hero, coins_cost=0, experience_cost=0, add_life_value=0, add_attack_power=0, add_defense_power=0, add_level=0, add_yellow_keys=0, add_purple_keys=0, add_red_keys=0):
+        if hero.num_coins < coins_cost: return
+        if hero.experience < experience_cost: return
+        if add_yellow_keys < 0 and hero.num_yellow_keys < 1: return
+        if add_purple_keys < 0 and hero.num_purple_keys < 1: return
+        if add_red_keys < 0 and hero.num_red_keys < 1: return
+        hero.num_coins -= coins_cost
+        hero.experience -= experience_cost
+        hero.life_value += add_life_value + 1000 * add_level
+        hero.attack_power += add_attack_power + 7 * add_level
+        hero.defense_power += add_defense_power + 7 * add_level
+        hero.level += add_level
+        hero.num_yellow_keys += add_yellow_keys
+        hero.num_purple_keys += add_purple_keys
+        hero.num_red_keys += add_red_keys
+    '''某一层商店的所有选项, 返回[(选项, 购买参数), ...], 最后一项是离开商店, 这一层没有这种商店时返回None'''
+    @staticmethod
+    def getshopchoices(map_level_pointer, shop_type):
         # --第三层商店
-        if self.map_level_pointer == 3 and shop_type == 'buy_from_shop':
-            choices_dict = {
-                'Increase health by 800 (25 gold)': lambda: buy(self.hero, coins_cost=25, add_life_value=800),
-                'Increase Attack by 4 (25 gold)': lambda: buy(self.hero, coins_cost=25, add_attack_power=4),
-                'Increases defense by 4 (25 gold)': lambda: buy(self.hero, coins_cost=25, add_defense_power=4),
-                'Leave the store': lambda: buy(self.hero),
-            }
-            id_image = self.resource_loader.images['mapelements']['22'][0]
+        if map_level_pointer == 3 and shop_type == 'buy_from_shop':
+            choices = [
+                ('Increase health by 800 (25 gold)', dict(coins_cost=25, add_life_value=800)),
+                ('Increase Attack by 4 (25 gold)', dict(coins_cost=25, add_attack_power=4)),
+                ('Increases defense by 4 (25 gold)', dict(coins_cost=25, add_defense_power=4)),
+            ]
         # --第十一层商店
-        elif self.map_level_pointer == 11 and shop_type == 'buy_from_shop':
-            choices_dict = {
-                'Increase health by 4000 (100 gold coins)': lambda: buy(self.hero, coins_cost=100, add_life_value=4000),
-                'Increase Attack by 20 (100 gold coins)': lambda: buy(self.hero, coins_cost=100, add_attack_power=20),
-                'Increases defense by 20 (100 gold)': lambda: buy(self.hero, coins_cost=100, add_defense_power=20),
-                'Leave the store': lambda: buy(self.hero),
-            }
-            id_image = self.resource_loader.images['mapelements']['22'][0]
+        elif map_level_pointer == 11 and shop_type == 'buy_from_shop':
+            choices = [
+                ('Increase health by 4000 (100 gold coins)', dict(coins_cost=100, add_life_value=4000)),
+                ('Increase Attack by 20 (100 gold coins)', dict(coins_cost=100, add_attack_power=20)),
+                ('Increases defense by 20 (100 gold)', dict(coins_cost=100, add_defense_power=20)),
+            ]
         # --第五层神秘老人
-        elif self.map_level_pointer == 5 and shop_type == 'buy_from_oldman':
-            choices_dict = {
-                'Level Up (100 XP)': lambda: buy(self.hero, experience_cost=100, add_level=1),
-                'Increase attack by 5 (30 XP points)': lambda: buy(self.hero, experience_cost=30, add_attack_power=5),
-                'Increases defense by 5 (30 XP points)': lambda: buy(self.hero, experience_cost=30, add_defense_power=5),
-                'Leave the store': lambda: buy(self.hero),
-            }
-            id_image = self.resource_loader.images['mapelements']['26'][0]
+        elif map_level_pointer == 5 and shop_type == 'buy_from_oldman':
+            choices = [
+                ('Level Up (100 XP)', dict(experience_cost=100, add_level=1)),
+                ('Increase attack by 5 (30 XP points)', dict(experience_cost=30, add_attack_power=5)),
+                ('Increases defense by 5 (30 XP points)', dict(experience_cost=30, add_defense_power=5)),
+            ]
         # --第十三层神秘老人
-        elif self.map_level_pointer == 13 and shop_type == 'buy_from_oldman':
-            choices_dict = {
-                'Level 3 upgrade (270 XP points)': lambda: buy(self.hero, experience_cost=270, add_level=1),
-                'Increases attack by 17 points (95 XP points)': lambda: buy(self.hero, experience_cost=95, add_attack_power=17),
-                'Increases defense by 17 (95 XP points)': lambda: buy(self.hero, experience_cost=95, add_defense_power=17),
-                'Leave the store': lambda: buy(self.hero),
-            }
-            id_image = self.resource_loader.images['mapelements']['26'][0]
+        elif map_level_pointer == 13 and shop_type == 'buy_from_oldman':
+            choices = [
+                ('Level 3 upgrade (270 XP points)', dict(experience_cost=270, add_level=1)),
+                ('Increases attack by 17 points (95 XP points)', dict(experience_cost=95, add_attack_power=17)),
+                ('Increases defense by 17 (95 XP points)', dict(experience_cost=95, add_defense_power=17)),
+            ]
         # --第五层商人
-        elif self.map_level_pointer == 5 and shop_type == 'buy_from_businessman':
-            choices_dict = {
-                'Buy 1 Yellow Key (10 Gold)': lambda: buy(self.hero, coins_cost=10, add_yellow_keys=1),
-                'Buy 1 Blue Key (50 Gold)': lambda: buy(self.hero, coins_cost=50, add_purple_keys=1),
-                'Buy 1 Red Key (100 Gold)': lambda: buy(self.hero, coins_cost=100, add_red_keys=1),
-                'Leave the store': lambda: buy(self.hero),
-            }
-            id_image = self.resource_loader.images['mapelements']['27'][0]
+        elif map_level_pointer == 5 and shop_type == 'buy_from_businessman':
+            choices = [
+                ('Buy 1 Yellow Key (10 Gold)', dict(coins_cost=10, add_yellow_keys=1)),
+                ('Buy 1 Blue Key (50 Gold)', dict(coins_cost=50, add_purple_keys=1)),
+                ('Buy 1 Red Key (100 Gold)', dict(coins_cost=100, add_red_keys=1)),
+            ]
         # --第十二层商人
-        elif self.map_level_pointer == 12 and shop_type == 'buy_from_businessman':
-            choices_dict = {
-                'Sell 1 Yellow Key (7 Gold)': lambda: buy(self.hero, coins_cost=-7, add_yellow_keys=-1),
-                'Sell 1 Blue Key (35 Gold)': lambda: buy(self.hero, coins_cost=-35, add_purple_keys=-1),
-                'Sell 1 Red Key (70 Coins)': lambda: buy(self.hero, coins_cost=-70, add_red_keys=-1),
-                'Leave the store': lambda: buy(self.hero),
-            }
-            id_image = self.resource_loader.images['mapelements']['27'][0]
+        elif map_level_pointer == 12 and shop_type == 'buy_from_businessman':
+            choices = [
+                ('Sell 1 Yellow Key (7 Gold)', dict(coins_cost=-7, add_yellow_keys=-1)),
+                ('Sell 1 Blue Key (35 Gold)', dict(coins_cost=-35, add_purple_keys=-1)),
+                ('Sell 1 Red Key (70 Coins)', dict(coins_cost=-70, add_red_keys=-1)),
+            ]
+        else:
+            return None
+        return choices + [('Leave the store', dict())]
+    '''显示商店'''
+    def showbuyinterface(self, screen, scenes, shop_type):
+        # 选项定义
+        shop_choices = self.getshopchoices(self.map_level_pointer, shop_type)
+        if shop_choices is None: return
+        choices_dict = {
+            choice: (lambda kwargs=kwargs: self.buy(self.hero, **kwargs)) for choice, kwargs in shop_choices
+        }
+        id_image = self.resource_loader.images['mapelements'][{'buy_from_shop': '22', 'buy_from_oldman': '26', 'buy_from_businessman': '27'}[shop_type]][0]
         id_image = pygame.transform.scale(id_image, (self.cfg.BLOCKSIZE, self.cfg.BLOCKSIZE))
         # 主循环
         clock, selected_idx = pygame.time.Clock(), 1
-        font = pygame.font.Font(self.cfg.FONT_PATHS_NOPRELOAD_DICT['font_cn'], 20)
+        font = SharedTextCache.getfont(self.cfg.FONT_PATHS_NOPRELOAD_DICT['font_cn'], 20)
         while True:
             screen.fill((0, 0, 0))
             screen.blit(self.background_images['gamebg'], (0, 0))
@@ -331,8 +337,7 @@ class GameLevels():
             left, bottom = self.hero.rect.left + self.hero.rect.width // 2 - width // 2 * self.cfg.BLOCKSIZE, self.hero.rect.bottom
             for col in range(width):
                 for row in range(height):
-                    image = self.resource_loader.images['mapelements']['0'][0]
-                    image = pygame.transform.scale(image, (self.cfg.BLOCKSIZE, self.cfg.BLOCKSIZE))
+                    image = self.map_parser.getimage('0')
                     screen.blit(image, (left + col * self.cfg.BLOCKSIZE, bottom + row * self.cfg.BLOCKSIZE))
             # ----边框
             pygame.draw.rect(screen, (199, 97, 20), (left - 4, bottom - 4, self.cfg.BLOCKSIZE * width + 8, self.cfg.BLOCKSIZE * height + 8), 7)
@@ -340,12 +345,12 @@ class GameLevels():
             for idx, choice in enumerate(['Please select:'] + list(choices_dict.keys())):
                 if selected_idx == idx and idx > 0:
                     choice = '➤' + choice
-                    font_render = font.render(choice, True, (255, 0, 0))
+                    font_render = SharedTextCache.render(font, choice, (255, 0, 0))
                 elif idx > 0:
                     choice = '    ' + choice
-                    font_render = font.render(choice, True, (255, 255, 255))
+                    font_render = SharedTextCache.render(font, choice, (255, 255, 255))
                 else:
-                    font_render = font.render(choice, True, (255, 255, 255))
+                    font_render = SharedTextCache.render(font, choice, (255, 255, 255))
                 rect = font_render.get_rect()
                 rect.left, rect.top = left + self.cfg.BLOCKSIZE + 20, bottom + 10 + idx * 30
                 screen.blit(font_render, rect)
@@ -391,7 +396,7 @@ class GameLevels():
             ]
         # 主循环
         clock = pygame.time.Clock()
-        font = pygame.font.Font(self.cfg.FONT_PATHS_NOPRELOAD_DICT['font_cn'], 20)
+        font = SharedTextCache.getfont(self.cfg.FONT_PATHS_NOPRELOAD_DICT['font_cn'], 20)
         while True:
             screen.fill((0, 0, 0))
             screen.blit(self.background_images['gamebg'], (0, 0))
@@ -425,14 +430,13 @@ class GameLevels():
             # ----底色
             for col in range(width):
                 for row in range(height):
-                    image = self.resource_loader.images['mapelements']['0'][0]
-                    image = pygame.transform.scale(image, (self.cfg.BLOCKSIZE, self.cfg.BLOCKSIZE))
+                    image = self.map_parser.getimage('0')
                     screen.blit(image, (left + col * self.cfg.BLOCKSIZE, top + row * self.cfg.BLOCKSIZE))
             # ----左上角图标
             screen.blit(id_image, (left + 10, top + 10))
             # ----对话框中的文字
             for idx, text in enumerate(conversation):
-                font_render = font.render(text, True, (255, 255, 255))
+                font_render = SharedTextCache.render(font, text, (255, 255, 255))
                 rect = font_render.get_rect()
                 rect.left, rect.top = left + self.cfg.BLOCKSIZE + 40, top + 10 + idx * 30
                 screen.blit(font_render, rect)
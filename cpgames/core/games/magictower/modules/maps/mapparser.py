@@ -1,10 +1,11 @@
 
 import pygame
+from ..combat import DamageTable
 
 
 '''游戏地图解析类'''
 class MapParser():
-    def __init__(self, blocksize, filepath, element_images, offset=(0, 0), **kwargs):
+    def __init__(self, blocksize, filepath, element_images, offset=(0, 0), background=None, **kwargs):
         self.count = 0
         self.switch_times = 15
         self.image_pointer = 0
@@ -13,6 +14,11 @@ class MapParser():
         self.element_images = element_images
         self.map_matrix = self.parse(filepath)
         self.map_size = (len(self.map_matrix), len(self.map_matrix[0]))
+        # 地图层: 每个动画帧一张编译好的静态图, 有背景图时直接合成在背景上, 之后只重画被修改过的格子
+        self.background = background
+        self.layers = None
+        self.dirty_cells = set()
+        self.scaled_images = {}
         # 地图上所有怪物的属性: 名字, 生命值, 攻击力, 防御力, 金币, 经验
         self.monsters_dict = {
             '40': ('Green-headed Monster', 50, 20, 1, 1, 1),
@@ -49,6 +55,8 @@ class MapParser():
             '188': ('Blood Shadow', 99999, 5000, 4000, 0, 0),
             '198': ('Demon Dragon', 99999, 9999, 5000, 0, 0),
         }
+        # 本层怪物的战斗损失表
+        self.damage_table = DamageTable(self.monsters_dict, self.map_matrix)
 
 
     '''解析'''
@@ -80,20 +88,48 @@ class MapParser():
                     if pos_type == 'pixel': return position
                     else: return (col_idx, row_idx)
         return None
+    '''获得缩放到格子大小的元素图片, 每种元素每个动画帧只缩放一次'''
+    def getimage(self, elem, image_pointer=0, size=None):
+        size = size or (self.blocksize, self.blocksize)
+        key = (elem, image_pointer, size)
+        if key not in self.scaled_images:
+            self.scaled_images[key] = pygame.transform.scale(self.element_images[elem][image_pointer], size)
+        return self.scaled_images[key]
+    '''修改地图上的一个元素, 只把这一格标记为需要重画'''
+    def setelem(self, block_position, elem):
+        self.map_matrix[block_position[1]][block_position[0]] = elem
+        self.dirty_cells.add(tuple(block_position))
+    '''把一格画到两个动画帧的地图层上'''
+    def rendercell(self, col_idx, row_idx):
+        elem = self.map_matrix[row_idx][col_idx]
+        if elem in ['00', 'hero']: elem = '0'
+        rect = pygame.Rect(col_idx * self.blocksize, row_idx * self.blocksize, self.blocksize, self.blocksize)
+        for image_pointer, layer in enumerate(self.layers):
+            if self.background is not None:
+                layer.blit(self.background, rect, rect.move(self.offset))
+            else:
+                layer.fill((0, 0, 0, 0), rect)
+            if elem in self.element_images:
+                layer.blit(self.getimage(elem, image_pointer), rect)
+    '''把整层地图编译成两个动画帧的静态图层'''
+    def compile(self):
+        layer_size = self.map_size[1] * self.blocksize, self.map_size[0] * self.blocksize
+        if self.background is not None:
+            self.layers = [pygame.Surface(layer_size).convert() for _ in range(2)]
+        else:
+            self.layers = [pygame.Surface(layer_size, pygame.SRCALPHA).convert_alpha() for _ in range(2)]
+        for row_idx in range(self.map_size[0]):
+            for col_idx in range(self.map_size[1]):
+                self.rendercell(col_idx, row_idx)
+        self.dirty_cells = set()
     '''将游戏地图画到屏幕上'''
     def draw(self, screen):
         self.count += 1
         if self.count == self.switch_times:
             self.count = 0
             self.image_pointer = int(not self.image_pointer)
-        for row_idx, row in enumerate(self.map_matrix):
-            for col_idx, elem in enumerate(row):
-                position = col_idx * self.blocksize + self.offset[0], row_idx * self.blocksize + self.offset[1]
-                if elem in self.element_images:
-                    image = self.element_images[elem][self.image_pointer]
-                    image = pygame.transform.scale(image, (self.blocksize, self.blocksize))
-                    screen.blit(image, position)
-                elif elem in ['00', 'hero']:
-                    image = self.element_images['0'][self.image_pointer]
-                    image = pygame.transform.scale(image, (self.blocksize, self.blocksize))
-                    screen.blit(image, position)
\ No newline at end of file
+        if self.layers is None: self.compile()
+        for col_idx, row_idx in self.dirty_cells:
+            self.rendercell(col_idx, row_idx)
+        self.dirty_cells = set()
+        screen.blit(self.layers[self.image_pointer], self.offset)
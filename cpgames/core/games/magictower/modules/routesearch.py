@@ -0,0 +1,282 @@
+import heapq
+from collections import defaultdict
+from .maps import MapParser
+from .sprites import Hero
+from .gamelevels import GameLevels
+
+
+'''离线搜索时的勇士属性, 字段和Hero一致, 这样可以直接复用Hero.dealcollideevent里的属性变化规则'''
+class TowerState():
+    # 参与支配比较的属性, 每一项都是越大越好
+    STATS = ('life_value', 'attack_power', 'defense_power', 'num_yellow_keys', 'num_purple_keys', 'num_red_keys', 'num_coins', 'experience', 'level')
+    def __init__(self, **kwargs):
+        self.level = 1
+        self.life_value = 1000
+        self.attack_power = 10
+        self.defense_power = 10
+        self.num_coins = 0
+        self.experience = 0
+        self.num_yellow_keys = 1
+        self.num_purple_keys = 1
+        self.num_red_keys = 1
+        self.has_cross = False
+        self.has_forecast = False
+        self.has_jump = False
+        self.has_hammer = False
+        self.obtain_tips = None
+        for key, value in kwargs.items(): setattr(self, key, value)
+    '''从游戏里的勇士复制属性'''
+    @classmethod
+    def fromhero(cls, hero):
+        return cls(**{key: getattr(hero, key) for key in cls.STATS + ('has_cross', 'has_forecast', 'has_jump', 'has_hammer')})
+    '''复制'''
+    def copy(self):
+        state = TowerState.__new__(TowerState)
+        state.__dict__.update(self.__dict__)
+        return state
+    '''用于支配比较的属性向量'''
+    def vector(self):
+        return tuple(getattr(self, key) for key in self.STATS)
+    '''和Hero一样的胜负判断'''
+    winmonster = Hero.winmonster
+    '''战斗没有动画, 直接结算'''
+    def battle(self, monster, monster_image, map_parser, screen, damage=None):
+        self.life_value -= damage if damage is not None else int(self.winmonster(monster)[1])
+
+
+'''一层地图在搜索时的视图: 原地图加上已经发生的修改, 提供dealcollideevent需要的接口, 新的修改记在updates里'''
+class FloorView():
+    # 搜索不需要图片
+    element_images = defaultdict(lambda: (None, None))
+    def __init__(self, map_parser, floor, changes):
+        self.map_parser = map_parser
+        self.floor = floor
+        self.changes = changes
+        self.updates = {}
+        self.monsters_dict = map_parser.monsters_dict
+        self.damage_table = map_parser.damage_table
+        self.map_size = map_parser.map_size
+    '''应用修改后的地图'''
+    @property
+    def map_matrix(self):
+        matrix = [list(row) for row in self.map_parser.map_matrix]
+        for changes in [self.changes, self.updates]:
+            for (floor, col_idx, row_idx), elem in changes.items():
+                if floor == self.floor: matrix[row_idx][col_idx] = elem
+        return matrix
+    '''修改一个元素'''
+    def setelem(self, block_position, elem):
+        self.updates[(self.floor, block_position[0], block_position[1])] = elem
+
+
+'''魔塔路线搜索: 在(修改过的格子, 勇士属性)上做带记忆和支配剪枝的最佳优先搜索.
+勇士能走到的区域内, 只有好处的元素(钥匙, 宝石, 血瓶, 不掉血的怪物等)直接拿掉, 只在开门, 打掉血的怪物和延后使用更划算的元素上分支.
+同一组修改过的格子下, 属性全面不如已有状态的搜索节点直接丢弃'''
+class RouteSearch():
+    def __init__(self, map_paths=None, map_parsers_dict=None, blocksize=54, deferred_elems=('24', '33'), max_nodes=100000):
+        # 优先使用游戏里已有的地图解析类, 搜索不会修改它们
+        map_parsers_dict = map_parsers_dict or {}
+        num_floors = len(map_paths) if map_paths is not None else max(map_parsers_dict) + 1
+        self.map_parsers = []
+        for floor in range(num_floors):
+            if floor in map_parsers_dict: self.map_parsers.append(map_parsers_dict[floor])
+            else: self.map_parsers.append(MapParser(blocksize=blocksize, filepath=map_paths[floor], element_images={}))
+        # 拿的时机会影响收益的元素(仙女的属性加成, 圣水瓶), 不会被自动拿掉
+        self.deferred_elems = deferred_elems
+        self.max_nodes = max_nodes
+        # 无论属性多好撞上去都没有效果的元素(墙, 没有选项的商店, 楼梯等), 搜索时直接当墙
+        rich_state, elems, active_elems = TowerState(life_value=10**9, attack_power=10**9, defense_power=10**9, has_cross=True), set(), set()
+        for floor, map_parser in enumerate(self.map_parsers):
+            for row_idx, row in enumerate(map_parser.map_matrix):
+                for col_idx, elem in enumerate(row):
+                    if elem in ['0', '00', 'hero'] or elem in active_elems: continue
+                    elems.add(elem)
+                    new_state, updates, events = self.collide(rich_state, {}, (floor, col_idx, row_idx))
+                    if updates or new_state.vector() != rich_state.vector() or not new_state.has_cross or any(GameLevels.getshopchoices(floor, event) for event in events):
+                        active_elems.add(elem)
+        self.inert_elems = elems - active_elems
+        # 楼梯: 上楼出现在上一层下楼梯旁, 下楼出现在下一层上楼梯旁, 和Hero.placenexttostairs一致
+        self.landings = {
+            ('13', floor): self.placenexttostairs(floor + 1, '14') for floor in range(num_floors - 1)
+        }
+        self.landings.update({
+            ('14', floor): self.placenexttostairs(floor - 1, '13') for floor in range(1, num_floors)
+        })
+    '''楼梯口旁的落脚点'''
+    def placenexttostairs(self, floor, stairs_elem):
+        map_matrix, landing = self.map_parsers[floor].map_matrix, None
+        num_rows, num_cols = self.map_parsers[floor].map_size
+        for row_idx, row in enumerate(map_matrix):
+            for col_idx, elem in enumerate(row):
+                if elem != stairs_elem: continue
+                if row_idx > 0 and map_matrix[row_idx - 1][col_idx] == '00':
+                    landing = floor, col_idx, row_idx - 1
+                elif row_idx < num_rows - 1 and map_matrix[row_idx + 1][col_idx] == '00':
+                    landing = floor, col_idx, row_idx + 1
+                elif col_idx > 0 and map_matrix[row_idx][col_idx - 1] == '00':
+                    landing = floor, col_idx - 1, row_idx
+                elif col_idx < num_cols - 1 and map_matrix[row_idx][col_idx + 1] == '00':
+                    landing = floor, col_idx + 1, row_idx
+        return landing
+    '''某一格当前的元素'''
+    def getelem(self, changes, cell):
+        if cell in changes: return changes[cell]
+        floor, col_idx, row_idx = cell
+        return self.map_parsers[floor].map_matrix[row_idx][col_idx]
+    '''从起点出发, 不触发任何事件能走到的区域, 以及区域边上可以交互的格子, 传入region和frontier时在它们的基础上继续扩展'''
+    def flood(self, start, changes, region=None, frontier=None):
+        region, frontier, stack = region if region is not None else set(), frontier if frontier is not None else set(), [start]
+        region.add(start)
+        frontier.discard(start)
+        while stack:
+            floor, col_idx, row_idx = stack.pop()
+            num_rows, num_cols = self.map_parsers[floor].map_size
+            for dx, dy in ((-1, 0), (1, 0), (0, -1), (0, 1)):
+                cell = floor, col_idx + dx, row_idx + dy
+                if not (0 <= cell[1] < num_cols and 0 <= cell[2] < num_rows) or cell in region: continue
+                elem = self.getelem(changes, cell)
+                if elem in ['0', '00', 'hero']:
+                    region.add(cell)
+                    frontier.discard(cell)
+                    stack.append(cell)
+                elif elem in ['13', '14']:
+                    landing = self.landings.get((elem, floor))
+                    if landing is not None and landing not in region:
+                        region.add(landing)
+                        frontier.discard(landing)
+                        stack.append(landing)
+                elif elem not in self.inert_elems:
+                    frontier.add(cell)
+        return region, frontier
+    '''让勇士撞一下某一格, 返回(新的属性, 这一下对地图的修改, 触发的事件)'''
+    def collide(self, state, changes, cell):
+        state = state.copy()
+        elem = self.getelem(changes, cell)
+        floor_view = FloorView(self.map_parsers[cell[0]], cell[0], changes)
+        flag, events = Hero.dealcollideevent(state, elem, cell[1:], floor_view, None)
+        if flag: floor_view.updates[cell] = '0'
+        # 仙女的对话, 和GameLevels.showconversationheroandfairy一致
+        if 'conversation_hero_and_fairy' in events and state.has_cross:
+            state.has_cross = False
+            state.life_value = int(state.life_value * 4 / 3)
+            state.attack_power = int(state.attack_power * 4 / 3)
+            state.defense_power = int(state.defense_power * 4 / 3)
+        state.obtain_tips = None
+        return state, {key: value for key, value in floor_view.updates.items() if self.getelem(changes, key) != value}, events
+    '''区域边上所有有效果的动作, 返回[(格子, 元素, 新的属性, 这一下对地图的修改), ...]'''
+    def actions(self, state, changes, frontier):
+        actions = []
+        for cell in sorted(frontier):
+            new_state, updates, events = self.collide(state, changes, cell)
+            # 商店的每个选项都是一个动作, 和GameLevels.showbuyinterface一致
+            for event in events:
+                for choice, kwargs in (GameLevels.getshopchoices(cell[0], event) or [])[:-1]:
+                    shop_state = state.copy()
+                    GameLevels.buy(shop_state, **kwargs)
+                    if shop_state.vector() != state.vector(): actions.append((cell, choice, shop_state, {}))
+            # 没有效果(钥匙不够的门, 打不过的怪物等)
+            if not updates and new_state.vector() == state.vector() and new_state.has_cross == state.has_cross: continue
+            actions.append((cell, self.getelem(changes, cell), new_state, updates))
+        return actions
+    '''撞一下是否只有好处, 可以不经分支直接执行'''
+    def isfree(self, elem, before, after):
+        old, new = before.vector(), after.vector()
+        if any(n < o for n, o in zip(new, old)): return False
+        if elem in self.deferred_elems and (new != old or after.has_cross != before.has_cross): return False
+        return True
+    '''执行一个动作后的区域: 地图没变(商店)时不变, 只打开了这一格时在原区域上接着扩展, 其他格子也变了(仙女移动)时从起点重新计算'''
+    def expand(self, start, changes, region, frontier, cell, updates):
+        if not updates: return region, frontier
+        if list(updates) != [cell]: return self.flood(start, changes)
+        region, frontier = set(region), set(frontier)
+        frontier.discard(cell)
+        if changes[cell] in ['0', '00', 'hero']: self.flood(cell, changes, region, frontier)
+        return region, frontier
+    '''把能走到的区域里所有只有好处的格子都拿掉, 返回(属性, 修改, 区域, 区域边上的格子, 拿掉的格子)'''
+    def absorb(self, start, state, changes, region, frontier):
+        taken, progressed = [], True
+        while progressed:
+            progressed = False
+            for cell, elem, new_state, updates in self.actions(state, changes, frontier):
+                if not self.isfree(elem, state, new_state): continue
+                state, changes, progressed = new_state, {**changes, **updates}, True
+                region, frontier = self.expand(start, changes, region, frontier, cell, updates)
+                taken.append((cell, elem))
+                break
+        return state, changes, region, frontier, taken
+    '''默认的搜索优先级: 攻防每一点都比血量重要得多, 钥匙, 金币和经验也折算进去'''
+    @staticmethod
+    def score(state, region):
+        return (
+            state.life_value + 1000 * (state.attack_power + state.defense_power) + 100 * state.num_yellow_keys + 300 * state.num_purple_keys + 600 * state.num_red_keys + 20 * (state.num_coins + state.experience),
+        )
+    '''把链表形式的路线展开成列表'''
+    @staticmethod
+    def unrollroute(route):
+        steps = []
+        while route is not None: route, step = route; steps.append(step)
+        return steps[::-1]
+    '''搜索一条到达目标楼层的路线, 目标楼层默认为最高层. key(state, region)越大越先展开, 默认为RouteSearch.score;
+    optimise为True时不在第一次到达时停下, 而是在节点预算内找key最大的到达方式(例如以剩余血量为key即为损失最少的路线).
+    返回字典: found是否找到, route按顺序记录(楼层, (列, 行), 元素或商店选项), state为到达时的属性, nodes为展开的节点数,
+    exhausted为是否搜完了整个状态空间(没找到且exhausted为True说明这组地图确实打不通), best_floor和best_state为搜索中到过的最高楼层和当时的属性'''
+    def search(self, start=None, state=None, goal_floor=None, key=None, optimise=False):
+        if start is None:
+            start = next((0, col_idx, row_idx) for row_idx, row in enumerate(self.map_parsers[0].map_matrix) for col_idx, elem in enumerate(row) if elem == 'hero')
+        state = state or TowerState()
+        goal_floor = len(self.map_parsers) - 1 if goal_floor is None else goal_floor
+        key = key or self.score
+        # 记忆: (修改过的格子, 是否持有十字架) -> 到过这里的所有互不支配的属性
+        memo, heap, counter, nodes = {}, [], 0, 0
+        result = {'found': False, 'route': [], 'state': None, 'nodes': 0, 'exhausted': False, 'best_floor': start[0], 'best_state': state}
+        def push(state, changes, region, frontier, route):
+            nonlocal counter
+            state, changes, region, frontier, taken = self.absorb(start, state, changes, region, frontier)
+            for cell, elem in taken: route = (route, (cell[0], cell[1:], elem))
+            vector, dominated = state.vector(), memo.setdefault((frozenset(changes.items()), state.has_cross), [])
+            if any(all(n <= o for n, o in zip(vector, other)) for other in dominated): return
+            dominated[:] = [other for other in dominated if not all(o <= n for n, o in zip(vector, other))] + [vector]
+            counter += 1
+            heapq.heappush(heap, (tuple(-v for v in key(state, region)), counter, state, changes, region, frontier, route))
+        push(state, {}, *self.flood(start, {}), None)
+        while heap and nodes < self.max_nodes:
+            priority, _, state, changes, region, frontier, route = heapq.heappop(heap)
+            nodes += 1
+            floor = max(cell[0] for cell in region)
+            if floor > result['best_floor']: result.update(best_floor=floor, best_state=state)
+            # 到达目标楼层
+            if any(cell[0] == goal_floor for cell in region):
+                if not result['found'] or priority < result['priority']:
+                    result.update(found=True, route=self.unrollroute(route), state=state, priority=priority)
+                if not optimise: break
+                continue
+            for cell, elem, new_state, updates in self.actions(state, changes, frontier):
+                new_changes = {**changes, **updates}
+                push(new_state, new_changes, *self.expand(start, new_changes, region, frontier, cell, updates), (route, (cell[0], cell[1:], elem)))
+        result.pop('priority', None)
+        result.update(nodes=nodes, exhausted=not heap and (optimise or not result['found']))
+        return result
+
+
+'''检查一组地图文件(例如cfg.MAPPATHS)能否通关, 即能否到达最高层, 返回RouteSearch.search的结果.
+注意: 对游戏自带的整座塔, 搜索在默认预算内给不出结论(2000个节点停在第8层, 100000个节点约6分钟到第10层), 结果是found和exhausted都为False的"未知";
+这个函数目前只适合检查少数几层(例如前几层, 或者改过的某几层地图), 整座塔能否通关需要更大的预算或者更强的剪枝'''
+def verifytower(map_paths, **kwargs):
+    search_kwargs = {key: kwargs.pop(key) for key in ['start', 'state', 'goal_floor', 'key', 'optimise'] if key in kwargs}
+    return RouteSearch(map_paths=map_paths, **kwargs).search(**search_kwargs)
+
+
+'''python -m cpgames.core.games.magictower.modules.routesearch [节点预算] [楼层数], 检查cfg.MAPPATHS里(前几层)的地图能否通关, 整座塔在默认预算内通常只能得到"未知"'''
+if __name__ == '__main__':
+    import sys
+    from ..magictower import Config
+    map_paths = Config.MAPPATHS[:int(sys.argv[2])] if len(sys.argv) > 2 else Config.MAPPATHS
+    result = verifytower(map_paths, max_nodes=int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
+    if result['found']:
+        print(f'Beatable, {len(result["route"])} steps, final stats {result["state"].vector()}')
+        for floor, block_position, elem in result['route']: print(f'    floor {floor} {block_position}: {elem}')
+    elif result['exhausted']:
+        print(f'Not beatable, the highest floor reachable is {result["best_floor"]}')
+    else:
+        print(f'Unknown after {result["nodes"]} nodes, reached floor {result["best_floor"]} with stats {result["best_state"].vector()}')
+        print('The node budget ran out before the search could prove or rule out a route. The search does not resolve the full shipped tower in a practical budget, check fewer floors or raise the budget')
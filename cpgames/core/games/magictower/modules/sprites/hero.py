@@ -1,6 +1,7 @@
 
 import pygame
-from .....utils import QuitGame
+from ..combat import fight
+from .....utils import QuitGame, SharedTextCache
 
 
 '''定义我们的主角勇士'''
@@ -12,7 +13,7 @@ class Hero(pygame.sprite.Sprite):
         self.block_position = block_position
         self.offset = offset
         self.fontpath = fontpath
-        self.font = pygame.font.Font(fontpath, 40)
+        self.font = SharedTextCache.getfont(fontpath, 40)
         for key, value in kwargs.items(): setattr(self, key, value)
         # 对应的图片
         self.images = {}
@@ -44,10 +45,14 @@ class Hero(pygame.sprite.Sprite):
         self.move_cooling_count = 0
         self.move_cooling_time = 5
         self.freeze_move_flag = False
+        # 是否跳过战斗动画
+        self.fast_battle = False
         # 获得物品提示
         self.obtain_tips = None
         self.show_obtain_tips_count = 0
         self.max_obtain_tips_count = 20
+        # 提示框的底色图片, 只缩放一次
+        self.tips_image = pygame.transform.scale(self.resource_loader.images['mapelements']['0'][0], (self.cfg.BLOCKSIZE, self.cfg.BLOCKSIZE))
     '''行动'''
     def move(self, direction, map_parser, screen):
         # 判断是否冷冻行动
@@ -74,7 +79,7 @@ class Hero(pygame.sprite.Sprite):
                 )
                 if flag:
                     self.block_position = block_position
-                    map_parser.map_matrix[block_position[1]][block_position[0]] = '0'
+                    map_parser.setelem(block_position, '0')
         # 重新设置勇士位置
         self.rect.left, self.rect.top = self.block_position[0] * self.blocksize + self.offset[0], self.block_position[1] * self.blocksize + self.offset[1]
         # 冷冻行动
@@ -157,8 +162,8 @@ class Hero(pygame.sprite.Sprite):
         # 遇到仙女, 进行对话, 并左移一格
         elif elem in ['24']:
             if map_parser.map_matrix[block_position[1]][block_position[0] - 1] == '0':
-                map_parser.map_matrix[block_position[1]][block_position[0] - 1] = elem
-                map_parser.map_matrix[block_position[1]][block_position[0]] = '0'
+                map_parser.setelem((block_position[0] - 1, block_position[1]), elem)
+                map_parser.setelem(block_position, '0')
             return False, ['conversation_hero_and_fairy']
         # 捡到道具飞羽
         elif elem in ['30', '31']:
@@ -215,8 +220,9 @@ class Hero(pygame.sprite.Sprite):
         # 遇到怪物
         elif elem in map_parser.monsters_dict:
             monster = map_parser.monsters_dict[elem]
-            if self.winmonster(monster)[0]:
-                self.battle(monster, map_parser.element_images[elem][0], map_parser, screen)
+            can_win, _, damage = map_parser.damage_table.lookup(elem, self.life_value, self.attack_power, self.defense_power)
+            if can_win:
+                self.battle(monster, map_parser.element_images[elem][0], map_parser, screen, damage)
                 self.num_coins += monster[4]
                 self.experience += monster[5]
                 self.obtain_tips = f'Number of coins obtained{monster[4]} Experience{monster[5]}'
@@ -269,15 +275,13 @@ class Hero(pygame.sprite.Sprite):
         pygame.draw.rect(screen, (199, 97, 20), (left - 4, top - 4, self.cfg.BLOCKSIZE * width + 8, self.cfg.BLOCKSIZE * height + 8), 7)
         for col in range(width):
             for row in range(height):
-                image = self.resource_loader.images['mapelements']['0'][0]
-                image = pygame.transform.scale(image, (self.cfg.BLOCKSIZE, self.cfg.BLOCKSIZE))
-                screen.blit(image, (left + col * self.cfg.BLOCKSIZE, top + row * self.cfg.BLOCKSIZE))
+                screen.blit(self.tips_image, (left + col * self.cfg.BLOCKSIZE, top + row * self.cfg.BLOCKSIZE))
         # 文字
-        font = pygame.font.Font(self.fontpath, 30)
+        font = SharedTextCache.getfont(self.fontpath, 30)
         if isinstance(self.obtain_tips, list):
             assert len(self.obtain_tips) == 2
-            font_render1 = font.render(self.obtain_tips[0], True, (255, 255, 255))
-            font_render2 = font.render(self.obtain_tips[1], True, (255, 255, 255))
+            font_render1 = SharedTextCache.render(font, self.obtain_tips[0], (255, 255, 255))
+            font_render2 = SharedTextCache.render(font, self.obtain_tips[1], (255, 255, 255))
             rect1 = font_render1.get_rect()
             rect2 = font_render2.get_rect()
             rect1.midtop = left + width * self.cfg.BLOCKSIZE // 2, top + 10
@@ -285,23 +289,15 @@ class Hero(pygame.sprite.Sprite):
             screen.blit(font_render1, rect1)
             screen.blit(font_render2, rect2)
         else:
-            font_render = font.render(self.obtain_tips, True, (255, 255, 255))
+            font_render = SharedTextCache.render(font, self.obtain_tips, (255, 255, 255))
             rect = font_render.get_rect()
             rect.midtop = left + width * self.cfg.BLOCKSIZE // 2, top + height * self.cfg.BLOCKSIZE // 2 - 15
             screen.blit(font_render, rect)
-    '''判断勇士是否可以打赢怪物'''
+    '''判断勇士是否可以打赢怪物, 返回(能否打赢, 损失的生命值)'''
     def winmonster(self, monster):
-        # 如果攻击力低于怪物防御力, monster: [名字, 生命值, 攻击力, 防御力, 金币, 经验]
-        if self.attack_power <= monster[3]: return False, '???'
-        # 如果防御力高于怪物攻击力
-        if self.defense_power >= monster[2]: return True, '0'
-        # 我方打怪物一次扣多少血
-        diff_our = self.attack_power - monster[3]
-        # 怪物打我方一次扣多少血
-        diff_monster = monster[2] - self.defense_power
-        # 计算谁可以win
-        if round(monster[1] / diff_our) <= round(self.life_value / diff_monster):
-            return True, str(diff_monster * round(monster[1] / diff_our))
+        # monster: [名字, 生命值, 攻击力, 防御力, 金币, 经验]
+        can_win, _, damage = fight(self.life_value, self.attack_power, self.defense_power, monster)
+        if can_win: return True, str(damage)
         return False, '???'
     '''将勇士绑定到屏幕上'''
     def draw(self, screen):
@@ -312,15 +308,15 @@ class Hero(pygame.sprite.Sprite):
                 self.freeze_move_flag = False
         screen.blit(self.image, self.rect)
         font_renders = [
-            self.font.render(str(self.level), True, (255, 255, 255)),
-            self.font.render(str(self.life_value), True, (255, 255, 255)),
-            self.font.render(str(self.attack_power), True, (255, 255, 255)),
-            self.font.render(str(self.defense_power), True, (255, 255, 255)),
-            self.font.render(str(self.num_coins), True, (255, 255, 255)),
-            self.font.render(str(self.experience), True, (255, 255, 255)),
-            self.font.render(str(self.num_yellow_keys), True, (255, 255, 255)),
-            self.font.render(str(self.num_purple_keys), True, (255, 255, 255)),
-            self.font.render(str(self.num_red_keys), True, (255, 255, 255)),
+            SharedTextCache.render(self.font, str(self.level), (255, 255, 255)),
+            SharedTextCache.render(self.font, str(self.life_value), (255, 255, 255)),
+            SharedTextCache.render(self.font, str(self.attack_power), (255, 255, 255)),
+            SharedTextCache.render(self.font, str(self.defense_power), (255, 255, 255)),
+            SharedTextCache.render(self.font, str(self.num_coins), (255, 255, 255)),
+            SharedTextCache.render(self.font, str(self.experience), (255, 255, 255)),
+            SharedTextCache.render(self.font, str(self.num_yellow_keys), (255, 255, 255)),
+            SharedTextCache.render(self.font, str(self.num_purple_keys), (255, 255, 255)),
+            SharedTextCache.render(self.font, str(self.num_red_keys), (255, 255, 255)),
         ]
         rects = [fr.get_rect() for fr in font_renders]
         rects[0].topleft = (160, 80)
@@ -330,9 +326,15 @@ class Hero(pygame.sprite.Sprite):
             rects[idx].topleft = 160, 364 + 55 * (idx - 6)
         for fr, rect in zip(font_renders, rects):
             screen.blit(fr, rect)
-    '''战斗画面'''
-    def battle(self, monster, monster_image, map_parser, screen):
+    '''战斗画面, damage为战斗结束时勇士损失的生命值'''
+    def battle(self, monster, monster_image, map_parser, screen, damage=None):
         monster = list(monster).copy()
+        if damage is None: damage = fight(self.life_value, self.attack_power, self.defense_power, monster)[2]
+        life_value = self.life_value - damage
+        # 跳过战斗动画, 直接结算
+        if self.fast_battle:
+            self.life_value = life_value
+            return
         # 我方打怪物一次扣多少血
         diff_our = self.attack_power - monster[3]
         # 怪物打我方一次扣多少血
@@ -341,37 +343,45 @@ class Hero(pygame.sprite.Sprite):
         update_count, update_interval, update_hero = 0, 5, False
         # 主循环
         clock = pygame.time.Clock()
-        font = pygame.font.Font(self.fontpath, 40)
+        font = SharedTextCache.getfont(self.fontpath, 40)
+        # 战斗时地图不会变化, 只画一次作为背景
+        screen.fill((0, 0, 0))
+        screen.blit(self.background_images['gamebg'], (0, 0))
+        map_parser.draw(screen)
+        for scene in self.cur_scenes:
+            screen.blit(scene[0], scene[1])
+        battle_background = screen.copy()
         while True:
-            screen.fill((0, 0, 0))
-            screen.blit(self.background_images['gamebg'], (0, 0))
-            map_parser.draw(screen)
-            for scene in self.cur_scenes:
-                screen.blit(scene[0], scene[1])
+            screen.blit(battle_background, (0, 0))
             self.draw(screen)
-            # --按键检测
+            # --按键检测, 空格键跳过剩下的动画
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
                     QuitGame()
+                elif event.type == pygame.KEYDOWN and event.key == pygame.K_SPACE:
+                    self.life_value = life_value
+                    return
             # --更新战斗面板
             update_count += 1
             if update_count > update_interval:
                 update_count = 0
                 if update_hero:
-                    self.life_value = self.life_value - (monster[2] - self.defense_power)
+                    self.life_value = self.life_value - diff_monster
                 else:
-                    monster[1] = max(monster[1] - (self.attack_power - monster[3]), 0)
+                    monster[1] = max(monster[1] - diff_our, 0)
                 update_hero = not update_hero
-                if monster[1] <= 0: return
+                if monster[1] <= 0:
+                    self.life_value = life_value
+                    return
             screen.blit(self.background_images['battlebg'], (20, 40))
             screen.blit(monster_image, (90, 140))
             font_renders = [
-                font.render(str(monster[1]), True, (255, 255, 255)),
-                font.render(str(monster[2]), True, (255, 255, 255)),
-                font.render(str(monster[3]), True, (255, 255, 255)),
-                font.render(str(self.life_value), True, (255, 255, 255)),
-                font.render(str(self.attack_power), True, (255, 255, 255)),
-                font.render(str(self.defense_power), True, (255, 255, 255)),
+                SharedTextCache.render(font, str(monster[1]), (255, 255, 255)),
+                SharedTextCache.render(font, str(monster[2]), (255, 255, 255)),
+                SharedTextCache.render(font, str(monster[3]), (255, 255, 255)),
+                SharedTextCache.render(font, str(self.life_value), (255, 255, 255)),
+                SharedTextCache.render(font, str(self.attack_power), (255, 255, 255)),
+                SharedTextCache.render(font, str(self.defense_power), (255, 255, 255)),
             ]
             rects = [fr.get_rect() for fr in font_renders]
             for idx in range(3):
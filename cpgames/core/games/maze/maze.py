@@ -2,7 +2,7 @@ import os
 import pygame
 from ...utils import QuitGame
 from ..base import PygameBaseGame
-from .modules import showText, Button, Interface, Block, RandomMaze, Hero
+from .modules import showText, Button, Interface, RandomMaze, Hero
 
 
 '''配置类'''
@@ -18,6 +18,8 @@ class Config():
     # 块大小
     BLOCKSIZE = 15
     MAZESIZE = (35, 50) # num_rows * num_cols
+    # 迷宫生成算法, 可选backtracker, prim, kruskal, eller
+    MAZE_ALGORITHM = 'backtracker'
     BORDERSIZE = (25, 50) # 25 * 2 + 50 * 15 = 800, 50 * 2 + 35 * 15 = 625
     # 背景音乐路径
     BGM_PATH = os.path.join(rootdir, 'resources/audios/bgm.mp3')
@@ -57,12 +59,12 @@ class MazeGame(PygameBaseGame):
             screen = pygame.display.set_mode(cfg.SCREENSIZE)
             
             # --Randomly generate level map
-            maze_now = RandomMaze(cfg.MAZESIZE, cfg.BLOCKSIZE, cfg.BORDERSIZE)
+            maze_now = RandomMaze(cfg.MAZESIZE, cfg.BLOCKSIZE, cfg.BORDERSIZE, algorithm=cfg.MAZE_ALGORITHM)
             # --Generate hero
             hero_now = Hero(resource_loader.images['hero'], [0, 0], cfg.BLOCKSIZE, cfg.BORDERSIZE)
             
             # Mark the starting block as visited by the hero to show the path immediately
-            maze_now.blocks_list[hero_now.coordinate[1]][hero_now.coordinate[0]].is_path_visited = True
+            maze_now.markVisited(hero_now.coordinate)
             
             # --Count steps
             num_steps = 0
@@ -88,7 +90,7 @@ class MazeGame(PygameBaseGame):
                         
                         if is_move:
                             # Mark the new block as visited by the hero after it moves
-                            maze_now.blocks_list[hero_now.coordinate[1]][hero_now.coordinate[0]].is_path_visited = True
+                            maze_now.markVisited(hero_now.coordinate)
 
                 num_steps += int(is_move) # Update steps *after* potential move
                 
@@ -1,4 +1,5 @@
 '''initialize'''
 from .sprites import Hero
-from .game import Block, RandomMaze
+from .game import RandomMaze
+from .generators import MAZE_GENERATORS, recursiveBacktracker, prim, kruskal, eller, ellerRows
 from .misc import showText, Button, Interface
\ No newline at end of file
@@ -1,88 +1,85 @@
 import pygame
-import random
 from .misc import showText, Button, Interface
+from .generators import MAZE_GENERATORS, WALL_BITS, WALL_TOP, WALL_BOTTOM, WALL_LEFT, WALL_RIGHT
 
 
-'''一个游戏地图块'''
-class Block():
-    def __init__(self, coordinate, block_size, border_size, **kwargs):
-        # (col, row)
-        self.coordinate = coordinate
+'''随机生成迷宫类, 墙保存为每格一个字节的位掩码, 墙体预先画在一张surface上'''
+class RandomMaze():
+    def __init__(self, maze_size, block_size, border_size, algorithm='backtracker', **kwargs):
         self.block_size = block_size
         self.border_size = border_size
-        self.is_visited = False
-        # 上下左右有没有墙
-        self.has_walls = [True, True, True, True]
+        # (num_rows, num_cols)
+        self.maze_size = maze_size
+        self.walls = RandomMaze.createMaze(maze_size, algorithm)
+        # Blocks that were part of the player's path
+        self.path_visited = bytearray(maze_size[0] * maze_size[1])
+        self.font = pygame.font.SysFont('Consolas', 15)
+        self.start_color = (0, 255, 0) # Green for start
+        self.end_color = (255, 0, 0) # Red for end
         self.wall_color = (50, 50, 150) # Dark blue for walls
+        self.inner_wall_color = (70, 70, 170) # Inner line for hollow effect
         self.path_color = (200, 200, 255) # Light blue for paths
         self.visited_path_color = (150, 150, 200) # Slightly darker blue for visited paths
-        self.is_path_visited = False # New attribute to track if this block was part of the player's path
-
-    '''画到屏幕上'''
-    def draw(self, screen):
-        # Draw the background of the block (path color)
-        block_x = self.coordinate[0] * self.block_size + self.border_size[0]
-        block_y = self.coordinate[1] * self.block_size + self.border_size[1]
-        
-        if self.is_path_visited:
-            pygame.draw.rect(screen, self.visited_path_color, (block_x, block_y, self.block_size, self.block_size))
-        else:
-            pygame.draw.rect(screen, self.path_color, (block_x, block_y, self.block_size, self.block_size))
+        self.wall_thickness = 3
+        self.hollow_offset = 1
+        # Walls spill over the outer edge of the maze, so the static layer is padded
+        self.padding = self.wall_thickness
+        self.surface = self.renderMaze()
 
-        # Draw the walls with a hollow effect
-        wall_thickness = 3
-        hollow_offset = 1
+    '''某个位置(col, row)的某个方向(top, bottom, left, right)有没有墙'''
+    def hasWall(self, coordinate, direction):
+        return bool(self.walls[coordinate[1] * self.maze_size[1] + coordinate[0]] & WALL_BITS[direction])
 
-        directions = ['top', 'bottom', 'left', 'right']
-        for idx, direction in enumerate(directions):
-            if self.has_walls[idx]:
-                if direction == 'top':
-                    x1 = self.coordinate[0] * self.block_size + self.border_size[0]
-                    y1 = self.coordinate[1] * self.block_size + self.border_size[1]
-                    x2 = (self.coordinate[0] + 1) * self.block_size + self.border_size[0]
-                    y2 = self.coordinate[1] * self.block_size + self.border_size[1]
-                    pygame.draw.line(screen, self.wall_color, (x1, y1), (x2, y2), wall_thickness)
-                    pygame.draw.line(screen, (70, 70, 170), (x1 + hollow_offset, y1 + hollow_offset), (x2 - hollow_offset, y2 + hollow_offset), wall_thickness - 1) # Inner line for hollow effect
-                elif direction == 'bottom':
-                    x1 = self.coordinate[0] * self.block_size + self.border_size[0]
-                    y1 = (self.coordinate[1] + 1) * self.block_size + self.border_size[1]
-                    x2 = (self.coordinate[0] + 1) * self.block_size + self.border_size[0]
-                    y2 = (self.coordinate[1] + 1) * self.block_size + self.border_size[1]
-                    pygame.draw.line(screen, self.wall_color, (x1, y1), (x2, y2), wall_thickness)
-                    pygame.draw.line(screen, (70, 70, 170), (x1 + hollow_offset, y1 - hollow_offset), (x2 - hollow_offset, y2 - hollow_offset), wall_thickness - 1)
-                elif direction == 'left':
-                    x1 = self.coordinate[0] * self.block_size + self.border_size[0]
-                    y1 = self.coordinate[1] * self.block_size + self.border_size[1]
-                    x2 = self.coordinate[0] * self.block_size + self.border_size[0]
-                    y2 = (self.coordinate[1] + 1) * self.block_size + self.border_size[1]
-                    pygame.draw.line(screen, self.wall_color, (x1, y1), (x2, y2), wall_thickness)
-                    pygame.draw.line(screen, (70, 70, 170), (x1 + hollow_offset, y1 + hollow_offset), (x2 + hollow_offset, y2 - hollow_offset), wall_thickness - 1)
-                elif direction == 'right':
-                    x1 = (self.coordinate[0] + 1) * self.block_size + self.border_size[0]
-                    y1 = self.coordinate[1] * self.block_size + self.border_size[1]
-                    x2 = (self.coordinate[0] + 1) * self.block_size + self.border_size[0]
-                    y2 = (self.coordinate[1] + 1) * self.block_size + self.border_size[1]
-                    pygame.draw.line(screen, self.wall_color, (x1, y1), (x2, y2), wall_thickness)
-                    pygame.draw.line(screen, (70, 70, 170), (x1 - hollow_offset, y1 + hollow_offset), (x2 - hollow_offset, y2 - hollow_offset), wall_thickness - 1)
+    '''标记玩家走过的位置, 只重画这一格'''
+    def markVisited(self, coordinate):
+        col, row = coordinate
+        cell = row * self.maze_size[1] + col
+        if self.path_visited[cell]: return False
+        self.path_visited[cell] = 1
+        self.surface.fill(self.visited_path_color, self.blockRect(col, row))
+        # The walls of the neighbours overlap this block by a pixel, so they are redrawn as well
+        for col_, row_ in [(col, row), (col, row - 1), (col, row + 1), (col - 1, row), (col + 1, row)]:
+            if 0 <= col_ < self.maze_size[1] and 0 <= row_ < self.maze_size[0]:
+                self.drawBlockWalls(self.surface, col_, row_)
         return True
 
+    '''某一格在静态层上的矩形'''
+    def blockRect(self, col, row):
+        return pygame.Rect(col * self.block_size + self.padding, row * self.block_size + self.padding, self.block_size, self.block_size)
 
-'''随机生成迷宫类'''
-class RandomMaze():
-    def __init__(self, maze_size, block_size, border_size, **kwargs):
-        self.block_size = block_size
-        self.border_size = border_size
-        self.maze_size = maze_size
-        self.blocks_list = RandomMaze.createMaze(maze_size, block_size, border_size)
-        self.font = pygame.font.SysFont('Consolas', 15)
-        self.start_color = (0, 255, 0) # Green for start
-        self.end_color = (255, 0, 0) # Red for end
+    '''预先画好所有格子和墙'''
+    def renderMaze(self):
+        num_rows, num_cols = self.maze_size
+        surface = pygame.Surface((num_cols * self.block_size + 2 * self.padding, num_rows * self.block_size + 2 * self.padding), pygame.SRCALPHA)
+        surface.fill(self.path_color, pygame.Rect(self.padding, self.padding, num_cols * self.block_size, num_rows * self.block_size))
+        for cell, visited in enumerate(self.path_visited):
+            if visited: surface.fill(self.visited_path_color, self.blockRect(cell % num_cols, cell // num_cols))
+        for row in range(num_rows):
+            for col in range(num_cols):
+                self.drawBlockWalls(surface, col, row)
+        return surface
+
+    '''画某一格的墙(带空心效果)'''
+    def drawBlockWalls(self, surface, col, row):
+        walls, offset = self.walls[row * self.maze_size[1] + col], self.hollow_offset
+        x1, y1 = col * self.block_size + self.padding, row * self.block_size + self.padding
+        x2, y2 = x1 + self.block_size, y1 + self.block_size
+        if walls & WALL_TOP:
+            pygame.draw.line(surface, self.wall_color, (x1, y1), (x2, y1), self.wall_thickness)
+            pygame.draw.line(surface, self.inner_wall_color, (x1 + offset, y1 + offset), (x2 - offset, y1 + offset), self.wall_thickness - 1)
+        if walls & WALL_BOTTOM:
+            pygame.draw.line(surface, self.wall_color, (x1, y2), (x2, y2), self.wall_thickness)
+            pygame.draw.line(surface, self.inner_wall_color, (x1 + offset, y2 - offset), (x2 - offset, y2 - offset), self.wall_thickness - 1)
+        if walls & WALL_LEFT:
+            pygame.draw.line(surface, self.wall_color, (x1, y1), (x1, y2), self.wall_thickness)
+            pygame.draw.line(surface, self.inner_wall_color, (x1 + offset, y1 + offset), (x1 + offset, y2 - offset), self.wall_thickness - 1)
+        if walls & WALL_RIGHT:
+            pygame.draw.line(surface, self.wall_color, (x2, y1), (x2, y2), self.wall_thickness)
+            pygame.draw.line(surface, self.inner_wall_color, (x2 - offset, y1 + offset), (x2 - offset, y2 - offset), self.wall_thickness - 1)
 
     '''画到屏幕上'''
     def draw(self, screen):
-        for row in range(self.maze_size[0]):
-            for col in range(self.maze_size[1]):
-                self.blocks_list[row][col].draw(screen)
+        screen.blit(self.surface, (self.border_size[0] - self.padding, self.border_size[1] - self.padding))
         
         # Draw start point
         start_x = self.border_size[0] + self.block_size // 2
@@ -94,68 +91,9 @@ class RandomMaze():
         end_y = self.border_size[1] + (self.maze_size[0] - 1) * self.block_size + self.block_size // 2
         pygame.draw.circle(screen, self.end_color, (end_x, end_y), self.block_size // 3)
 
-    '''创建迷宫'''
+    '''创建迷宫, algorithm可选backtracker, prim, kruskal, eller'''
     @staticmethod
-    def createMaze(maze_size, block_size, border_size):
-        def nextBlock(block_now, blocks_list):
-            directions = ['top', 'bottom', 'left', 'right']
-            blocks_around = dict(zip(directions, [None]*4))
-            block_next = None
-            count = 0
-            # 查看上边block
-            if block_now.coordinate[1]-1 >= 0:
-                block_now_top = blocks_list[block_now.coordinate[1]-1][block_now.coordinate[0]]
-                if not block_now_top.is_visited:
-                    blocks_around['top'] = block_now_top
-                    count += 1
-            # 查看下边block
-            if block_now.coordinate[1]+1 < maze_size[0]:
-                block_now_bottom = blocks_list[block_now.coordinate[1]+1][block_now.coordinate[0]]
-                if not block_now_bottom.is_visited:
-                    blocks_around['bottom'] = block_now_bottom
-                    count += 1
-            # 查看左边block
-            if block_now.coordinate[0]-1 >= 0:
-                block_now_left = blocks_list[block_now.coordinate[1]][block_now.coordinate[0]-1]
-                if not block_now_left.is_visited:
-                    blocks_around['left'] = block_now_left
-                    count += 1
-            # 查看右边block
-            if block_now.coordinate[0]+1 < maze_size[1]:
-                block_now_right = blocks_list[block_now.coordinate[1]][block_now.coordinate[0]+1]
-                if not block_now_right.is_visited:
-                    blocks_around['right'] = block_now_right
-                    count += 1
-            if count > 0:
-                while True:
-                    direction = random.choice(directions)
-                    if blocks_around.get(direction):
-                        block_next = blocks_around.get(direction)
-                        if direction == 'top':
-                            block_next.has_walls[1] = False
-                            block_now.has_walls[0] = False
-                        elif direction == 'bottom':
-                            block_next.has_walls[0] = False
-                            block_now.has_walls[1] = False
-                        elif direction == 'left':
-                            block_next.has_walls[3] = False
-                            block_now.has_walls[2] = False
-                        elif direction == 'right':
-                            block_next.has_walls[2] = False
-                            block_now.has_walls[3] = False
-                        break
-            return block_next
-        blocks_list = [[Block([col, row], block_size, border_size) for col in range(maze_size[1])] for row in range(maze_size[0])]
-        block_now = blocks_list[0][0]
-        records = []
-        while True:
-            if block_now:
-                if not block_now.is_visited:
-                    block_now.is_visited = True
-                    records.append(block_now)
-                block_now = nextBlock(block_now, blocks_list)
-            else:
-                block_now = records.pop()
-                if len(records) == 0:
-                    break
-        return blocks_list
\ No newline at end of file
+    def createMaze(maze_size, algorithm='backtracker'):
+        if algorithm not in MAZE_GENERATORS:
+            raise ValueError('Unsupport maze algorithm %s in RandomMaze.createMaze...' % algorithm)
+        return MAZE_GENERATORS[algorithm](maze_size)
@@ -0,0 +1,147 @@
+import random
+from array import array
+
+
+# Wall bits of a cell, a cell is an unsigned byte in a row major array (index = row * num_cols + col)
+WALL_TOP, WALL_BOTTOM, WALL_LEFT, WALL_RIGHT = 1, 2, 4, 8
+WALL_ALL = WALL_TOP | WALL_BOTTOM | WALL_LEFT | WALL_RIGHT
+WALL_BITS = {'top': WALL_TOP, 'bottom': WALL_BOTTOM, 'left': WALL_LEFT, 'right': WALL_RIGHT}
+OPPOSITE_WALLS = {WALL_TOP: WALL_BOTTOM, WALL_BOTTOM: WALL_TOP, WALL_LEFT: WALL_RIGHT, WALL_RIGHT: WALL_LEFT}
+
+
+'''打通两个相邻格子之间的墙'''
+def carveWall(walls, cell, cell_next, wall):
+    walls[cell] &= ~wall
+    walls[cell_next] &= ~OPPOSITE_WALLS[wall]
+
+
+'''某个格子的所有相邻格子, (相邻格子, 通往它的墙)'''
+def neighbourCells(cell, num_rows, num_cols):
+    row, col = divmod(cell, num_cols)
+    neighbours = []
+    if row > 0: neighbours.append((cell - num_cols, WALL_TOP))
+    if row < num_rows - 1: neighbours.append((cell + num_cols, WALL_BOTTOM))
+    if col > 0: neighbours.append((cell - 1, WALL_LEFT))
+    if col < num_cols - 1: neighbours.append((cell + 1, WALL_RIGHT))
+    return neighbours
+
+
+'''递归回溯(深度优先), 通道长而曲折, 只在未访问的相邻格子里挑下一个'''
+def recursiveBacktracker(maze_size, rng=random):
+    num_rows, num_cols = maze_size
+    walls = array('B', [WALL_ALL]) * (num_rows * num_cols)
+    visited = bytearray(num_rows * num_cols)
+    visited[0] = 1
+    stack = [0]
+    while stack:
+        cell = stack[-1]
+        candidates = [(cell_next, wall) for cell_next, wall in neighbourCells(cell, num_rows, num_cols) if not visited[cell_next]]
+        if not candidates:
+            stack.pop()
+            continue
+        cell_next, wall = rng.choice(candidates)
+        carveWall(walls, cell, cell_next, wall)
+        visited[cell_next] = 1
+        stack.append(cell_next)
+    return walls
+
+
+'''随机Prim, 从边界上随机挑格子接入迷宫, 分叉多而通道短'''
+def prim(maze_size, rng=random):
+    num_rows, num_cols = maze_size
+    walls = array('B', [WALL_ALL]) * (num_rows * num_cols)
+    # 0: not reached, 1: on the frontier, 2: in the maze
+    states = bytearray(num_rows * num_cols)
+    states[0], frontier = 2, []
+    for cell_next, _ in neighbourCells(0, num_rows, num_cols):
+        states[cell_next] = 1
+        frontier.append(cell_next)
+    while frontier:
+        # swap remove keeps picking a random frontier cell O(1)
+        idx = rng.randrange(len(frontier))
+        frontier[idx], frontier[-1] = frontier[-1], frontier[idx]
+        cell = frontier.pop()
+        neighbours = neighbourCells(cell, num_rows, num_cols)
+        cell_next, wall = rng.choice([(cell_next, wall) for cell_next, wall in neighbours if states[cell_next] == 2])
+        carveWall(walls, cell, cell_next, wall)
+        states[cell] = 2
+        for cell_next, _ in neighbours:
+            if states[cell_next] == 0:
+                states[cell_next] = 1
+                frontier.append(cell_next)
+    return walls
+
+
+'''随机Kruskal, 打乱所有内墙后用并查集只拆连接两个不同集合的墙'''
+def kruskal(maze_size, rng=random):
+    num_rows, num_cols = maze_size
+    walls = array('B', [WALL_ALL]) * (num_rows * num_cols)
+    parents = list(range(num_rows * num_cols))
+    def find(cell):
+        while parents[cell] != cell:
+            parents[cell] = parents[parents[cell]]
+            cell = parents[cell]
+        return cell
+    edges = [(cell, cell + 1, WALL_RIGHT) for cell in range(num_rows * num_cols) if cell % num_cols < num_cols - 1]
+    edges += [(cell, cell + num_cols, WALL_BOTTOM) for cell in range(num_cols * (num_rows - 1))]
+    rng.shuffle(edges)
+    num_merges = num_rows * num_cols - 1
+    for cell, cell_next, wall in edges:
+        root, root_next = find(cell), find(cell_next)
+        if root == root_next: continue
+        parents[root_next] = root
+        carveWall(walls, cell, cell_next, wall)
+        num_merges -= 1
+        if num_merges == 0: break
+    return walls
+
+
+'''Eller算法, 逐行生成, 只需要一行的内存, 每生成完一行就yield这一行的墙(array)'''
+def ellerRows(maze_size, rng=random, merge_prob=0.5):
+    num_rows, num_cols = maze_size
+    # set id of every cell of the current row, and the cells of every set
+    row_sets, carved_down, next_set = [None] * num_cols, [False] * num_cols, 0
+    for row in range(num_rows):
+        is_last_row = (row == num_rows - 1)
+        row_walls = array('B', [WALL_ALL]) * num_cols
+        members = {}
+        for col in range(num_cols):
+            if carved_down[col]:
+                row_walls[col] &= ~WALL_TOP
+            else:
+                row_sets[col], next_set = next_set, next_set + 1
+            members.setdefault(row_sets[col], []).append(col)
+        # join neighbours of different sets, the last row joins all of them so everything is connected
+        for col in range(num_cols - 1):
+            set_id, set_id_next = row_sets[col], row_sets[col + 1]
+            if set_id == set_id_next or not (is_last_row or rng.random() < merge_prob): continue
+            row_walls[col] &= ~WALL_RIGHT
+            row_walls[col + 1] &= ~WALL_LEFT
+            if len(members[set_id]) < len(members[set_id_next]): set_id, set_id_next = set_id_next, set_id
+            for member in members[set_id_next]: row_sets[member] = set_id
+            members[set_id].extend(members.pop(set_id_next))
+        # every set carves at least one passage down so it stays connected to the rest
+        carved_down = [False] * num_cols
+        if not is_last_row:
+            for set_id, cols in members.items():
+                downs = [col for col in cols if rng.random() < merge_prob] or [rng.choice(cols)]
+                for col in downs:
+                    carved_down[col] = True
+                    row_walls[col] &= ~WALL_BOTTOM
+        yield row_walls
+
+
+'''Eller算法, 把逐行生成的结果拼成整个迷宫'''
+def eller(maze_size, rng=random):
+    walls = array('B')
+    for row_walls in ellerRows(maze_size, rng): walls.extend(row_walls)
+    return walls
+
+
+'''可选的迷宫生成算法'''
+MAZE_GENERATORS = {
+    'backtracker': recursiveBacktracker,
+    'prim': prim,
+    'kruskal': kruskal,
+    'eller': eller,
+}
@@ -1,14 +1,10 @@
 import pygame
-from ....utils import QuitGame
+from ....utils import QuitGame, SharedTextCache
 
 
 '''在屏幕指定位置显示文字'''
 def showText(screen, font, text, color, position):
-    text_render = font.render(text, True, color)
-    rect = text_render.get_rect()
-    rect.left, rect.top = position
-    screen.blit(text_render, rect)
-    return rect.right
+    return SharedTextCache.blit(screen, font, text, color, position).right
 
 
 '''按钮'''
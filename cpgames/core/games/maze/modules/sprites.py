@@ -14,27 +14,26 @@ class Hero(pygame.sprite.Sprite):
         self.border_size = border_size
     '''移动'''
     def move(self, direction, maze):
-        blocks_list = maze.blocks_list
         if direction == 'up':
-            if blocks_list[self.coordinate[1]][self.coordinate[0]].has_walls[0]:
+            if maze.hasWall(self.coordinate, 'top'):
                 return False
             else:
                 self.coordinate[1] = self.coordinate[1] - 1
                 return True
         elif direction == 'down':
-            if blocks_list[self.coordinate[1]][self.coordinate[0]].has_walls[1]:
+            if maze.hasWall(self.coordinate, 'bottom'):
                 return False
             else:
                 self.coordinate[1] = self.coordinate[1] + 1
                 return True
         elif direction == 'left':
-            if blocks_list[self.coordinate[1]][self.coordinate[0]].has_walls[2]:
+            if maze.hasWall(self.coordinate, 'left'):
                 return False
             else:
                 self.coordinate[0] = self.coordinate[0] - 1
                 return True
         elif direction == 'right':
-            if blocks_list[self.coordinate[1]][self.coordinate[0]].has_walls[3]:
+            if maze.hasWall(self.coordinate, 'right'):
                 return False
             else:
                 self.coordinate[0] = self.coordinate[0] + 1
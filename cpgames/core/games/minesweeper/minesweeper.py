@@ -120,17 +120,11 @@ class MineSweeperGame(PygameBaseGame):
                                (cfg.SCREENSIZE[0] - cfg.BORDERSIZE - fontsize_time[0] - 10, (cfg.GRIDSIZE * 2 - fontsize_time[1]) // 2 - 2), cfg.RED)
         time_board.is_start = False
         
-        # Game main loop
+        # Game main loop, the screen is only fully redrawn when needed and otherwise just the changed cells are updated
         clock = pygame.time.Clock()
+        topbar_rect = pygame.Rect(0, 0, cfg.SCREENSIZE[0], cfg.GRIDSIZE * 2 - 2)
+        full_redraw, topbar_state = True, None
         while True:
-            screen.fill(cfg.BACKGROUND_COLOR)
-            
-            # Draw the main game area border
-            pygame.draw.rect(screen, cfg.BORDER_COLOR, 
-                             (cfg.BORDERSIZE - 2, cfg.GRIDSIZE * 2 - 2, 
-                              cfg.GAME_MATRIX_SIZE[0] * cfg.GRIDSIZE + 4, 
-                              cfg.GAME_MATRIX_SIZE[1] * cfg.GRIDSIZE + 4), 2)
-
             # Event handling
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
@@ -148,6 +142,9 @@ class MineSweeperGame(PygameBaseGame):
                         time_board.is_start = False
                         remaining_mine_board.update(str(cfg.NUM_MINES))
                         emoji_button.setstatus(status_code=0)
+                        full_redraw = True
+                elif event.type == pygame.VIDEOEXPOSE:
+                    full_redraw = True
             
             # Update time display
             if minesweeper_map.gaming:
@@ -169,12 +166,27 @@ class MineSweeperGame(PygameBaseGame):
                 emoji_button.setstatus(status_code=2)
             
             # Draw game elements
-            minesweeper_map.draw(screen)
-            emoji_button.draw(screen)
-            remaining_mine_board.draw(screen)
-            time_board.draw(screen)
+            dirty_rects = []
+            if full_redraw:
+                screen.fill(cfg.BACKGROUND_COLOR)
+                # Draw the main game area border
+                pygame.draw.rect(screen, cfg.BORDER_COLOR, 
+                                 (cfg.BORDERSIZE - 2, cfg.GRIDSIZE * 2 - 2, 
+                                  cfg.GAME_MATRIX_SIZE[0] * cfg.GRIDSIZE + 4, 
+                                  cfg.GAME_MATRIX_SIZE[1] * cfg.GRIDSIZE + 4), 2)
+                dirty_rects.append(screen.get_rect())
+            dirty_rects.extend(minesweeper_map.draw(screen, full=full_redraw))
+            # The top bar is redrawn only when the time, the mine counter or the emoji changes
+            if full_redraw or topbar_state != (time_board.text, remaining_mine_board.text, emoji_button.status_code):
+                topbar_state = (time_board.text, remaining_mine_board.text, emoji_button.status_code)
+                screen.fill(cfg.BACKGROUND_COLOR, topbar_rect)
+                emoji_button.draw(screen)
+                remaining_mine_board.draw(screen)
+                time_board.draw(screen)
+                dirty_rects.append(topbar_rect)
+            full_redraw = False
             
-            # Update the entire screen
-            pygame.display.update()
+            # Update only the changed parts of the screen
+            if dirty_rects: pygame.display.update(dirty_rects)
             # Control frame rate
             clock.tick(cfg.FPS)
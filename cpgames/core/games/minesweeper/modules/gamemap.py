@@ -1,6 +1,8 @@
-# gamemap.py (No changes needed for visual enhancement)
+# gamemap.py
 
 import random
+import pygame
+from collections import deque
 from .mine import Mine
 
 
@@ -24,6 +26,23 @@ class MinesweeperMap():
             # Convert linear index back to 2D matrix coordinates
             self.mines_matrix[i//cfg.GAME_MATRIX_SIZE[0]][i%cfg.GAME_MATRIX_SIZE[0]].burymine()
         
+        # Surrounding coordinates of every cell, computed once
+        self.coords_around = [[self.getaround(j, i) for i in range(cfg.GAME_MATRIX_SIZE[0])] for j in range(cfg.GAME_MATRIX_SIZE[1])]
+        # Number of mines around every cell [row][col], precomputed once after the mines are buried
+        self.mines_around = [[0] * cfg.GAME_MATRIX_SIZE[0] for _ in range(cfg.GAME_MATRIX_SIZE[1])]
+        for j, row in enumerate(self.mines_matrix):
+            for i, item in enumerate(row):
+                if not item.is_mine_flag: continue
+                for (around_j, around_i) in self.coords_around[j][i]:
+                    self.mines_around[around_j][around_i] += 1
+        # Counters of the cells per status code, kept up to date by setminestatus
+        self.status_counts = {0: cfg.GAME_MATRIX_SIZE[0] * cfg.GAME_MATRIX_SIZE[1]}
+        # Cached image of the whole board, only the cells whose status changed are redrawn on it
+        self.board_rect = pygame.Rect(cfg.BORDERSIZE, cfg.GRIDSIZE * 2, cfg.GAME_MATRIX_SIZE[0] * cfg.GRIDSIZE, cfg.GAME_MATRIX_SIZE[1] * cfg.GRIDSIZE)
+        self.board_surface = pygame.Surface(self.board_rect.size).convert()
+        # Cells to be redrawn, every cell at first
+        self.dirty_mines = {item: None for row in self.mines_matrix for item in row}
+        
         # This count variable seems unused, can be removed.
         # count = 0
         # for item in self.mines_matrix:
@@ -36,16 +55,31 @@ class MinesweeperMap():
         self.mouse_pos = None
         self.mouse_pressed = None
         
-    '''Draw the current game state map'''
-    def draw(self, screen):
-        for row in self.mines_matrix:
-            for item in row: 
-                item.draw(screen)
+    '''Draw the current game state map, only the changed cells are blitted unless full is True. Returns the updated screen rects'''
+    def draw(self, screen, full=False):
+        dirty_rects = []
+        for item in self.dirty_mines:
+            self.board_surface.blit(item.gettile(), item.rect.move(-self.board_rect.left, -self.board_rect.top))
+            if not full:
+                screen.blit(item.gettile(), item.rect)
+                dirty_rects.append(item.rect)
+        self.dirty_mines.clear()
+        if full:
+            screen.blit(self.board_surface, self.board_rect)
+            dirty_rects.append(self.board_rect)
+        return dirty_rects
                 
     '''Set the current game status'''
     def setstatus(self, status_code):
         self.status_code = status_code
         
+    '''Set the status of a cell, every cell status change goes through here to keep the counters exact'''
+    def setminestatus(self, mine, status_code):
+        self.status_counts[mine.status_code] -= 1
+        self.status_counts[status_code] = self.status_counts.get(status_code, 0) + 1
+        mine.setstatus(status_code=status_code)
+        self.dirty_mines[mine] = None
+        
     '''Update the game state based on player's mouse operations'''
     def update(self, mouse_pressed=None, mouse_pos=None, type_='down'):
         assert type_ in ['down', 'up']
@@ -81,9 +115,9 @@ class MinesweeperMap():
             if self.mouse_pressed[0] and self.mouse_pressed[2]:
                 # If the clicked cell is already opened and has mines around it
                 if mine_clicked.opened and mine_clicked.num_mines_around > 0:
-                    mine_clicked.setstatus(status_code=4) # Set status to 'double-clicking'
+                    self.setminestatus(mine_clicked, 4) # Set status to 'double-clicking'
                     num_flags_around = 0
-                    coords_around = self.getaround(coord_y, coord_x)
+                    coords_around = self.coords_around[coord_y][coord_x]
                     # Count flags around the clicked cell
                     for (j, i) in coords_around:
                         if self.mines_matrix[j][i].status_code == 2: # Status 2 is 'flagged'
@@ -98,7 +132,7 @@ class MinesweeperMap():
                         # If flag count doesn't match, highlight surrounding unopened cells
                         for (j, i) in coords_around:
                             if self.mines_matrix[j][i].status_code == 0:
-                                self.mines_matrix[j][i].setstatus(status_code=5) # Set status to 'around double-clicked'
+                                self.setminestatus(self.mines_matrix[j][i], 5) # Set status to 'around double-clicked'
         # Mouse button up actions
         else:
             # --Left mouse button released
@@ -111,19 +145,19 @@ class MinesweeperMap():
             elif self.mouse_pressed[2] and not self.mouse_pressed[0]:
                 # Cycle through unopened, flagged, question mark states
                 if mine_clicked.status_code == 0:
-                    mine_clicked.setstatus(status_code=2) # Unopened -> Flag
+                    self.setminestatus(mine_clicked, 2) # Unopened -> Flag
                 elif mine_clicked.status_code == 2:
-                    mine_clicked.setstatus(status_code=3) # Flag -> Question Mark
+                    self.setminestatus(mine_clicked, 3) # Flag -> Question Mark
                 elif mine_clicked.status_code == 3:
-                    mine_clicked.setstatus(status_code=0) # Question Mark -> Unopened
+                    self.setminestatus(mine_clicked, 0) # Question Mark -> Unopened
             # --Both left and right mouse buttons released
             elif self.mouse_pressed[0] and self.mouse_pressed[2]:
                 # Reset status of the double-clicked cell and its surrounding temporary highlights
-                mine_clicked.setstatus(status_code=1) # The original clicked cell becomes opened
-                coords_around = self.getaround(coord_y, coord_x)
+                self.setminestatus(mine_clicked, 1) # The original clicked cell becomes opened
+                coords_around = self.coords_around[coord_y][coord_x]
                 for (j, i) in coords_around:
                     if self.mines_matrix[j][i].status_code == 5:
-                        self.mines_matrix[j][i].setstatus(status_code=0) # Reset temporary highlights to unopened
+                        self.setminestatus(self.mines_matrix[j][i], 0) # Reset temporary highlights to unopened
                         
     '''Open a mine cell'''
     def openmine(self, x, y):
@@ -133,28 +167,27 @@ class MinesweeperMap():
             for row in self.mines_matrix:
                 for item in row:
                     if not item.is_mine_flag and item.status_code == 2:
-                        item.setstatus(status_code=7) # Mark incorrectly flagged non-mines
+                        self.setminestatus(item, 7) # Mark incorrectly flagged non-mines
                     elif item.is_mine_flag and item.status_code == 0:
-                        item.setstatus(status_code=1) # Reveal unflagged mines
-            mine_clicked.setstatus(status_code=6) # Mark the exploded mine
+                        self.setminestatus(item, 1) # Reveal unflagged mines
+            self.setminestatus(mine_clicked, 6) # Mark the exploded mine
             return True # Game lost
         
-        # If not a mine, open it
-        mine_clicked.setstatus(status_code=1)
-        
-        # Calculate number of mines around
-        coords_around = self.getaround(y, x)
-        num_mines = 0
-        for (j, i) in coords_around:
-            num_mines += int(self.mines_matrix[j][i].is_mine_flag)
-        mine_clicked.setnumminesaround(num_mines)
-        
-        # If no mines around, recursively open adjacent empty cells
-        if num_mines == 0:
-            for (j, i) in coords_around:
-                # Only open if not already opened or processed (num_mines_around == -1 indicates unopened)
-                if self.mines_matrix[j][i].num_mines_around == -1:
-                    self.openmine(i, j)
+        # If not a mine, open it, and flood the empty area iteratively (BFS) so large boards cannot hit the recursion limit
+        visited = {(x, y)}
+        queue = deque([(x, y)])
+        while queue:
+            x, y = queue.popleft()
+            mine = self.mines_matrix[y][x]
+            self.setminestatus(mine, 1)
+            num_mines = self.mines_around[y][x]
+            mine.setnumminesaround(num_mines)
+            # If no mines around, also open adjacent cells which are not opened yet (num_mines_around == -1)
+            if num_mines == 0:
+                for (j, i) in self.coords_around[y][x]:
+                    if (i, j) not in visited and self.mines_matrix[j][i].num_mines_around == -1:
+                        visited.add((i, j))
+                        queue.append((i, j))
         return False # Game continues
         
     '''Get coordinates of surrounding cells'''
@@ -176,17 +209,9 @@ class MinesweeperMap():
     '''Count of flagged mines'''
     @property
     def flags(self):
-        num_flags = 0
-        for row in self.mines_matrix:
-            for item in row: 
-                num_flags += int(item.status_code == 2) # Status 2 is 'flagged'
-        return num_flags
+        return self.status_counts.get(2, 0) # Status 2 is 'flagged'
         
     '''Count of opened cells'''
     @property
     def openeds(self):
-        num_openeds = 0
-        for row in self.mines_matrix:
-            for item in row: 
-                num_openeds += int(item.opened) # Check if cell is opened (status 1)
-        return num_openeds
+        return self.status_counts.get(1, 0) # Status 1 is 'opened'
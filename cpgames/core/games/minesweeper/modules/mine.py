@@ -3,6 +3,10 @@
 import pygame
 
 
+'''(raised, image surface, size) -> pre-rendered cell tile'''
+TILE_CACHE = {}
+
+
 '''Mine Cell Class'''
 class Mine(pygame.sprite.Sprite):
     def __init__(self, images, position, status_code=0, **kwargs):
@@ -32,118 +36,62 @@ class Mine(pygame.sprite.Sprite):
     def setnumminesaround(self, num_mines_around):
         self.num_mines_around = num_mines_around
         
-    '''Draw to screen with 3D effects'''
-    def draw(self, screen):
+    '''Key of the image shown for the current status'''
+    def imagekey(self):
+        if self.status_code == 0: return 'blank' # Unopened state (raised button)
+        if self.status_code == 1: return 'mine' if self.is_mine_flag else str(self.num_mines_around) # Opened state (sunken)
+        if self.status_code == 2: return 'flag' # Flagged state (sunken appearance for visual consistency)
+        if self.status_code == 3: return 'ask' # Question mark state (sunken appearance)
+        if self.status_code == 4: # Being double-clicked (sunken, assert not mine)
+            assert not self.is_mine_flag
+            return str(self.num_mines_around)
+        if self.status_code == 5: return '0' # Around double-clicked (temporary sunken for visual feedback)
+        if self.status_code == 6: # Mine clicked (blood)
+            assert self.is_mine_flag
+            return 'blood'
+        if self.status_code == 7: # Mis-flagged (error)
+            assert not self.is_mine_flag
+            return 'error'
+        
+    '''Pre-rendered tile (3D bevel plus image) of the current status, shared by every cell with the same look'''
+    def gettile(self):
+        self.image_surface = self.images[self.imagekey()]
+        key = (self.status_code == 0, self.image_surface, self.rect.size)
+        if key not in TILE_CACHE:
+            tile = pygame.Surface(self.rect.size).convert()
+            self.drawbevel(tile, tile.get_rect(), raised=self.status_code == 0)
+            # Blit the actual image (number, flag, mine, etc.) onto the center of the cell
+            tile.blit(self.image_surface, self.image_surface.get_rect(center=tile.get_rect().center))
+            TILE_CACHE[key] = tile
+        return TILE_CACHE[key]
+        
+    '''Draw the 3D bevel of a cell'''
+    @staticmethod
+    def drawbevel(surface, rect, raised):
         # Import Config to access color definitions from the parent directory
         from ..minesweeper import Config as cfg # Corrected import for colors
-
-        # Determine 3D effect colors based on status
-        if self.status_code == 0: # Unopened state (raised button)
-            top_left_color = cfg.LIGHT_GREY
-            bottom_right_color = cfg.DARK_GREY
-            center_color = cfg.BACKGROUND_COLOR # Inner color of the raised button
-            
+        
+        if raised: # Unopened state (raised button)
             # Draw the raised 3D effect
-            pygame.draw.rect(screen, top_left_color, self.rect)
+            pygame.draw.rect(surface, cfg.LIGHT_GREY, rect)
             # Inner rectangle for the face of the button
-            face_rect = self.rect.inflate(-self.rect.width // 8, -self.rect.height // 8)
-            pygame.draw.rect(screen, center_color, face_rect)
+            face_rect = rect.inflate(-rect.width // 8, -rect.height // 8)
+            pygame.draw.rect(surface, cfg.BACKGROUND_COLOR, face_rect)
             # Bottom and right shadows
-            pygame.draw.line(screen, bottom_right_color, self.rect.bottomleft, self.rect.bottomright, 2)
-            pygame.draw.line(screen, bottom_right_color, self.rect.topright, self.rect.bottomright, 2)
-
-            # Set image for unopened state
-            self.image_surface = self.images['blank']
-            
-        elif self.status_code == 1: # Opened state (sunken)
-            top_left_color = cfg.PRESSED_DARK
-            bottom_right_color = cfg.PRESSED_LIGHT
-            center_color = cfg.BACKGROUND_COLOR # Inner color of the sunken cell
-
-            # Draw the sunken 3D effect
-            pygame.draw.rect(screen, top_left_color, self.rect)
+            pygame.draw.line(surface, cfg.DARK_GREY, rect.bottomleft, rect.bottomright, 2)
+            pygame.draw.line(surface, cfg.DARK_GREY, rect.topright, rect.bottomright, 2)
+        else: # Every other state is drawn sunken
+            pygame.draw.rect(surface, cfg.PRESSED_DARK, rect)
             # Inner rectangle for the face of the cell
-            face_rect = self.rect.inflate(-self.rect.width // 8, -self.rect.height // 8)
-            pygame.draw.rect(screen, center_color, face_rect)
+            face_rect = rect.inflate(-rect.width // 8, -rect.height // 8)
+            pygame.draw.rect(surface, cfg.BACKGROUND_COLOR, face_rect)
             # Top and left highlights for sunken effect
-            pygame.draw.line(screen, bottom_right_color, self.rect.topleft, self.rect.topright, 2)
-            pygame.draw.line(screen, bottom_right_color, self.rect.topleft, self.rect.bottomleft, 2)
-
-            # Set image based on whether it's a mine or a number
-            self.image_surface = self.images['mine'] if self.is_mine_flag else self.images[str(self.num_mines_around)]
-            
-        elif self.status_code == 2: # Flagged state (sunken appearance for visual consistency)
-            top_left_color = cfg.PRESSED_DARK
-            bottom_right_color = cfg.PRESSED_LIGHT
-            center_color = cfg.BACKGROUND_COLOR
-            pygame.draw.rect(screen, top_left_color, self.rect)
-            face_rect = self.rect.inflate(-self.rect.width // 8, -self.rect.height // 8)
-            pygame.draw.rect(screen, center_color, face_rect)
-            pygame.draw.line(screen, bottom_right_color, self.rect.topleft, self.rect.topright, 2)
-            pygame.draw.line(screen, bottom_right_color, self.rect.topleft, self.rect.bottomleft, 2)
-            self.image_surface = self.images['flag']
-            
-        elif self.status_code == 3: # Question mark state (sunken appearance)
-            top_left_color = cfg.PRESSED_DARK
-            bottom_right_color = cfg.PRESSED_LIGHT
-            center_color = cfg.BACKGROUND_COLOR
-            pygame.draw.rect(screen, top_left_color, self.rect)
-            face_rect = self.rect.inflate(-self.rect.width // 8, -self.rect.height // 8)
-            pygame.draw.rect(screen, center_color, face_rect)
-            pygame.draw.line(screen, bottom_right_color, self.rect.topleft, self.rect.topright, 2)
-            pygame.draw.line(screen, bottom_right_color, self.rect.topleft, self.rect.bottomleft, 2)
-            self.image_surface = self.images['ask']
-            
-        elif self.status_code == 4: # Being double-clicked (sunken, assert not mine)
-            assert not self.is_mine_flag
-            top_left_color = cfg.PRESSED_DARK
-            bottom_right_color = cfg.PRESSED_LIGHT
-            center_color = cfg.BACKGROUND_COLOR
-            pygame.draw.rect(screen, top_left_color, self.rect)
-            face_rect = self.rect.inflate(-self.rect.width // 8, -self.rect.height // 8)
-            pygame.draw.rect(screen, center_color, face_rect)
-            pygame.draw.line(screen, bottom_right_color, self.rect.topleft, self.rect.topright, 2)
-            pygame.draw.line(screen, bottom_right_color, self.rect.topleft, self.rect.bottomleft, 2)
-            self.image_surface = self.images[str(self.num_mines_around)]
-            
-        elif self.status_code == 5: # Around double-clicked (temporary sunken for visual feedback)
-            top_left_color = cfg.PRESSED_DARK
-            bottom_right_color = cfg.PRESSED_LIGHT
-            center_color = cfg.BACKGROUND_COLOR
-            pygame.draw.rect(screen, top_left_color, self.rect)
-            face_rect = self.rect.inflate(-self.rect.width // 8, -self.rect.height // 8)
-            pygame.draw.rect(screen, center_color, face_rect)
-            pygame.draw.line(screen, bottom_right_color, self.rect.topleft, self.rect.topright, 2)
-            pygame.draw.line(screen, bottom_right_color, self.rect.topleft, self.rect.bottomleft, 2)
-            self.image_surface = self.images['0'] # Show blank/0 for visual
-            
-        elif self.status_code == 6: # Mine clicked (blood)
-            assert self.is_mine_flag
-            top_left_color = cfg.PRESSED_DARK
-            bottom_right_color = cfg.PRESSED_LIGHT
-            center_color = cfg.BACKGROUND_COLOR
-            pygame.draw.rect(screen, top_left_color, self.rect)
-            face_rect = self.rect.inflate(-self.rect.width // 8, -self.rect.height // 8)
-            pygame.draw.rect(screen, center_color, face_rect)
-            pygame.draw.line(screen, bottom_right_color, self.rect.topleft, self.rect.topright, 2)
-            pygame.draw.line(screen, bottom_right_color, self.rect.topleft, self.rect.bottomleft, 2)
-            self.image_surface = self.images['blood']
-            
-        elif self.status_code == 7: # Mis-flagged (error)
-            assert not self.is_mine_flag
-            top_left_color = cfg.PRESSED_DARK
-            bottom_right_color = cfg.PRESSED_LIGHT
-            center_color = cfg.BACKGROUND_COLOR
-            pygame.draw.rect(screen, top_left_color, self.rect)
-            face_rect = self.rect.inflate(-self.rect.width // 8, -self.rect.height // 8)
-            pygame.draw.rect(screen, center_color, face_rect)
-            pygame.draw.line(screen, bottom_right_color, self.rect.topleft, self.rect.topright, 2)
-            pygame.draw.line(screen, bottom_right_color, self.rect.topleft, self.rect.bottomleft, 2)
-            self.image_surface = self.images['error']
-
-        # Blit the actual image (number, flag, mine, etc.) onto the center of the cell
-        image_rect = self.image_surface.get_rect(center=self.rect.center)
-        screen.blit(self.image_surface, image_rect)
+            pygame.draw.line(surface, cfg.PRESSED_LIGHT, rect.topleft, rect.topright, 2)
+            pygame.draw.line(surface, cfg.PRESSED_LIGHT, rect.topleft, rect.bottomleft, 2)
+        
+    '''Draw to screen with 3D effects'''
+    def draw(self, screen):
+        screen.blit(self.gettile(), self.rect)
 
     @property
     def opened(self):
@@ -3,6 +3,7 @@ import sys
 import random
 import os # Keep os for future pathing if resources were to be added
 import math # Import the math module for radians conversion
+import collections
 
 # --- Minimal Utility Functions and Base Class (replacing external dependencies) ---
 def QuitGame():
@@ -137,6 +138,145 @@ class Food(pygame.sprite.Sprite):
         pygame.draw.circle(self.image, color, (center_x, center_y), radius - 1)
 
 
+class WalkabilityGrid:
+    """Wall rects compiled into a grid of blocked cells, with a summed-area table so that rect tests are O(1)."""
+    def __init__(self, rects, cell_size=None, max_fields=64):
+        rects = [pygame.Rect(rect) for rect in rects]
+        # Every wall edge lies on the cell lattice, so testing cells is exact
+        if cell_size is None:
+            cell_size = 0
+            for rect in rects:
+                for value in (rect.left, rect.top, rect.width, rect.height):
+                    cell_size = math.gcd(cell_size, value)
+        self.cell_size = max(1, cell_size)
+        self.cols = max([rect.right for rect in rects] + [0]) // self.cell_size + 1
+        self.rows = max([rect.bottom for rect in rects] + [0]) // self.cell_size + 1
+        blocked = [[0] * self.cols for _ in range(self.rows)]
+        for rect in rects:
+            for row in range(rect.top // self.cell_size, (rect.bottom - 1) // self.cell_size + 1):
+                for col in range(rect.left // self.cell_size, (rect.right - 1) // self.cell_size + 1):
+                    blocked[row][col] = 1
+        # sat[row][col] = number of blocked cells above and left of (row, col)
+        self.sat = [[0] * (self.cols + 1) for _ in range(self.rows + 1)]
+        for row in range(self.rows):
+            running = 0
+            for col in range(self.cols):
+                running += blocked[row][col]
+                self.sat[row + 1][col + 1] = self.sat[row][col + 1] + running
+        # player size -> [free flag per node], a node is a player position aligned on the cell lattice
+        self.node_free = {}
+        # (target node, player size) -> distance field, least recently used first
+        self.fields = collections.OrderedDict()
+        self.max_fields = max_fields
+
+    def collides(self, rect):
+        """Whether the rect overlaps any wall, the area outside the grid is open."""
+        col0, row0 = max(0, rect.left // self.cell_size), max(0, rect.top // self.cell_size)
+        col1, row1 = min(self.cols - 1, (rect.right - 1) // self.cell_size), min(self.rows - 1, (rect.bottom - 1) // self.cell_size)
+        if col0 > col1 or row0 > row1:
+            return False
+        sat = self.sat
+        return sat[row1 + 1][col1 + 1] - sat[row0][col1 + 1] - sat[row1 + 1][col0] + sat[row0][col0] > 0
+
+    def nodeOf(self, x, y):
+        """Node of a player whose top left corner is at (x, y), a free position always maps to a free node."""
+        return (int(x) // self.cell_size, int(y) // self.cell_size)
+
+    def distanceField(self, target, size):
+        """BFS distances (in nodes) from every node to the target node for a player of the given size."""
+        key = (target, size)
+        if key in self.fields:
+            self.fields.move_to_end(key)
+            return self.fields[key]
+        if size not in self.node_free:
+            self.node_free[size] = [
+                not self.collides(pygame.Rect(col * self.cell_size, row * self.cell_size, size, size))
+                for row in range(self.rows) for col in range(self.cols)
+            ]
+        free, cols, rows = self.node_free[size], self.cols, self.rows
+        field = [-1] * (cols * rows)
+        col, row = target
+        if 0 <= col < cols and 0 <= row < rows and free[row * cols + col]:
+            field[row * cols + col] = 0
+            queue = collections.deque([(col, row)])
+            while queue:
+                col, row = queue.popleft()
+                distance = field[row * cols + col] + 1
+                for next_col, next_row in ((col - 1, row), (col + 1, row), (col, row - 1), (col, row + 1)):
+                    if 0 <= next_col < cols and 0 <= next_row < rows:
+                        index = next_row * cols + next_col
+                        if free[index] and field[index] < 0:
+                            field[index] = distance
+                            queue.append((next_col, next_row))
+        self.fields[key] = field
+        if len(self.fields) > self.max_fields:
+            self.fields.popitem(last=False)
+        return field
+
+    def distance(self, field, node):
+        """Distance of a node in a field, None if the target cannot be reached from it."""
+        col, row = node
+        if not (0 <= col < self.cols and 0 <= row < self.rows):
+            return None
+        distance = field[row * self.cols + col]
+        return distance if distance >= 0 else None
+
+
+class SpriteFrameAtlas:
+    """Pre-rendered frames of the players, built once per (image, size) so that updates only pick a frame."""
+    ROTATIONS = (0, 90, 180, 270)
+
+    def __init__(self):
+        # (base image, size) -> scaled image
+        self.scaled_images = {}
+        # (base image, size, mouth step) -> {rotation angle: [frame per mouth step]}
+        self.pacman_frames = {}
+
+    def scaled(self, base_image, size):
+        """Returns the base image scaled to size x size."""
+        key = (base_image, size)
+        if key not in self.scaled_images:
+            self.scaled_images[key] = pygame.transform.scale(base_image, (size, size)).convert_alpha()
+        return self.scaled_images[key]
+
+    def pacman(self, base_image, size, mouth_open, rotation_angle, mouth_step=10):
+        """Returns the pacman frame with the mouth open by mouth_open percent, facing rotation_angle."""
+        key = (base_image, size, mouth_step)
+        if key not in self.pacman_frames:
+            self.pacman_frames[key] = self._renderPacman(base_image, size, mouth_step)
+        frames = self.pacman_frames[key][rotation_angle % 360]
+        return frames[min(len(frames) - 1, max(0, int(round(mouth_open / mouth_step))))]
+
+    def _renderPacman(self, base_image, size, mouth_step):
+        """Cuts the mouth out of the scaled image for every mouth step and rotates the results."""
+        current_image = self.scaled(base_image, size)
+        center = (size // 2, size // 2)
+        radius = size // 2
+        frames = {angle: [] for angle in self.ROTATIONS}
+        for mouth_open in range(0, 100 + mouth_step, mouth_step):
+            mouth_open = min(100, mouth_open)
+            temp_surface = pygame.Surface(current_image.get_size(), pygame.SRCALPHA)
+            temp_surface.blit(current_image, (0, 0))
+            # The mouth is drawn for a right-facing Pacman, then the whole surface is rotated.
+            mouth_angle = 45 * (mouth_open / 100.0)
+            mouth_start_rad = math.radians(-mouth_angle) # Top jaw, relative to horizontal
+            mouth_end_rad = math.radians(mouth_angle)    # Bottom jaw, relative to horizontal
+            points = [center,
+                      (center[0] + radius * math.cos(mouth_start_rad),
+                       center[1] + radius * math.sin(mouth_start_rad)),
+                      (center[0] + radius * math.cos(mouth_end_rad),
+                       center[1] + radius * math.sin(mouth_end_rad))]
+            pygame.draw.polygon(temp_surface, (0, 0, 0, 0), points)
+            # Pygame's rotate is counter-clockwise.
+            for angle in self.ROTATIONS:
+                frames[angle].append(pygame.transform.rotate(temp_surface, angle))
+        return frames
+
+
+# Shared by every Player, so restarting a level reuses the rendered frames
+FRAME_ATLAS = SpriteFrameAtlas()
+
+
 class Player(pygame.sprite.Sprite):
     """Player class for Pacman and Ghosts, with animation and improved visuals."""
     size = 20 # **Reduced size for better maze navigation - now a class attribute**
@@ -147,7 +287,7 @@ class Player(pygame.sprite.Sprite):
         self.base_image = image_surface # Store the base image
         
         # Scale the base image to the desired size (using the class attribute)
-        self.image = pygame.transform.scale(self.base_image, (Player.size, Player.size)).convert_alpha()
+        self.image = FRAME_ATLAS.scaled(self.base_image, Player.size)
         self.rect = self.image.get_rect()
         self.rect.left = x
         self.rect.top = y
@@ -169,6 +309,8 @@ class Player(pygame.sprite.Sprite):
         self.target = None # For chasing logic
         # Ghosts start outside the gate, so no initial escape needed
         self.is_escaping_gate = False
+        # Direction towards the next node of the distance field
+        self.nav_direction = None
 
 
     def changeSpeed(self, direction):
@@ -198,70 +340,26 @@ class Player(pygame.sprite.Sprite):
         # Ghosts do not rotate or animate like Pacman from their images, their direction is implicit.
         return self.speed
 
-    def update(self, wall_sprites, gate_sprites, pacman_pos=None): # Added pacman_pos for ghost AI
-        """Updates player position and handles collisions."""
+    def update(self, collision_grid, pacman_pos=None): # Added pacman_pos for ghost AI
+        """Updates player position and handles collisions against the compiled walls."""
         if not self.is_move and self.role_name != 'pacman' and self.role_name != 'ghost': # Pacman and Ghosts always update
             return False
 
         x_prev = self.rect.left
         y_prev = self.rect.top
         
-        # Ghost AI logic - simple chasing
+        # Ghost AI logic - follow the distance field towards Pacman
         if self.role_name != 'pacman': # Only apply AI to ghosts
-            # Determine ideal direction towards Pacman
-            dx = pacman_pos[0] - self.rect.centerx
-            dy = pacman_pos[1] - self.rect.centery
-
-            # Prioritize horizontal or vertical movement based on which is closer to target
-            potential_directions = []
-            if abs(dx) > abs(dy):
-                potential_directions.append([1, 0] if dx > 0 else [-1, 0])
-                potential_directions.append([0, 1] if dy > 0 else [0, -1])
-            else:
-                potential_directions.append([0, 1] if dy > 0 else [0, -1])
-                potential_directions.append([1, 0] if dx > 0 else [-1, 0])
-
-            # Try directions in order of priority, avoiding walls
-            valid_move_found = False
-            for direction_attempt in potential_directions:
-                temp_speed = [direction_attempt[0] * self.base_speed[0], direction_attempt[1] * self.base_speed[1]]
-                test_rect = self.rect.copy()
-                test_rect.left += temp_speed[0]
-                test_rect.top += temp_speed[1]
-                
-                # Manual collision check of the test_rect against wall_sprites' rects
-                temp_collide = False
-                for wall in wall_sprites:
-                    if test_rect.colliderect(wall.rect):
-                        temp_collide = True
-                        break
-                
-                # Ghosts should avoid walls, but not the gate (as they can pass through).
-                if not temp_collide: # If the proposed move does not collide with any wall
-                    self.changeSpeed(direction_attempt)
-                    valid_move_found = True
-                    break
-            
-            # If all preferred moves are blocked by walls, try a random direction
-            if not valid_move_found:
-                self.changeSpeed(self.randomDirection())
-
+            if not self.followDistanceField(collision_grid, pacman_pos):
+                self.chaseGreedy(collision_grid, pacman_pos)
 
         self.rect.left += self.speed[0]
         self.rect.top += self.speed[1]
 
         # Handle collisions
-        # For Pacman: collide with walls AND gates.
-        # For Ghosts: collide with walls (they can pass through the gate as part of AI).
-        collision_sprites_to_check = pygame.sprite.Group()
-        if self.role_name == 'pacman':
-            collision_sprites_to_check.add(wall_sprites)
-            if gate_sprites: # Pacman collides with gate
-                collision_sprites_to_check.add(gate_sprites)
-        else: # Ghosts only collide with walls for general movement
-            collision_sprites_to_check.add(wall_sprites)
-
-        is_collide = pygame.sprite.spritecollide(self, collision_sprites_to_check, False)
+        # For Pacman: the grid holds the walls AND the gate.
+        # For Ghosts: the grid only holds the walls (they can pass through the gate as part of AI).
+        is_collide = collision_grid.collides(self.rect)
         
 
         if is_collide:
@@ -280,59 +378,88 @@ class Player(pygame.sprite.Sprite):
                 self.mouth_direction *= -1 # Reverse direction
                 self.mouth_open = max(0, min(100, self.mouth_open)) # Clamp value
 
-            # Create a dynamic image for Pacman with mouth animation and rotation
-            current_image = pygame.transform.scale(self.base_image, (Player.size, Player.size)).convert_alpha() # Use Player.size
-            
-            # Apply mouth cut-out
-            temp_surface = pygame.Surface(current_image.get_size(), pygame.SRCALPHA)
-            temp_surface.blit(current_image, (0, 0))
-            
-            center = (Player.size // 2, Player.size // 2) # Use Player.size
-            radius = Player.size // 2 # Use Player.size
-            mouth_angle = 45 * (self.mouth_open / 100.0)
-            
-            # Use math.radians directly for angles
-            # These angles need to correspond to the rotation_angle logic
-            # If base image is right-facing (0 degrees):
-            # 0 for right, 90 for up, 180 for left, 270 for down
-            # The polygon points need to be relative to the temp_surface,
-            # then the whole surface is rotated.
-            # For Pacman image facing right, angles are clockwise from positive x-axis for drawing
-            # and then converted to radians.
-
-            # Re-calculating points for the mouth based on original Pacman image facing right (0 degrees)
-            # Mouth opens symmetrically around the current direction.
-            
-            # The rotation_angle is applied AFTER the mouth cut.
-            # So, the mouth drawing itself should always be for a right-facing Pacman,
-            # and then the `temp_surface` is rotated.
-            
-            # Angles for a right-facing mouth:
-            mouth_start_rad = math.radians(-mouth_angle) # Top jaw, relative to horizontal
-            mouth_end_rad = math.radians(mouth_angle)    # Bottom jaw, relative to horizontal
-
-            points = [center,
-                      (center[0] + radius * math.cos(mouth_start_rad),
-                       center[1] + radius * math.sin(mouth_start_rad)),
-                      (center[0] + radius * math.cos(mouth_end_rad),
-                       center[1] + radius * math.sin(mouth_end_rad))]
-            
-            pygame.draw.polygon(temp_surface, (0, 0, 0, 0), points)
-
-            # Rotate the combined image (after mouth is cut).
-            # Pygame's rotate is counter-clockwise.
-            # Use self.rotation_angle directly.
-            rotated_image = pygame.transform.rotate(temp_surface, self.rotation_angle) 
-            self.image = rotated_image
+            # Pick the pre-rendered frame for the mouth opening and direction
+            self.image = FRAME_ATLAS.pacman(self.base_image, Player.size, self.mouth_open, self.rotation_angle, self.mouth_speed)
             self.rect = self.image.get_rect(center=self.rect.center) # Keep center consistent
 
         elif self.role_name != 'pacman': # For ghosts, just update image if necessary (e.g. for scaling)
-            self.image = pygame.transform.scale(self.base_image, (Player.size, Player.size)).convert_alpha() # Use Player.size
+            self.image = FRAME_ATLAS.scaled(self.base_image, Player.size) # Use Player.size
             self.rect = self.image.get_rect(center=self.rect.center) # Keep center consistent
 
 
         return True
 
+    def followDistanceField(self, collision_grid, pacman_pos):
+        """Steers a ghost one node closer to Pacman along the grid's distance field, returns False if it cannot."""
+        cell_size = collision_grid.cell_size
+        field = collision_grid.distanceField(collision_grid.nodeOf(pacman_pos[0] - Player.size // 2, pacman_pos[1] - Player.size // 2), Player.size)
+        node = collision_grid.nodeOf(self.rect.left, self.rect.top)
+        distance = collision_grid.distance(field, node)
+        if not distance: # Unreachable, or already on Pacman's node
+            return False
+
+        # Among the neighbours one step closer, prefer the axis along which Pacman is farther away
+        dx = pacman_pos[0] - self.rect.centerx
+        dy = pacman_pos[1] - self.rect.centery
+        horizontal = [[1, 0], [-1, 0]] if dx > 0 else [[-1, 0], [1, 0]]
+        vertical = [[0, 1], [0, -1]] if dy > 0 else [[0, -1], [0, 1]]
+        candidates = horizontal + vertical if abs(dx) > abs(dy) else vertical + horizontal
+        # Keep the current heading while it still descends, so that ghosts do not dither between equal paths
+        if self.nav_direction in candidates:
+            candidates.remove(self.nav_direction)
+            candidates.insert(0, self.nav_direction)
+        for direction in candidates:
+            next_node = (node[0] + direction[0], node[1] + direction[1])
+            if collision_grid.distance(field, next_node) == distance - 1:
+                break
+        else:
+            return False
+        self.nav_direction = direction
+
+        # Align the cross axis on the node first, so that the move stays inside free nodes
+        if direction[0] != 0 and self.rect.top != node[1] * cell_size:
+            offset = node[1] * cell_size - self.rect.top
+            move = [0, 1 if offset > 0 else -1]
+        elif direction[1] != 0 and self.rect.left != node[0] * cell_size:
+            offset = node[0] * cell_size - self.rect.left
+            move = [1 if offset > 0 else -1, 0]
+        elif direction[0] != 0:
+            offset = next_node[0] * cell_size - self.rect.left
+            move = direction
+        else:
+            offset = next_node[1] * cell_size - self.rect.top
+            move = direction
+        self.changeSpeed(move)
+        # Do not overshoot the lattice
+        step = min(abs(offset), self.base_speed[0] if move[0] != 0 else self.base_speed[1])
+        self.speed = [move[0] * step, move[1] * step]
+        return True
+
+    def chaseGreedy(self, collision_grid, pacman_pos):
+        """Fallback chase: tries the directions towards Pacman in order of priority, avoiding walls."""
+        # Determine ideal direction towards Pacman
+        dx = pacman_pos[0] - self.rect.centerx
+        dy = pacman_pos[1] - self.rect.centery
+
+        # Prioritize horizontal or vertical movement based on which is closer to target
+        potential_directions = []
+        if abs(dx) > abs(dy):
+            potential_directions.append([1, 0] if dx > 0 else [-1, 0])
+            potential_directions.append([0, 1] if dy > 0 else [0, -1])
+        else:
+            potential_directions.append([0, 1] if dy > 0 else [0, -1])
+            potential_directions.append([1, 0] if dx > 0 else [-1, 0])
+
+        for direction_attempt in potential_directions:
+            test_rect = self.rect.move(direction_attempt[0] * self.base_speed[0], direction_attempt[1] * self.base_speed[1])
+            # Ghosts should avoid walls, but not the gate (as they can pass through).
+            if not collision_grid.collides(test_rect):
+                self.changeSpeed(direction_attempt)
+                return
+
+        # If all preferred moves are blocked by walls, try a random direction
+        self.changeSpeed(self.randomDirection())
+
     def randomDirection(self):
         """Generates a random direction for ghosts."""
         return random.choice([[-1, 0], [1, 0], [0, 1], [0, -1]])
@@ -366,12 +493,16 @@ class Level1():
         for wall_position in wall_positions:
             wall = Wall(*wall_position, wall_color)
             self.wall_sprites.add(wall)
+        # Compiled once per level, ghosts collide and navigate with it
+        self.wall_grid = WalkabilityGrid([wall.rect for wall in self.wall_sprites])
         return self.wall_sprites
 
     def setupGate(self, gate_color):
         """Creates and returns a sprite group for the gate."""
         self.gate_sprites = pygame.sprite.Group()
         self.gate_sprites.add(Wall(282, 242, 42, 2, gate_color))
+        # Pacman cannot pass the gate, so it collides with the walls and the gate
+        self.pacman_grid = WalkabilityGrid([wall.rect for wall in self.wall_sprites] + [gate.rect for gate in self.gate_sprites])
         return self.gate_sprites
 
     def setupPlayers(self, hero_image, ghost_images_dict): # Now takes image surfaces
@@ -608,7 +739,7 @@ class PacmanGame(PygameBaseGame):
             pacman_center_pos = None
             for hero in hero_sprites:
                 pacman_center_pos = hero.rect.center
-                hero.update(wall_sprites, gate_sprites) # Update Pacman's position and animation
+                hero.update(level.pacman_grid) # Update Pacman's position and animation
                 food_eaten = pygame.sprite.spritecollide(hero, food_sprites, True)
                 SCORE += len(food_eaten)
                 # Play sound effect for eating food (if sound is loaded)
@@ -619,7 +750,7 @@ class PacmanGame(PygameBaseGame):
             for ghost in ghost_sprites:
                 # Ghosts should not consider the gate as a wall when moving,
                 # as they can pass through. Only walls are obstacles for them.
-                ghost.update(wall_sprites, None, pacman_center_pos) # Do NOT pass gate_sprites to ghost.update
+                ghost.update(level.wall_grid, pacman_center_pos) # Do NOT pass the gate to ghost.update
 
             wall_sprites.draw(screen)
             gate_sprites.draw(screen)
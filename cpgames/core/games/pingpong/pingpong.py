@@ -1,7 +1,7 @@
 
 import os
 import pygame
-from ...utils import QuitGame
+from ...utils import QuitGame, SharedTextCache
 from ..base import PygameBaseGame
 from .modules import Ball, Racket
 
@@ -103,8 +103,8 @@ class PingpongGame(PygameBaseGame):
             racket_left.draw(screen)
             racket_right.draw(screen)
             # --得分
-            screen.blit(font.render(str(score_left), False, cfg.WHITE), (150, 10))
-            screen.blit(font.render(str(score_right), False, cfg.WHITE), (300, 10))
+            SharedTextCache.blit(screen, font, score_left, cfg.WHITE, (150, 10), antialias=False)
+            SharedTextCache.blit(screen, font, score_right, cfg.WHITE, (300, 10), antialias=False)
             if score_left == 11 or score_right == 11:
                 return score_left, score_right
             clock.tick(cfg.FPS_GAMING)
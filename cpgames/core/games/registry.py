@@ -0,0 +1,88 @@
+'''
+Function:
+    Lazy registry of the supported games, the game modules are only imported when a game is requested
+Author:
+    Dannz
+'''
+import time
+import importlib
+from collections import OrderedDict
+from collections.abc import Mapping
+
+
+'''key -> (module path relative to this package, entry class name)'''
+SUPPORTED_GAMES = OrderedDict([
+    ('ski', ('.ski', 'SkiGame')),
+    ('maze', ('.maze', 'MazeGame')),
+    ('pacman', ('.pacman', 'PacmanGame')),
+    ('gemgem', ('.gemgem', 'GemGemGame')),
+    ('tankwar', ('.tankwar', 'TankWarGame')),
+    ('sokoban', ('.sokoban', 'SokobanGame')),
+    ('pingpong', ('.pingpong', 'PingpongGame')),
+    ('trexrush', ('.trexrush', 'TRexRushGame')),
+    ('bomberman', ('.bomberman', 'BomberManGame')),
+    ('whacamole', ('.whacamole', 'WhacAMoleGame')),
+    ('catchcoins', ('.catchcoins', 'CatchCoinsGame')),
+    ('flappybird', ('.flappybird', 'FlappyBirdGame')),
+    ('angrybirds', ('.angrybirds', 'AngryBirdsGame')),
+    ('magictower', ('.magictower', 'MagicTowerGame')),
+    ('aircraftwar', ('.aircraftwar', 'AircraftWarGame')),
+    ('bunnybadger', ('.bunnybadger', 'BunnyBadgerGame')),
+    ('minesweeper', ('.minesweeper', 'MineSweeperGame')),
+    ('greedysnake', ('.greedysnake', 'GreedySnakeGame')),
+    ('puzzlepieces', ('.puzzlepieces', 'PuzzlePiecesGame')),
+    ('towerdefense', ('.towerdefense', 'TowerDefenseGame')),
+    ('bloodfootball', ('.bloodfootball', 'BloodFootballGame')),
+    ('alieninvasion', ('.alieninvasion', 'AlienInvasionGame')),
+    ('breakoutclone', ('.breakoutclone', 'BreakoutcloneGame')),
+    ('twozerofoureight', ('.twozerofoureight', 'TwoZeroFourEightGame')),
+])
+
+
+'''GameRegistry'''
+class GameRegistry(Mapping):
+    def __init__(self, entries=None, package=None, **kwargs):
+        # relative module paths are resolved against this package (works for both `cpgames.core.games` and `core.games`)
+        self.package = package if package is not None else __package__
+        self.entries = OrderedDict()
+        self.game_classes = dict()
+        self.import_times = dict()
+        entries = SUPPORTED_GAMES if entries is None else entries
+        for key, (module_path, class_name) in entries.items():
+            self.register(key, module_path, class_name)
+    '''register a game without importing it'''
+    def register(self, key, module_path, class_name):
+        self.entries[key] = (module_path, class_name)
+        self.game_classes.pop(key, None)
+        self.import_times.pop(key, None)
+    '''import the game module on first use and return the entry class'''
+    def load(self, key):
+        if key in self.game_classes: return self.game_classes[key]
+        if key not in self.entries: raise KeyError(key)
+        module_path, class_name = self.entries[key]
+        start_time = time.perf_counter()
+        module = importlib.import_module(module_path, package=self.package)
+        self.import_times[key] = time.perf_counter() - start_time
+        game_class = getattr(module, class_name)
+        self.game_classes[key] = game_class
+        return game_class
+    '''whether the game module has been imported'''
+    def isloaded(self, key):
+        return key in self.game_classes
+    '''seconds spent importing the game module, None if it has not been imported yet'''
+    def getimporttime(self, key):
+        return self.import_times.get(key)
+    '''find the registered key of an entry class name'''
+    def findkey(self, class_name):
+        for key, (_, name) in self.entries.items():
+            if name == class_name: return key
+        return None
+    '''mapping interface, indexing imports the game lazily'''
+    def __getitem__(self, key):
+        return self.load(key)
+    def __iter__(self):
+        return iter(self.entries)
+    def __len__(self):
+        return len(self.entries)
+    def __contains__(self, key):
+        return key in self.entries
@@ -3,9 +3,10 @@ import sys
 import pygame
 import random
 import re
+from collections import deque
 
 # Changed relative imports to absolute imports from the dzgames package root
-from ...utils import QuitGame
+from ...utils import QuitGame, SpatialHashGroup
 from ..base import PygameBaseGame
 
 # Initialize Pygame globally at the very beginning of the script
@@ -25,6 +26,17 @@ class Config():
     base_game_resources_dir = os.path.join(os.path.dirname(current_ski_game_dir), 'base', 'resources')
 
     FPS = 40
+    # Cell size (pixels) of the spatial hash used for obstacle collisions
+    COLLISION_CELL_SIZE = 128
+    # Obstacle streaming: the slope is generated in chunks of this height (pixels) ahead of the camera
+    OBSTACLE_CHUNK_HEIGHT = 1000
+    OBSTACLES_PER_CHUNK = 40
+    # Chunks kept generated below the bottom of the screen
+    OBSTACLE_LOOKAHEAD_CHUNKS = 2
+    # Obstacles materialised per frame, so a new chunk never costs a burst of allocations
+    OBSTACLE_SPAWNS_PER_FRAME = 4
+    # Seed of the slope generator, set an int for reproducible runs (e.g. benchmarking), None for a random slope
+    OBSTACLE_SEED = None
     # Initial Screen size - Will be dynamic based on display info and resizable
     # Use pygame.display.Info() to get current screen resolution for initial setup
     DISPLAY_INFO = pygame.display.Info()
@@ -721,8 +733,13 @@ class SkierSprite(pygame.sprite.Sprite):
 
 '''Obstacle Class (now versatile for animals and NPC skiers)'''
 class ObstacleSprite(pygame.sprite.Sprite):
-    def __init__(self, images_or_image, location, attribute, is_npc_animal=False, is_npc_skier=False, is_monster=False): 
+    def __init__(self, images_or_image, location, attribute, is_npc_animal=False, is_npc_skier=False, is_monster=False, rng=random): 
         pygame.sprite.Sprite.__init__(self)
+        self.reset(images_or_image, location, attribute, is_npc_animal, is_npc_skier, is_monster, rng)
+
+    def reset(self, images_or_image, location, attribute, is_npc_animal=False, is_npc_skier=False, is_monster=False, rng=random):
+        # Pooled sprites are re-initialised here instead of being allocated again
+        self.rng = rng
         self.location = list(location)
         self.attribute = attribute
         self.passed = False 
@@ -738,8 +755,8 @@ class ObstacleSprite(pygame.sprite.Sprite):
 
         self.npc_skier_fallen = False 
         self.npc_skier_recovery_timer = 0 
-        self.npc_vertical_speed_factor = random.uniform(0.8, 1.2)
-        self.npc_speed_change_timer = random.randint(60, 200)
+        self.npc_vertical_speed_factor = self.rng.uniform(0.8, 1.2)
+        self.npc_speed_change_timer = self.rng.randint(60, 200)
         self.npc_speed_timer_current = 0
 
         self.npc_move_speed_x = 0.0 
@@ -759,23 +776,23 @@ class ObstacleSprite(pygame.sprite.Sprite):
         if self.is_npc_skier:
             self.images_movement = images_or_image['images'] 
             self.image_fall_npc = images_or_image['fall'] 
-            self.direction = random.choice([-1, 0, 1]) 
+            self.direction = self.rng.choice([-1, 0, 1]) 
             if self.direction == 0: image_index = 0
             elif self.direction == 1: image_index = 1
             else: image_index = 2 
             self.image = self.images_movement[image_index]
 
-            self.skier_move_speed_x = random.uniform(0.8, 1.8) 
-            self.skier_move_duration = random.randint(40, 150) 
+            self.skier_move_speed_x = self.rng.uniform(0.8, 1.8) 
+            self.skier_move_duration = self.rng.randint(40, 150) 
             self.skier_move_timer = 0
             
         elif isinstance(images_or_image, list):
             self.animation_frames = images_or_image
             self.image = self.animation_frames[self.current_frame_index]
             if self.is_npc_animal: 
-                self.npc_move_speed_x = random.uniform(0.5, 1.5) 
-                self.npc_move_direction_x = random.choice([-1, 0, 1]) 
-                self.npc_move_duration = random.randint(30, 120) 
+                self.npc_move_speed_x = self.rng.uniform(0.5, 1.5) 
+                self.npc_move_direction_x = self.rng.choice([-1, 0, 1]) 
+                self.npc_move_duration = self.rng.randint(30, 120) 
                 self.npc_move_timer = 0 
         elif self.is_monster:
             self.loaded_monster_frames = images_or_image
@@ -867,16 +884,16 @@ class ObstacleSprite(pygame.sprite.Sprite):
         if not self.is_monster:
             self.npc_speed_timer_current += 1
             if self.npc_speed_timer_current >= self.npc_speed_change_timer:
-                self.npc_vertical_speed_factor = random.uniform(0.8, 1.2)
-                self.npc_speed_change_timer = random.randint(60, 200)
+                self.npc_vertical_speed_factor = self.rng.uniform(0.8, 1.2)
+                self.npc_speed_change_timer = self.rng.randint(60, 200)
                 self.npc_speed_timer_current = 0
 
         if self.is_npc_animal and not self.is_npc_skier and not self.is_monster:
             self.npc_move_timer += 1
             if self.npc_move_timer >= self.npc_move_duration:
-                self.npc_move_direction_x = random.choice([-1, 0, 1]) 
-                self.npc_move_speed_x = random.uniform(0.5, 1.5)
-                self.npc_move_duration = random.randint(30, 120) 
+                self.npc_move_direction_x = self.rng.choice([-1, 0, 1]) 
+                self.npc_move_speed_x = self.rng.uniform(0.5, 1.5)
+                self.npc_move_duration = self.rng.randint(30, 120) 
                 self.npc_move_timer = 0
         elif self.is_npc_skier: 
             if self.npc_skier_fallen:
@@ -886,9 +903,9 @@ class ObstacleSprite(pygame.sprite.Sprite):
             else: 
                 self.skier_move_timer += 1
                 if self.skier_move_timer >= self.skier_move_duration:
-                    self.direction = random.choice([-1, 0, 1]) 
-                    self.skier_move_speed_x = random.uniform(0.8, 1.8)
-                    self.skier_move_duration = random.randint(40, 150)
+                    self.direction = self.rng.choice([-1, 0, 1]) 
+                    self.skier_move_speed_x = self.rng.uniform(0.8, 1.8)
+                    self.skier_move_duration = self.rng.randint(40, 150)
                     self.skier_move_timer = 0
             
     def npc_skier_setFall(self):
@@ -903,7 +920,7 @@ class ObstacleSprite(pygame.sprite.Sprite):
         self.npc_skier_fallen = False
         self.direction = 0 
         self.image = self.images_movement[0] 
-        self.skier_move_duration = random.randint(40, 150) 
+        self.skier_move_duration = self.rng.randint(40, 150) 
         self.rect = self.image.get_rect(center=self.location)
 
     def update_monster_state(self, skier_rect):
@@ -921,7 +938,83 @@ class ObstacleSprite(pygame.sprite.Sprite):
              self.monster_state = 'in_snow'
              self.animation_frames = self.loaded_monster_frames['in_snow']
              self.animation_speed = 0.2
-             self.npc_vertical_speed_factor = random.uniform(0.8, 1.2)
+             self.npc_vertical_speed_factor = self.rng.uniform(0.8, 1.2)
+
+
+'''Streams the infinite slope in chunks ahead of the camera and recycles the obstacles which scrolled away'''
+class ObstacleStreamer():
+    def __init__(self, game, obstacles, seed=None):
+        self.game = game
+        self.cfg = game.cfg
+        self.obstacles = obstacles
+        self.seed = seed
+        # Released sprites waiting to be reused
+        self.pool = []
+        self.reset()
+
+    def reset(self):
+        """Recycles every obstacle and restarts the slope from the seed."""
+        for obstacle in list(self.obstacles):
+            self.recycle(obstacle)
+        self.rng = random.Random(self.seed)
+        # Screen y of the top of the next chunk to generate, it scrolls up with the obstacles
+        self.frontier = self.cfg.OBSTACLE_CHUNK_HEIGHT
+        # [chunk top, obstacle specs not materialised yet]
+        self.pending = deque()
+        self.schedule()
+        self.spawn(float('inf'))
+
+    def acquire(self, sprite_data, location, name, is_npc_animal=False, is_npc_skier=False, is_monster=False):
+        """Takes a sprite from the pool (or creates one) and adds it to the obstacles."""
+        if self.pool:
+            obstacle = self.pool.pop()
+            obstacle.reset(sprite_data, location, name, is_npc_animal, is_npc_skier, is_monster, rng=self.rng)
+        else:
+            obstacle = ObstacleSprite(sprite_data, location, name, is_npc_animal, is_npc_skier, is_monster, rng=self.rng)
+        self.obstacles.add(obstacle)
+        return obstacle
+
+    def recycle(self, obstacle):
+        """Removes an obstacle from the slope and keeps it for reuse."""
+        self.obstacles.remove(obstacle)
+        self.pool.append(obstacle)
+
+    def schedule(self):
+        """Generates chunks until the lookahead below the screen is covered."""
+        chunk_height = self.cfg.OBSTACLE_CHUNK_HEIGHT
+        screen_width, screen_height = self.cfg.SCREENSIZE
+        while self.frontier < screen_height + chunk_height * self.cfg.OBSTACLE_LOOKAHEAD_CHUNKS:
+            specs = []
+            for _ in range(self.cfg.OBSTACLES_PER_CHUNK):
+                choice = self.game.chooseObstacle(self.rng)
+                if choice is None: continue
+                specs.append((self.rng.randint(50, screen_width - 50), self.rng.randint(0, chunk_height - 1), choice))
+            # Specs are popped from the end, reverse them to materialise in generation order
+            specs.reverse()
+            self.pending.append([self.frontier, specs])
+            self.frontier += chunk_height
+
+    def spawn(self, budget):
+        """Materialises up to budget pending obstacles."""
+        while self.pending and budget > 0:
+            chunk = self.pending[0]
+            if not chunk[1]:
+                self.pending.popleft()
+                continue
+            x_pos, offset_y, (sprite_data, name, flags) = chunk[1].pop()
+            self.acquire(sprite_data, [x_pos, chunk[0] + offset_y], name, **flags)
+            budget -= 1
+
+    def update(self, scroll_speed):
+        """Scrolls the generator with the slope, recycles the obstacles above the screen and streams in new ones."""
+        self.frontier -= scroll_speed
+        for chunk in self.pending:
+            chunk[0] -= scroll_speed
+        for obstacle in list(self.obstacles):
+            if obstacle.rect.bottom < -self.cfg.OBSTACLE_CHUNK_HEIGHT // 2:
+                self.recycle(obstacle)
+        self.schedule()
+        self.spawn(self.cfg.OBSTACLE_SPAWNS_PER_FRAME)
 
 
 '''Ski Game Class'''
@@ -935,20 +1028,22 @@ class SkiGame(PygameBaseGame):
         # Initial screen setup happens before super().__init__ as PygameBaseGame expects screen to be set
         self.screen = pygame.display.set_mode(self.cfg.SCREENSIZE, pygame.RESIZABLE)
         pygame.display.set_caption(self.cfg.TITLE)
+        # Seed of the obstacle streamer, can be overridden with SkiGame(obstacle_seed=...)
+        self.obstacle_seed = self.cfg.OBSTACLE_SEED
 
         super(SkiGame, self).__init__(config=self.cfg, screen=self.screen, **kwargs) # Pass screen to base class
 
         self.snowflakes = [(random.randint(0, self.cfg.SCREENSIZE[0]), random.randint(0, self.cfg.SCREENSIZE[1])) for _ in range(50)]
 
-        self.env_map_image = pygame.image.load(self.cfg.IMAGE_PATHS_DICT['env_map']).convert_alpha()
+        self.env_map_image = self.resource_loader.images['env_map']
         self.env_map_sprites_loaded = self._load_env_map_sprites(self.env_map_image)
 
-        self.skiers_map_image = pygame.image.load(self.cfg.IMAGE_PATHS_DICT['skiers_map']).convert_alpha()
+        self.skiers_map_image = self.resource_loader.images['skiers_map']
         self.skier_animations_all, self.skateboard_fire_effects_loaded, self.dog_skins_loaded = self._load_skiers_data(self.skiers_map_image)
 
         self.selected_skier_id = 'player1'
         
-        raw_background_image = pygame.image.load(self.cfg.IMAGE_PATHS_DICT['background']).convert_alpha()
+        raw_background_image = self.resource_loader.images['background']
         self.tiled_background = self._create_tiled_background(raw_background_image)
 
         self.start_gate_active = True
@@ -1138,11 +1233,15 @@ class SkiGame(PygameBaseGame):
         
         self.display_start_interface(screen) 
         
-        obstacles = pygame.sprite.Group() 
+        # Obstacles are kept in a spatial hash so collision queries only look at nearby cells
+        obstacles = SpatialHashGroup(cell_size=cfg.COLLISION_CELL_SIZE)
+        npc_collidable_attributes = set(cfg.HAZARDS) | set(cfg.STRUCTURES) | set(cfg.RAMPS) | {'start_gate_once'}
+        npc_falling_attributes = set(cfg.HAZARDS) | set(cfg.STRUCTURES)
+        # Generates the slope ahead of the camera and recycles the obstacles left behind
+        self.obstacle_streamer = ObstacleStreamer(self, obstacles, seed=self.obstacle_seed)
         
         distance = 0
         score = 0 
-        obstaclesflag = 0 
         self.reset_game_state(skier, obstacles, True)
 
         while True:
@@ -1156,7 +1255,7 @@ class SkiGame(PygameBaseGame):
                     # Update Config.SCREENSIZE to reflect new dimensions
                     self.cfg.SCREENSIZE = (new_width, new_height)
                     # Re-create tiled background for new size
-                    raw_background_image = pygame.image.load(self.cfg.IMAGE_PATHS_DICT['background']).convert_alpha()
+                    raw_background_image = self.resource_loader.images['background']
                     self.tiled_background = self._create_tiled_background(raw_background_image)
                     # Recalculate positions for UI elements if they are static
                     skier.rect.center = [self.cfg.SCREENSIZE[0] // 2, self.cfg.SCREENSIZE[1] // 2]
@@ -1204,29 +1303,17 @@ class SkiGame(PygameBaseGame):
                 obstacle.update_npc_movement() 
                 if obstacle.is_monster:
                     obstacle.update_monster_state(skier.rect)
+                obstacles.refresh(obstacle)
 
-            if distance >= cfg.SCREENSIZE[1] * 1 and obstaclesflag == 0: 
-                obstaclesflag = 1
-                new_obstacles = self.createObstacles(20, 29, num=40) 
-                obstacles.add(new_obstacles) 
-            if distance >= cfg.SCREENSIZE[1] * 2 and obstaclesflag == 1:
-                obstaclesflag = 0
-                distance -= cfg.SCREENSIZE[1] * 2 
-                for obstacle in list(obstacles): 
-                    if obstacle.rect.top > cfg.SCREENSIZE[1]:
-                        obstacles.remove(obstacle)
-                    else: 
-                        obstacle.location[1] = obstacle.location[1] - cfg.SCREENSIZE[1] * 2 
-                new_obstacles = self.createObstacles(10, 19, num=40) 
-                obstacles.add(new_obstacles)
+            self.obstacle_streamer.update(scroll_speed)
             
-            hitted_obstacles_player = pygame.sprite.spritecollide(skier, obstacles, False)
+            hitted_obstacles_player = obstacles.collide(skier.rect)
             
             player_hazard_hit_in_frame = False
 
             for obstacle in hitted_obstacles_player: 
                 if obstacle.attribute == 'start_gate_once' and self.start_gate_active:
-                    obstacles.remove(obstacle)
+                    self.obstacle_streamer.recycle(obstacle)
                     self.start_gate_active = False 
                     obstacle.passed = True 
                     continue 
@@ -1239,7 +1326,6 @@ class SkiGame(PygameBaseGame):
                     if game_restarted:
                         distance = 0
                         score = 0
-                        obstaclesflag = 0
                         self.start_gate_active = True
                         break
                     else:
@@ -1257,7 +1343,6 @@ class SkiGame(PygameBaseGame):
                             if game_restarted:
                                 distance = 0
                                 score = 0
-                                obstaclesflag = 0 
                                 self.start_gate_active = True
                                 break
                             else:
@@ -1275,7 +1360,7 @@ class SkiGame(PygameBaseGame):
                             skier.gain_power()
                         elif obstacle.attribute in ['defense']:
                             skier.gain_defense()
-                        obstacles.remove(obstacle) 
+                        self.obstacle_streamer.recycle(obstacle) 
                         obstacle.passed = True 
                 elif obstacle.attribute in self.cfg.RAMPS: 
                     if not obstacle.passed and not skier.is_jumping:
@@ -1287,20 +1372,10 @@ class SkiGame(PygameBaseGame):
                 pygame.time.delay(1000)
                 skier.setForward() 
 
-            npc_skiers_group_active = pygame.sprite.Group([o for o in obstacles if o.is_npc_skier and not o.npc_skier_fallen])
-            other_obstacles_for_npc_collision = pygame.sprite.Group([o for o in obstacles if o.attribute in self.cfg.HAZARDS or o.attribute in self.cfg.STRUCTURES or o.attribute in self.cfg.RAMPS or o.attribute == 'start_gate_once']) 
-
-            for npc_skier_obj in npc_skiers_group_active:
-                npc_hitted_obstacles = pygame.sprite.spritecollide(npc_skier_obj, other_obstacles_for_npc_collision, False)
-                if npc_hitted_obstacles:
-                    npc_obstacle_hit = npc_hitted_obstacles[0] 
-                    if npc_obstacle_hit.attribute in self.cfg.HAZARDS or npc_obstacle_hit.attribute in self.cfg.STRUCTURES:
-                        if not npc_skier_obj.npc_skier_fallen: 
-                            npc_skier_obj.npc_skier_setFall() 
-                    elif npc_obstacle_hit.attribute in self.cfg.RAMPS:
-                        pass 
-                    elif npc_obstacle_hit.attribute == 'start_gate_once':
-                        pass 
+            for npc_skier_obj in [o for o in obstacles if o.is_npc_skier and not o.npc_skier_fallen]:
+                npc_hitted_obstacles = obstacles.collide(npc_skier_obj.rect, lambda o: o.attribute in npc_collidable_attributes)
+                if npc_hitted_obstacles and npc_hitted_obstacles[0].attribute in npc_falling_attributes:
+                    npc_skier_obj.npc_skier_setFall()
             
             self.updateFrame(screen, self.tiled_background, obstacles, skier, score, skier.rect) 
             clock.tick(cfg.FPS)
@@ -1315,97 +1390,67 @@ class SkiGame(PygameBaseGame):
         skier.current_power = 0
         skier.current_defense = skier.max_defense
 
-        obstacles.empty()
-        obstacles0 = self.createObstacles(20, 29, num=40)
-        obstacles1 = self.createObstacles(10, 19, num=40)
-        obstacles.add(obstacles0, obstacles1)
+        self.obstacle_streamer.reset()
         
         self.start_gate_active = True
         if 'start_point_gate_bridge' in self.env_map_sprites_loaded:
-            self.start_gate_instance = ObstacleSprite(
+            self.start_gate_instance = self.obstacle_streamer.acquire(
                 self.env_map_sprites_loaded['start_point_gate_bridge'],
                 [self.cfg.SCREENSIZE[0] // 2, self.cfg.SCREENSIZE[1] + 100], 
                 'start_gate_once'
             )
-            obstacles.add(self.start_gate_instance)
         elif not initial_setup:
             print("Warning: 'start_point_gate_bridge' sprite not loaded during reset.")
 
-    def createObstacles(self, s_idx, e_idx, num):
+    def chooseObstacle(self, rng=random):
         """
-        Create obstacles and NPCs based on defined categories.
-        s_idx: start index (used for vertical positioning).
-        e_idx: end index (used for vertical positioning).
-        num: total number of obstacles to create.
+        Pick the next obstacle or NPC of the slope based on the category weights.
+        rng: random generator, the obstacle streamer passes its seeded one.
+        Returns (sprite_data, obstacle_name, flags) or None if nothing can be placed.
         """
-        obstacles_group = pygame.sprite.Group()
-        screen_width, screen_height = self.cfg.SCREENSIZE
-
         all_categories = self.cfg.ALL_OBSTACLE_CATEGORIES
         weights = [self.cfg.OBSTACLE_TYPE_WEIGHTS[cat] for cat in all_categories]
 
-        for _ in range(num):
-            # Choose obstacle type based on weights
-            obstacle_type = random.choices(all_categories, weights=weights, k=1)[0]
-            
-            selected_list = []
-            is_npc_animal = False
-            is_npc_skier = False
-            is_monster = False
-
-            if obstacle_type == 'collectible': selected_list = self.cfg.COLLECTIBLES
-            elif obstacle_type == 'hazard': selected_list = self.cfg.HAZARDS
-            elif obstacle_type == 'structure': selected_list = self.cfg.STRUCTURES
-            elif obstacle_type == 'animal': 
-                selected_list = self.cfg.ANIMALS
-                is_npc_animal = True
-            elif obstacle_type == 'npc_skier': 
-                selected_list = self.cfg.NPC_SKIERS
-                is_npc_skier = True
-            elif obstacle_type == 'monster': 
-                selected_list = self.cfg.MONSTERS
-                is_monster = True
-            elif obstacle_type == 'scenery': selected_list = self.cfg.SCENERY
-            elif obstacle_type == 'ramp': selected_list = self.cfg.RAMPS
-            
-            if not selected_list: # Skip if category has no items
-                continue
-
-            obstacle_name = random.choice(selected_list)
-            
-            if obstacle_name in self.env_map_sprites_loaded:
-                sprite_data = self.env_map_sprites_loaded[obstacle_name]
-            elif obstacle_name in self.skier_animations_all: # For NPC skiers
-                sprite_data = self.skier_animations_all[obstacle_name]
-            elif obstacle_name in self.env_map_sprites_loaded['monster_animated_states'] and is_monster: # For monsters
-                sprite_data = self.env_map_sprites_loaded[obstacle_name]
-            else:
-                # Fallback or error if sprite data is not found
-                print(f"Warning: Sprite data not found for obstacle: {obstacle_name}. Skipping.")
-                continue
-
-            # Determine initial y position
-            # This logic needs refinement for continuous generation.
-            # For now, let's distribute them within a reasonable visible range.
-            start_y = random.randint(s_idx * 100, e_idx * 100) # Simple range for now, assuming 100px per 'unit'
-            
-            # Use random.choice for horizontal distribution
-            # A fixed set of x-coordinates might be useful for lane-like placement,
-            # but for now, random across screen width
-            x_pos = random.randint(50, screen_width - 50) # Avoid edges
-
-            obstacle = ObstacleSprite(
-                sprite_data,
-                [x_pos, start_y],
-                obstacle_name,
-                is_npc_animal=is_npc_animal,
-                is_npc_skier=is_npc_skier,
-                is_monster=is_monster
-            )
-            obstacles_group.add(obstacle)
+        # Choose obstacle type based on weights
+        obstacle_type = rng.choices(all_categories, weights=weights, k=1)[0]
+        
+        selected_list = []
+        is_npc_animal = False
+        is_npc_skier = False
+        is_monster = False
+
+        if obstacle_type == 'collectible': selected_list = self.cfg.COLLECTIBLES
+        elif obstacle_type == 'hazard': selected_list = self.cfg.HAZARDS
+        elif obstacle_type == 'structure': selected_list = self.cfg.STRUCTURES
+        elif obstacle_type == 'animal': 
+            selected_list = self.cfg.ANIMALS
+            is_npc_animal = True
+        elif obstacle_type == 'npc_skier': 
+            selected_list = self.cfg.NPC_SKIERS
+            is_npc_skier = True
+        elif obstacle_type == 'monster': 
+            selected_list = self.cfg.MONSTERS
+            is_monster = True
+        elif obstacle_type == 'scenery': selected_list = self.cfg.SCENERY
+        elif obstacle_type == 'ramp': selected_list = self.cfg.RAMPS
+        
+        if not selected_list: # Skip if category has no items
+            return None
 
-        return obstacles_group
+        obstacle_name = rng.choice(selected_list)
+        
+        if obstacle_name in self.env_map_sprites_loaded:
+            sprite_data = self.env_map_sprites_loaded[obstacle_name]
+        elif obstacle_name in self.skier_animations_all: # For NPC skiers
+            sprite_data = self.skier_animations_all[obstacle_name]
+        elif obstacle_name in self.env_map_sprites_loaded['monster_animated_states'] and is_monster: # For monsters
+            sprite_data = self.env_map_sprites_loaded[obstacle_name]
+        else:
+            # Fallback or error if sprite data is not found
+            print(f"Warning: Sprite data not found for obstacle: {obstacle_name}. Skipping.")
+            return None
 
+        return sprite_data, obstacle_name, {'is_npc_animal': is_npc_animal, 'is_npc_skier': is_npc_skier, 'is_monster': is_monster}
 
     def display_skin_selection_interface_graphical(self, screen):
         tfont_title = self.resource_loader.fonts['small']
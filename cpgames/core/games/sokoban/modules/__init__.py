@@ -1,3 +1,4 @@
 '''initialize'''
 from .sprites import pusherSprite, elementSprite
-from .interfaces import startInterface, endInterface, switchInterface
\ No newline at end of file
+from .interfaces import startInterface, endInterface, switchInterface
+from .solver import sokobanSolver, validateLevels, DIRECTIONS
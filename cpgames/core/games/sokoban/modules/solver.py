@@ -0,0 +1,247 @@
+# solver.py
+import os
+import heapq
+from collections import deque
+
+
+'''Directions as (dcol, drow)'''
+DIRECTIONS = {'up': (0, -1), 'down': (0, 1), 'left': (-1, 0), 'right': (1, 0)}
+
+
+'''Sokoban solver class, searches over box pushes with A* or IDA* and prunes dead squares and 2x2 freeze deadlocks'''
+class sokobanSolver():
+    def __init__(self, num_cols, num_rows, walls, targets):
+        # Cells are flat indices into the map padded with one ring of walls, so no bound checks are needed
+        self.num_cols = num_cols
+        self.num_rows = num_rows
+        self.width = num_cols + 2
+        self.size = self.width * (num_rows + 2)
+        self.offsets = {direction: dcol + drow * self.width for direction, (dcol, drow) in DIRECTIONS.items()}
+        self.walls = set(range(self.size)) - {self.index(col, row) for col in range(num_cols) for row in range(num_rows)}
+        self.walls.update(self.index(col, row) for col, row in walls)
+        self.targets = frozenset(self.index(col, row) for col, row in targets)
+        self.distances = self.computeDistances()
+        self.num_expanded = 0
+        self.limited = False
+
+    '''Build a solver from the lines of a level file, returns (solver, player, boxes)'''
+    @classmethod
+    def fromLines(cls, lines):
+        walls, boxes, targets, player = [], [], [], None
+        for row, elems in enumerate(lines):
+            for col, elem in enumerate(elems.strip()):
+                if elem == 'p': player = (col, row)
+                elif elem == '*': walls.append((col, row))
+                elif elem == '#': boxes.append((col, row))
+                elif elem == 'o': targets.append((col, row))
+        # Same column count as the GameMap of the game, the last line may have no trailing newline
+        solver = cls(max([len(line.rstrip('\n')) for line in lines]), len(lines), walls, targets)
+        return solver, player, boxes
+
+    '''Flat index of a map position'''
+    def index(self, col, row):
+        return (row + 1) * self.width + col + 1
+
+    '''Number of pushes from every cell to each target ignoring the other boxes, and to the nearest one. Cells missing from distances are dead squares'''
+    def computeDistances(self):
+        self.target_list = sorted(self.targets - self.walls)
+        self.target_distances = []
+        for target in self.target_list:
+            target_distances = {target: 0}
+            queue = deque([target])
+            while queue:
+                cell = queue.popleft()
+                for offset in self.offsets.values():
+                    # The box came from cell - offset, pushed by the player standing at cell - 2 * offset
+                    prev_cell = cell - offset
+                    if prev_cell in target_distances or prev_cell in self.walls or prev_cell - offset in self.walls: continue
+                    target_distances[prev_cell] = target_distances[cell] + 1
+                    queue.append(prev_cell)
+            self.target_distances.append(target_distances)
+        distances = dict()
+        for target_distances in self.target_distances:
+            for cell, distance in target_distances.items():
+                if distance < distances.get(cell, distance + 1): distances[cell] = distance
+        self.heuristic_cache = dict()
+        return distances
+
+    '''Lower bound on the number of pushes left: cost of the best assignment of the boxes to distinct targets'''
+    def heuristic(self, boxes):
+        if boxes in self.heuristic_cache: return self.heuristic_cache[boxes]
+        num_targets = len(self.target_list)
+        if num_targets > 12:
+            # Too many targets for the assignment table, fall back to the nearest target of every box
+            bound = sum(self.distances[box] for box in boxes)
+        else:
+            # costs[mask] is the cheapest way to send the boxes seen so far to the set of targets in mask
+            infinity = float('inf')
+            costs = [infinity] * (1 << num_targets)
+            costs[0] = 0
+            for box in boxes:
+                new_costs = [infinity] * (1 << num_targets)
+                for mask, cost in enumerate(costs):
+                    if cost == infinity: continue
+                    for idx, target_distances in enumerate(self.target_distances):
+                        if mask & (1 << idx) or box not in target_distances: continue
+                        new_cost = cost + target_distances[box]
+                        if new_cost < new_costs[mask | (1 << idx)]: new_costs[mask | (1 << idx)] = new_cost
+                costs = new_costs
+            bound = min(costs)
+        self.heuristic_cache[boxes] = bound
+        return bound
+
+    '''Cells the player can walk to without pushing, returns (reachable cells, normalized player cell)'''
+    def reachable(self, player, boxes):
+        visited = {player}
+        queue = deque([player])
+        while queue:
+            cell = queue.popleft()
+            for offset in self.offsets.values():
+                next_cell = cell + offset
+                if next_cell in visited or next_cell in self.walls or next_cell in boxes: continue
+                visited.add(next_cell)
+                queue.append(next_cell)
+        return visited, min(visited)
+
+    '''Whether the box just pushed to cell is frozen in a 2x2 block of walls and boxes off the targets'''
+    def isFrozen(self, cell, boxes):
+        for corner in (cell, cell - 1, cell - self.width, cell - self.width - 1):
+            block = (corner, corner + 1, corner + self.width, corner + self.width + 1)
+            if not all(item in self.walls or item in boxes for item in block): continue
+            if any(item in boxes and item not in self.targets for item in block): return True
+        return False
+
+    '''Successor states, yields (box, direction, new boxes, new player)'''
+    def pushes(self, reachable, boxes):
+        for box in boxes:
+            for direction, offset in self.offsets.items():
+                new_cell = box + offset
+                if box - offset not in reachable or new_cell in self.walls or new_cell in boxes or new_cell not in self.distances: continue
+                new_boxes = boxes - {box} | {new_cell}
+                if self.isFrozen(new_cell, new_boxes): continue
+                yield box, direction, new_boxes, box
+
+    '''Find a solution from the given player position and boxes, returns the moves as a list of directions or None.
+    method is 'astar' (fewest pushes when weight is 1) or 'idastar' (less memory), max_states bounds the number of expanded states.
+    A weight above 1 makes A* greedier, much faster on big levels but the solution may use more pushes than needed'''
+    def solve(self, player, boxes, method='astar', max_states=200000, weight=1):
+        assert method in ['astar', 'idastar']
+        player, boxes = self.index(*player), frozenset(self.index(*box) for box in boxes)
+        self.num_expanded, self.limited = 0, False
+        if self.heuristic(boxes) == float('inf'): return None
+        if method == 'astar':
+            pushes = self.searchAStar(player, boxes, max_states, weight)
+        else:
+            pushes = self.searchIDAStar(player, boxes, max_states)
+        if pushes is None: return None
+        return self.expandPushes(player, boxes, pushes)
+
+    '''A* over the box configurations, the cost is the number of pushes. States are keyed by the boxes and the
+    normalized player cell, which is only computed when a state is expanded so every expansion walks the map once'''
+    def searchAStar(self, player, boxes, max_states, weight=1):
+        parents = dict()
+        # Entries are (f, -pushes, counter, ...), ties on f go to the deeper state first
+        heap = [(weight * self.heuristic(boxes), 0, 0, boxes, player, None, None)]
+        counter = 0
+        while heap:
+            _, negative_cost, _, boxes, player, parent, push = heapq.heappop(heap)
+            cost = -negative_cost
+            reachable, normalized = self.reachable(player, boxes)
+            state = (boxes, normalized)
+            if state in parents: continue
+            parents[state] = (parent, push)
+            if boxes <= self.targets: return self.tracePushes(parents, state)
+            self.num_expanded += 1
+            if self.num_expanded > max_states:
+                self.limited = True
+                return None
+            for box, direction, new_boxes, new_player in self.pushes(reachable, boxes):
+                bound = self.heuristic(new_boxes)
+                if bound == float('inf'): continue
+                counter += 1
+                heapq.heappush(heap, (cost + 1 + weight * bound, -cost - 1, counter, new_boxes, new_player, state, (box, direction)))
+        return None
+
+    '''Push sequence leading to a state found by A*'''
+    def tracePushes(self, parents, state):
+        pushes = []
+        while parents[state][0] is not None:
+            state, push = parents[state]
+            pushes.append(push)
+        pushes.reverse()
+        return pushes
+
+    '''IDA* over the box configurations, with a table of the lowest cost each state was reached at'''
+    def searchIDAStar(self, player, boxes, max_states):
+        threshold = self.heuristic(boxes)
+        while True:
+            best_costs, path = dict(), []
+            result = self.searchBounded(player, boxes, 0, threshold, best_costs, path, max_states)
+            if result is True: return path
+            if result is None or self.limited: return None
+            threshold = result
+
+    '''Depth first search bounded by threshold, returns True if solved, otherwise the smallest f above the threshold (None if none)'''
+    def searchBounded(self, player, boxes, cost, threshold, best_costs, path, max_states):
+        estimate = cost + self.heuristic(boxes)
+        if estimate > threshold: return estimate
+        if boxes <= self.targets: return True
+        reachable, normalized = self.reachable(player, boxes)
+        state = (boxes, normalized)
+        if best_costs.get(state, cost + 1) <= cost: return None
+        best_costs[state] = cost
+        self.num_expanded += 1
+        if self.num_expanded > max_states:
+            self.limited = True
+            return None
+        next_threshold = None
+        for box, direction, new_boxes, new_player in self.pushes(reachable, boxes):
+            path.append((box, direction))
+            result = self.searchBounded(new_player, new_boxes, cost + 1, threshold, best_costs, path, max_states)
+            if result is True: return True
+            path.pop()
+            if self.limited: return None
+            if result is not None and (next_threshold is None or result < next_threshold): next_threshold = result
+        return next_threshold
+
+    '''Turn a push sequence into player moves, walking to each box along a shortest path'''
+    def expandPushes(self, player, boxes, pushes):
+        moves = []
+        names = {offset: direction for direction, offset in self.offsets.items()}
+        for box, direction in pushes:
+            moves.extend(names[offset] for offset in self.walk(player, box - self.offsets[direction], boxes))
+            moves.append(direction)
+            boxes = boxes - {box} | {box + self.offsets[direction]}
+            player = box
+        return moves
+
+    '''Offsets of a shortest walk between two cells avoiding the boxes'''
+    def walk(self, start, goal, boxes):
+        parents = {start: None}
+        queue = deque([start])
+        while queue:
+            cell = queue.popleft()
+            if cell == goal: break
+            for offset in self.offsets.values():
+                next_cell = cell + offset
+                if next_cell in parents or next_cell in self.walls or next_cell in boxes: continue
+                parents[next_cell] = (cell, offset)
+                queue.append(next_cell)
+        offsets = []
+        while parents[goal] is not None:
+            goal, offset = parents[goal]
+            offsets.append(offset)
+        offsets.reverse()
+        return offsets
+
+
+'''Solve every level of a directory, returns {level name: (number of moves of the solution or None, whether the search gave up at max_states)}'''
+def validateLevels(leveldir, method='astar', max_states=200000):
+    results = dict()
+    for level_name in sorted(os.listdir(leveldir)):
+        with open(os.path.join(leveldir, level_name), 'r') as f:
+            lines = f.readlines()
+        solver, player, boxes = sokobanSolver.fromLines(lines)
+        moves = solver.solve(player, boxes, method=method, max_states=max_states)
+        results[level_name] = (None if moves is None else len(moves), solver.limited)
+    return results
@@ -2,9 +2,9 @@
 import os
 import pygame
 from itertools import chain
-from ...utils import QuitGame
+from ...utils import QuitGame, SharedTextCache
 from ..base import PygameBaseGame
-from .modules import pusherSprite, elementSprite, startInterface, endInterface, switchInterface
+from .modules import pusherSprite, elementSprite, startInterface, endInterface, switchInterface, sokobanSolver, DIRECTIONS
 
 
 '''Config class'''
@@ -46,6 +46,8 @@ class Config():
 
 '''GameMap class'''
 class GameMap():
+    # Occupancy bits of a cell
+    WALL, BOX, TARGET = 1, 2, 4
     def __init__(self, num_cols, num_rows, cfg, resource_loader):
         self.cfg = cfg
         self.resource_loader = resource_loader
@@ -54,6 +56,11 @@ class GameMap():
         self.targets = []
         self.num_cols = num_cols
         self.num_rows = num_rows
+        # Occupancy grid [row][col] of WALL/BOX/TARGET bits, and the box sprite of every cell, for O(1) lookups
+        self.cells = [[0] * num_cols for _ in range(num_rows)]
+        self.box_grid = [[None] * num_cols for _ in range(num_rows)]
+        # Number of boxes standing on a target, the level is completed when it reaches the number of boxes
+        self.num_boxes_on_target = 0
         self.game_background = resource_loader.images.get('background_game')
         if self.game_background:
             self.game_background = pygame.transform.scale(self.game_background, (num_cols * cfg.BLOCKSIZE, num_rows * cfg.BLOCKSIZE))
@@ -62,10 +69,33 @@ class GameMap():
     def addElement(self, elem_type, col, row):
         if elem_type == 'wall':
             self.walls.append(elementSprite('wall', col, row, self.cfg, self.resource_loader))
+            self.cells[row][col] |= self.WALL
         elif elem_type == 'box':
-            self.boxes.append(elementSprite('box', col, row, self.cfg, self.resource_loader))
+            box = elementSprite('box', col, row, self.cfg, self.resource_loader)
+            self.boxes.append(box)
+            self.placeBox(box, col, row)
         elif elem_type == 'target':
             self.targets.append(elementSprite('target', col, row, self.cfg, self.resource_loader))
+            self.cells[row][col] |= self.TARGET
+            if self.cells[row][col] & self.BOX: self.num_boxes_on_target += 1
+
+    '''Put a box into the occupancy grid'''
+    def placeBox(self, box, col, row):
+        self.cells[row][col] |= self.BOX
+        self.box_grid[row][col] = box
+        if self.cells[row][col] & self.TARGET: self.num_boxes_on_target += 1
+
+    '''Take a box out of the occupancy grid'''
+    def liftBox(self, box):
+        self.cells[box.row][box.col] &= ~self.BOX
+        self.box_grid[box.row][box.col] = None
+        if self.cells[box.row][box.col] & self.TARGET: self.num_boxes_on_target -= 1
+
+    '''Move a box one cell, keeping the occupancy grid and the target counter up to date'''
+    def moveBox(self, box, direction):
+        self.liftBox(box)
+        box.move(direction)
+        self.placeBox(box, box.col, box.row)
 
     '''Draw game map'''
     def draw(self, screen):
@@ -85,42 +115,26 @@ class GameMap():
 
     '''Check if level is completed'''
     def levelCompleted(self):
-        for box in self.boxes:
-            is_match = False
-            for target in self.targets:
-                if box.col == target.col and box.row == target.row:
-                    is_match = True
-                    break
-            if not is_match:
-                return False
-        return True
+        return self.num_boxes_on_target == len(self.boxes)
 
     '''Check if position is valid'''
     def isValidPos(self, col, row):
         if 0 <= col < self.num_cols and 0 <= row < self.num_rows:
-            block_size = self.cfg.BLOCKSIZE
-            # Create temporary rect for collision detection
-            temp_rect = pygame.Rect(col * block_size, row * block_size, block_size, block_size)
-
-            # Check for collisions with walls
-            for wall in self.walls:
-                if temp_rect.colliderect(wall.rect):
-                    return False
-            # Check for collisions with boxes (except for the one being pushed, handled separately)
-            for box in self.boxes:
-                if temp_rect.colliderect(box.rect):
-                    return False
-            return True
+            # Walls and boxes block the cell (the box being pushed is handled separately)
+            return not self.cells[row][col] & (self.WALL | self.BOX)
         else:
             return False
 
     '''Get box at a given position'''
     def getBox(self, col, row):
-        for box in self.boxes:
-            if box.col == col and box.row == row:
-                return box
+        if 0 <= col < self.num_cols and 0 <= row < self.num_rows:
+            return self.box_grid[row][col]
         return None
 
+    '''Positions of the walls, targets and boxes, as (col, row) lists'''
+    def positions(self, elem_type):
+        return [(elem.col, elem.row) for elem in {'wall': self.walls, 'box': self.boxes, 'target': self.targets}[elem_type]]
+
 
 '''GameInterface class'''
 class GameInterface():
@@ -136,7 +150,7 @@ class GameInterface():
         with open(os.path.join(self.levels_path, game_level), 'r') as f:
             lines = f.readlines()
         # Game map dimensions
-        self.game_map = GameMap(max([len(line) for line in lines]) - 1, len(lines), self.cfg, self.resource_loader)
+        self.game_map = GameMap(max([len(line.rstrip('\n')) for line in lines]), len(lines), self.cfg, self.resource_loader)
         # Game surface
         height = self.cfg.BLOCKSIZE * self.game_map.num_rows
         width = self.cfg.BLOCKSIZE * self.game_map.num_cols
@@ -154,6 +168,68 @@ class GameInterface():
                     self.game_map.addElement('box', col, row)
                 elif elem == 'o':
                     self.game_map.addElement('target', col, row)
+        # Moves as (direction, whether a box was pushed), unlimited undo and redo
+        self.undo_stack = []
+        self.redo_stack = []
+        # Solver of the level, built on the first hint, and the hint of every state along the last solution found
+        self.solver = None
+        self.hints = dict()
+
+    '''Move the player one cell, pushing the box in front if possible. Returns whether the player moved'''
+    def movePlayer(self, direction, record=True):
+        next_player_pos = self.player.move(direction, is_test=True)
+        pushed = False
+        if not self.game_map.isValidPos(*next_player_pos):
+            box = self.game_map.getBox(*next_player_pos)
+            if box is None or not self.game_map.isValidPos(*box.move(direction, is_test=True)): return False
+            self.game_map.moveBox(box, direction)
+            pushed = True
+        self.player.move(direction)
+        if record:
+            self.undo_stack.append((direction, pushed))
+            self.redo_stack = []
+        return True
+
+    '''Take back the last move'''
+    def undo(self):
+        if not self.undo_stack: return False
+        direction, pushed = self.undo_stack.pop()
+        opposite = {'up': 'down', 'down': 'up', 'left': 'right', 'right': 'left'}[direction]
+        box = self.game_map.getBox(*self.player.move(direction, is_test=True)) if pushed else None
+        self.player.move(opposite)
+        if box is not None: self.game_map.moveBox(box, opposite)
+        self.redo_stack.append((direction, pushed))
+        return True
+
+    '''Replay the last move taken back'''
+    def redo(self):
+        if not self.redo_stack: return False
+        direction, pushed = self.redo_stack.pop()
+        self.movePlayer(direction, record=False)
+        self.undo_stack.append((direction, pushed))
+        return True
+
+    '''Current state as (player position, box positions)'''
+    def state(self):
+        return (self.player.col, self.player.row), frozenset(self.game_map.positions('box'))
+
+    '''Next move towards a solution from the current state, or None if the level cannot be solved from here'''
+    def hint(self):
+        state = self.state()
+        if state not in self.hints:
+            if self.solver is None:
+                self.solver = sokobanSolver(self.game_map.num_cols, self.game_map.num_rows, self.game_map.positions('wall'), self.game_map.positions('target'))
+            moves = self.solver.solve(*state)
+            if not moves: return None
+            # Remember the hint of every state along the solution, following the hints needs no new search
+            (col, row), boxes = state
+            self.hints = dict()
+            for direction in moves:
+                self.hints[((col, row), boxes)] = direction
+                dcol, drow = DIRECTIONS[direction]
+                col, row = col + dcol, row + drow
+                if (col, row) in boxes: boxes = boxes - {(col, row)} | {(col + dcol, row + drow)}
+        return self.hints[state]
 
     '''Game initialization'''
     def initGame(self):
@@ -236,8 +312,10 @@ class SokobanGame(PygameBaseGame):
         clock = pygame.time.Clock()
         game_interface = GameInterface(screen, self.cfg, self.resource_loader)
         game_interface.loadLevel(game_level)
-        text = 'Press R to restart | Level: ' + game_level.split('.')[0] # Display current level
+        text = 'Press R to restart | Z/Y to undo/redo | H for a hint | Level: ' + game_level.split('.')[0] # Display current level
+        hint_text = ''
         font = self.resource_loader.fonts['default_15']
+        key_directions = {pygame.K_LEFT: 'left', pygame.K_RIGHT: 'right', pygame.K_DOWN: 'down', pygame.K_UP: 'up'}
         
         while True:
             screen.fill(self.cfg.BACKGROUNDCOLOR) # Clear screen for general UI elements
@@ -246,74 +324,26 @@ class SokobanGame(PygameBaseGame):
                 if event.type == pygame.QUIT:
                     QuitGame()
                 elif event.type == pygame.KEYDOWN:
-                    player_moved = False
-                    if event.key == pygame.K_LEFT:
-                        next_player_pos = game_interface.player.move('left', is_test=True)
-                        if game_interface.game_map.isValidPos(*next_player_pos):
-                            game_interface.player.move('left')
-                            player_moved = True
-                        else:
-                            box = game_interface.game_map.getBox(*next_player_pos)
-                            if box:
-                                next_box_pos = box.move('left', is_test=True)
-                                if game_interface.game_map.isValidPos(*next_box_pos):
-                                    game_interface.player.move('left')
-                                    box.move('left')
-                                    player_moved = True
-                    elif event.key == pygame.K_RIGHT:
-                        next_player_pos = game_interface.player.move('right', is_test=True)
-                        if game_interface.game_map.isValidPos(*next_player_pos):
-                            game_interface.player.move('right')
-                            player_moved = True
-                        else:
-                            box = game_interface.game_map.getBox(*next_player_pos)
-                            if box:
-                                next_box_pos = box.move('right', is_test=True)
-                                if game_interface.game_map.isValidPos(*next_box_pos):
-                                    game_interface.player.move('right')
-                                    box.move('right')
-                                    player_moved = True
-                    elif event.key == pygame.K_DOWN:
-                        next_player_pos = game_interface.player.move('down', is_test=True)
-                        if game_interface.game_map.isValidPos(*next_player_pos):
-                            game_interface.player.move('down')
-                            player_moved = True
-                        else:
-                            box = game_interface.game_map.getBox(*next_player_pos)
-                            if box:
-                                next_box_pos = box.move('down', is_test=True)
-                                if game_interface.game_map.isValidPos(*next_box_pos):
-                                    game_interface.player.move('down')
-                                    box.move('down')
-                                    player_moved = True
-                    elif event.key == pygame.K_UP:
-                        next_player_pos = game_interface.player.move('up', is_test=True)
-                        if game_interface.game_map.isValidPos(*next_player_pos):
-                            game_interface.player.move('up')
-                            player_moved = True
-                        else:
-                            box = game_interface.game_map.getBox(*next_player_pos)
-                            if box:
-                                next_box_pos = box.move('up', is_test=True)
-                                if game_interface.game_map.isValidPos(*next_box_pos):
-                                    game_interface.player.move('up')
-                                    box.move('up')
-                                    player_moved = True
+                    if event.key in key_directions:
+                        if game_interface.movePlayer(key_directions[event.key]): hint_text = ''
+                    elif event.key == pygame.K_z:
+                        if game_interface.undo(): hint_text = ''
+                    elif event.key == pygame.K_y:
+                        if game_interface.redo(): hint_text = ''
+                    elif event.key == pygame.K_h:
+                        direction = game_interface.hint()
+                        hint_text = ' | Hint: ' + (direction if direction else 'no solution from here, press Z or R')
                     elif event.key == pygame.K_r:
                         game_interface.initGame()
                         game_interface.loadLevel(game_level)
-                    
-                    # Add a slight delay after player moves for smoother animation (if not already handled by clock.tick)
-                    # if player_moved:
-                    #     pygame.time.wait(50) # Small delay to see movement more clearly
+                        hint_text = ''
 
             game_interface.draw(game_interface.player, game_interface.game_map) # Pass player and map for drawing
 
             if game_interface.game_map.levelCompleted():
                 return
 
-            text_render = font.render(text, 1, (255, 255, 255))
-            screen.blit(text_render, (10, 10)) # Position the text at top-left corner
+            SharedTextCache.blit(screen, font, text + hint_text, (255, 255, 255), (10, 10)) # Position the text at top-left corner
 
             pygame.display.flip()
-            clock.tick(self.cfg.FPS_GAMING)
\ No newline at end of file
+            clock.tick(self.cfg.FPS_GAMING)
@@ -2,7 +2,7 @@
 import pygame
 import random
 from .sprites import *
-from ....utils import QuitGame
+from ....utils import QuitGame, SharedTextCache
 
 
 '''用于运行某一游戏关卡'''
@@ -275,92 +275,24 @@ class GameLevel():
     '''显示游戏面板'''
     def __showGamePanel(self, screen, tank_player1, tank_player2=None):
         color_white = (255, 255, 255)
-        # 玩家一操作提示
-        player1_operate_tip = self.font.render('Operate-P1:', True, color_white)
-        player1_operate_tip_rect = player1_operate_tip.get_rect()
-        player1_operate_tip_rect.left, player1_operate_tip_rect.top = self.width+5, self.height/30
-        screen.blit(player1_operate_tip, player1_operate_tip_rect)
-        player1_operate_tip = self.font.render('K_w: Up', True, color_white)
-        player1_operate_tip_rect = player1_operate_tip.get_rect()
-        player1_operate_tip_rect.left, player1_operate_tip_rect.top = self.width+5, self.height*2/30
-        screen.blit(player1_operate_tip, player1_operate_tip_rect)
-        player1_operate_tip = self.font.render('K_s: Down', True, color_white)
-        player1_operate_tip_rect = player1_operate_tip.get_rect()
-        player1_operate_tip_rect.left, player1_operate_tip_rect.top = self.width+5, self.height*3/30
-        screen.blit(player1_operate_tip, player1_operate_tip_rect)
-        player1_operate_tip = self.font.render('K_a: Left', True, color_white)
-        player1_operate_tip_rect = player1_operate_tip.get_rect()
-        player1_operate_tip_rect.left, player1_operate_tip_rect.top = self.width+5, self.height*4/30
-        screen.blit(player1_operate_tip, player1_operate_tip_rect)
-        player1_operate_tip = self.font.render('K_d: Right', True, color_white)
-        player1_operate_tip_rect = player1_operate_tip.get_rect()
-        player1_operate_tip_rect.left, player1_operate_tip_rect.top = self.width+5, self.height*5/30
-        screen.blit(player1_operate_tip, player1_operate_tip_rect)
-        player1_operate_tip = self.font.render('K_SPACE: Shoot', True, color_white)
-        player1_operate_tip_rect = player1_operate_tip.get_rect()
-        player1_operate_tip_rect.left, player1_operate_tip_rect.top = self.width+5, self.height*6/30
-        screen.blit(player1_operate_tip, player1_operate_tip_rect)
-        # 玩家二操作提示
-        player2_operate_tip = self.font.render('Operate-P2:', True, color_white)
-        player2_operate_tip_rect = player2_operate_tip.get_rect()
-        player2_operate_tip_rect.left, player2_operate_tip_rect.top = self.width+5, self.height*8/30
-        screen.blit(player2_operate_tip, player2_operate_tip_rect)
-        player2_operate_tip = self.font.render('K_UP: Up', True, color_white)
-        player2_operate_tip_rect = player2_operate_tip.get_rect()
-        player2_operate_tip_rect.left, player2_operate_tip_rect.top = self.width+5, self.height*9/30
-        screen.blit(player2_operate_tip, player2_operate_tip_rect)
-        player2_operate_tip = self.font.render('K_DOWN: Down', True, color_white)
-        player2_operate_tip_rect = player2_operate_tip.get_rect()
-        player2_operate_tip_rect.left, player2_operate_tip_rect.top = self.width+5, self.height*10/30
-        screen.blit(player2_operate_tip, player2_operate_tip_rect)
-        player2_operate_tip = self.font.render('K_LEFT: Left', True, color_white)
-        player2_operate_tip_rect = player2_operate_tip.get_rect()
-        player2_operate_tip_rect.left, player2_operate_tip_rect.top = self.width+5, self.height*11/30
-        screen.blit(player2_operate_tip, player2_operate_tip_rect)
-        player2_operate_tip = self.font.render('K_RIGHT: Right', True, color_white)
-        player2_operate_tip_rect = player2_operate_tip.get_rect()
-        player2_operate_tip_rect.left, player2_operate_tip_rect.top = self.width+5, self.height*12/30
-        screen.blit(player2_operate_tip, player2_operate_tip_rect)
-        player2_operate_tip = self.font.render('K_KP0: Shoot', True, color_white)
-        player2_operate_tip_rect = player2_operate_tip.get_rect()
-        player2_operate_tip_rect.left, player2_operate_tip_rect.top = self.width+5, self.height*13/30
-        screen.blit(player2_operate_tip, player2_operate_tip_rect)
-        # 玩家一状态提示
-        player1_state_tip = self.font.render('State-P1:', True, color_white)
-        player1_state_tip_rect = player1_state_tip.get_rect()
-        player1_state_tip_rect.left, player1_state_tip_rect.top = self.width+5, self.height*15/30
-        screen.blit(player1_state_tip, player1_state_tip_rect)
-        player1_state_tip = self.font.render('Life: %s' % tank_player1.num_lifes, True, color_white)
-        player1_state_tip_rect = player1_state_tip.get_rect()
-        player1_state_tip_rect.left, player1_state_tip_rect.top = self.width+5, self.height*16/30
-        screen.blit(player1_state_tip, player1_state_tip_rect)
-        player1_state_tip = self.font.render('TLevel: %s' % tank_player1.tanklevel, True, color_white)
-        player1_state_tip_rect = player1_state_tip.get_rect()
-        player1_state_tip_rect.left, player1_state_tip_rect.top = self.width+5, self.height*17/30
-        screen.blit(player1_state_tip, player1_state_tip_rect)
-        # 玩家二状态提示
-        player2_state_tip = self.font.render('State-P2:', True, color_white)
-        player2_state_tip_rect = player2_state_tip.get_rect()
-        player2_state_tip_rect.left, player2_state_tip_rect.top = self.width+5, self.height*19/30
-        screen.blit(player2_state_tip, player2_state_tip_rect)
-        player2_state_tip = self.font.render('Life: %s' % tank_player2.num_lifes, True, color_white) if tank_player2 else self.font.render('Life: None', True, color_white)
-        player2_state_tip_rect = player2_state_tip.get_rect()
-        player2_state_tip_rect.left, player2_state_tip_rect.top = self.width+5, self.height*20/30
-        screen.blit(player2_state_tip, player2_state_tip_rect)
-        player2_state_tip = self.font.render('TLevel: %s' % tank_player2.tanklevel, True, color_white) if tank_player2 else self.font.render('TLevel: None', True, color_white)
-        player2_state_tip_rect = player2_state_tip.get_rect()
-        player2_state_tip_rect.left, player2_state_tip_rect.top = self.width+5, self.height*21/30
-        screen.blit(player2_state_tip, player2_state_tip_rect)
-        # 当前关卡
-        game_level_tip = self.font.render('Game Level: %s' % self.gamelevel, True, color_white)
-        game_level_tip_rect = game_level_tip.get_rect()
-        game_level_tip_rect.left, game_level_tip_rect.top = self.width+5, self.height*23/30
-        screen.blit(game_level_tip, game_level_tip_rect)
-        # 剩余敌人数量
-        remaining_enemy_tip = self.font.render('Remain Enemy: %s' % self.total_enemy_num, True, color_white)
-        remaining_enemy_tip_rect = remaining_enemy_tip.get_rect()
-        remaining_enemy_tip_rect.left, remaining_enemy_tip_rect.top = self.width+5, self.height*24/30
-        screen.blit(remaining_enemy_tip, remaining_enemy_tip_rect)
+        # (行, 文字), 第k行在height*k/30处
+        tips = [
+            # 玩家一操作提示
+            (1, 'Operate-P1:'), (2, 'K_w: Up'), (3, 'K_s: Down'), (4, 'K_a: Left'), (5, 'K_d: Right'), (6, 'K_SPACE: Shoot'),
+            # 玩家二操作提示
+            (8, 'Operate-P2:'), (9, 'K_UP: Up'), (10, 'K_DOWN: Down'), (11, 'K_LEFT: Left'), (12, 'K_RIGHT: Right'), (13, 'K_KP0: Shoot'),
+            # 玩家一状态提示
+            (15, 'State-P1:'), (16, 'Life: %s' % tank_player1.num_lifes), (17, 'TLevel: %s' % tank_player1.tanklevel),
+            # 玩家二状态提示
+            (19, 'State-P2:'), (20, 'Life: %s' % tank_player2.num_lifes if tank_player2 else 'Life: None'), (21, 'TLevel: %s' % tank_player2.tanklevel if tank_player2 else 'TLevel: None'),
+            # 当前关卡
+            (23, 'Game Level: %s' % self.gamelevel),
+            # 剩余敌人数量
+            (24, 'Remain Enemy: %s' % self.total_enemy_num),
+        ]
+        # 面板上的文字几乎每帧都一样, 直接用缓存里渲染好的
+        for row, tip in tips:
+            SharedTextCache.blit(screen, self.font, tip, color_white, (self.width+5, self.height*row/30))
     '''保护大本营'''
     def __pretectHome(self):
         for x, y in self.home_around_positions:
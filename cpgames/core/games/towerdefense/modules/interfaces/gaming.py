@@ -5,9 +5,9 @@ import random
 import pygame
 from ..sprites import Enemy
 from ..sprites import Turret
-from .....utils import QuitGame
+from .....utils import QuitGame, SpatialHashGroup, SharedTextCache
 from .pause import PauseInterface
-from collections import namedtuple
+from collections import namedtuple, deque
 
 
 '''游戏进行中界面'''
@@ -67,15 +67,19 @@ class GamingInterface():
             6: self.cave
         }
         # 用于记录地图中的道路
-        self.path_list = []
+        self.path_set = set()
+        # 流场: 道路单元 -> 通往大本营的下一个道路单元(终点为None), 每张地图只算一次
+        self.flow_field = dict()
         # 当前的地图，将地图导入到这里面
         self.current_map = dict()
+        # 已经导入的地图文件
+        self.map_path = None
         # 当前鼠标携带的图标(即选中道具) -> [道具名, 道具]
         self.mouse_carried = []
         # 在地图上建造好了的炮塔
         self.built_turret_group = pygame.sprite.Group()
-        # 所有的敌人
-        self.enemies_group = pygame.sprite.Group()
+        # 所有的敌人, 按位置分桶以便做范围查询
+        self.enemies_group = SpatialHashGroup(cell_size=self.element_size * 2)
         # 所有射出的箭
         self.arrows_group = pygame.sprite.Group()
         # 玩家操作用的按钮
@@ -96,27 +100,32 @@ class GamingInterface():
         self.money = difficulty_dict.get('money')
         self.health = difficulty_dict.get('health')
         self.max_health = difficulty_dict.get('health')
-        difficulty_dict = difficulty_dict.get('enemy')
-        # 每60s生成一波敌人
-        generate_enemies_event = pygame.constants.USEREVENT + 0
-        pygame.time.set_timer(generate_enemies_event, 60000)
+        self.difficulty_dict = difficulty_dict.get('enemy')
+        # 模拟以固定步长运行, 敌人速度/炮塔冷却/箭速都按模拟帧计算, 与渲染帧率无关
+        self.sim_dt = 1.0 / self.cfg.SIM_HZ
+        self.sim_ticks = 0
+        # 每WAVE_INTERVAL秒生成一波敌人, 每ENEMY_SPAWN_INTERVAL秒出一个敌人(按模拟时间计)
+        self.wave_ticks = int(round(self.cfg.WAVE_INTERVAL * self.cfg.SIM_HZ))
+        self.spawn_ticks = int(round(self.cfg.ENEMY_SPAWN_INTERVAL * self.cfg.SIM_HZ))
         # 生成敌人的flag和当前已生成敌人的总次数
-        generate_enemies_flag = False
-        num_generate_enemies = 0
-        # 每0.5秒出一个敌人
-        generate_enemy_event = pygame.constants.USEREVENT + 1
-        pygame.time.set_timer(generate_enemy_event, 500)
-        generate_enemy_flag = False
+        self.generate_enemies_flag = False
+        self.num_generate_enemies = 0
+        self.generate_enemy_flag = False
         # 防止变量未定义
-        enemy_range = None
-        num_enemy = None
+        self.enemy_range = None
+        self.num_enemy = None
         # 是否手动操作箭塔射击
-        manual_shot = False
-        has_control = False
+        self.manual_shot = False
+        # 快进倍数, 每次渲染运行多个模拟帧
+        self.speed_idx = 0
+        # 暂停等阻塞操作之后丢弃这段时间, 避免恢复时一下子补很多模拟帧
+        self.skip_frame_time = False
+        # 导入地图
+        self.loadMap(map_path)
         # 游戏主循环
+        clock = pygame.time.Clock()
+        accumulator = 0.0
         while True:
-            if self.health <= 0:
-                return
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
                     QuitGame()
@@ -152,106 +161,139 @@ class GamingInterface():
                         self.mouse_carried = []
                     # --按中间键手动控制炮塔射箭方向一次，否则自由射箭
                     if event.button == 2:
-                        manual_shot = True
-                if event.type == generate_enemies_event:
-                    generate_enemies_flag = True
-                if event.type == generate_enemy_event:
-                    generate_enemy_flag = True
-            # --生成敌人, 生成的敌人随当前已生成敌人的总次数的增加而变强变多
-            if generate_enemies_flag:
-                generate_enemies_flag = False
-                num_generate_enemies += 1
-                idx = 0
-                for key, value in difficulty_dict.items():
-                    idx += 1
-                    if idx == len(difficulty_dict.keys()):
-                        enemy_range = value['enemy_range']
-                        num_enemy = value['num_enemy']
-                        break
-                    if num_generate_enemies <= int(key):
-                        enemy_range = value['enemy_range']
-                        num_enemy = value['num_enemy']
-                        break
-            if generate_enemy_flag and num_enemy:
-                generate_enemy_flag = False
-                num_enemy -= 1
-                enemy = Enemy(random.choice(range(enemy_range)), self.cfg, self.resource_loader)
-                self.enemies_group.add(enemy)
-            # --射箭
-            for turret in self.built_turret_group:
-                if not manual_shot:
-                    position = turret.position[0] + self.element_size // 2, turret.position[1]
-                    arrow = turret.shot(position)
-                else:
-                    position = turret.position[0] + self.element_size // 2, turret.position[1]
-                    mouse_pos = pygame.mouse.get_pos()
-                    angle = math.atan((mouse_pos[1] - position[1]) / (mouse_pos[0] - position[0] + 1e-6))
-                    arrow = turret.shot(position, angle)
-                    has_control = True
-                if arrow:
-                    self.arrows_group.add(arrow)
-                else:
-                    has_control = False
-            if has_control:
-                has_control = False
-                manual_shot = False
-            # --移动箭和碰撞检测
-            for arrow in self.arrows_group:
-                arrow.move()
-                points = [(arrow.rect.left, arrow.rect.top), (arrow.rect.left, arrow.rect.bottom), (arrow.rect.right, arrow.rect.top), (arrow.rect.right, arrow.rect.bottom)]
-                if (not self.map_rect.collidepoint(points[0])) and (not self.map_rect.collidepoint(points[1])) and \
-                   (not self.map_rect.collidepoint(points[2])) and (not self.map_rect.collidepoint(points[3])):
-                    self.arrows_group.remove(arrow)
-                    del arrow
+                        self.manual_shot = True
+                # --按F键切换快进倍数(x1/x2/x4)
+                if event.type == pygame.KEYDOWN and event.key == pygame.K_f:
+                    self.speed_idx = (self.speed_idx + 1) % len(self.cfg.FAST_FORWARD_MULTIPLIERS)
+            # --按经过的真实时间推进模拟, 单帧最多补0.25秒, 防止机器太慢时越补越多
+            frame_time = min(clock.tick(self.cfg.FPS) / 1000.0, 0.25)
+            if self.skip_frame_time:
+                self.skip_frame_time = False
+                frame_time = 0
+            accumulator += frame_time * self.cfg.FAST_FORWARD_MULTIPLIERS[self.speed_idx]
+            while accumulator >= self.sim_dt:
+                accumulator -= self.sim_dt
+                self.step()
+                if self.health <= 0:
+                    return
+            # --渲染时在上一模拟帧和当前模拟帧之间插值
+            self.draw(screen, accumulator / self.sim_dt)
+    '''推进一个模拟帧'''
+    def step(self):
+        self.sim_ticks += 1
+        if self.sim_ticks % self.wave_ticks == 0:
+            self.generate_enemies_flag = True
+        if self.sim_ticks % self.spawn_ticks == 0:
+            self.generate_enemy_flag = True
+        # --生成敌人, 生成的敌人随当前已生成敌人的总次数的增加而变强变多
+        if self.generate_enemies_flag:
+            self.generate_enemies_flag = False
+            self.num_generate_enemies += 1
+            idx = 0
+            for key, value in self.difficulty_dict.items():
+                idx += 1
+                if idx == len(self.difficulty_dict.keys()):
+                    self.enemy_range = value['enemy_range']
+                    self.num_enemy = value['num_enemy']
+                    break
+                if self.num_generate_enemies <= int(key):
+                    self.enemy_range = value['enemy_range']
+                    self.num_enemy = value['num_enemy']
+                    break
+        if self.generate_enemy_flag and self.num_enemy:
+            self.generate_enemy_flag = False
+            self.num_enemy -= 1
+            enemy = Enemy(random.choice(range(self.enemy_range)), self.cfg, self.resource_loader)
+            self.enemies_group.add(enemy)
+        # --射箭
+        has_control = False
+        for turret in self.built_turret_group:
+            if not self.manual_shot:
+                position = turret.position[0] + self.element_size // 2, turret.position[1]
+                # 瞄准射程内最近的敌人, 射程内没有敌人时不射箭(只走冷却)
+                target = self.findTarget(position, turret.range)
+                if target is None and not turret.is_cooling:
                     continue
-                for enemy in self.enemies_group:
-                    if pygame.sprite.collide_rect(arrow, enemy):
-                        enemy.life_value -= arrow.attack_power
-                        self.arrows_group.remove(arrow)
-                        del arrow
-                        break
-            self.draw(screen, map_path)
-    '''将场景画到游戏界面上'''
-    def draw(self, screen, map_path):
-        self.drawToolbar(screen)
-        self.loadMap(screen, map_path)
-        self.drawMouseCarried(screen)
-        self.drawBuiltTurret(screen)
-        self.drawEnemies(screen)
-        self.drawArrows(screen)
-        pygame.display.flip()
-    '''画出所有射出的箭'''
-    def drawArrows(self, screen):
+                angle = None if target is None else math.atan2(position[1] - target.rect.centery, position[0] - target.rect.centerx)
+                arrow = turret.shot(position, angle)
+            else:
+                position = turret.position[0] + self.element_size // 2, turret.position[1]
+                mouse_pos = pygame.mouse.get_pos()
+                angle = math.atan((mouse_pos[1] - position[1]) / (mouse_pos[0] - position[0] + 1e-6))
+                arrow = turret.shot(position, angle)
+                has_control = True
+            if arrow:
+                self.arrows_group.add(arrow)
+            else:
+                has_control = False
+        if has_control:
+            self.manual_shot = False
+        # --移动箭和碰撞检测
         for arrow in self.arrows_group:
-            screen.blit(arrow.image, arrow.rect)
-    '''画敌人'''
-    def drawEnemies(self, screen):
+            arrow.move()
+            points = [(arrow.rect.left, arrow.rect.top), (arrow.rect.left, arrow.rect.bottom), (arrow.rect.right, arrow.rect.top), (arrow.rect.right, arrow.rect.bottom)]
+            if (not self.map_rect.collidepoint(points[0])) and (not self.map_rect.collidepoint(points[1])) and \
+               (not self.map_rect.collidepoint(points[2])) and (not self.map_rect.collidepoint(points[3])):
+                self.arrows_group.remove(arrow)
+                del arrow
+                continue
+            # 只检查箭附近格子里的敌人
+            for enemy in self.enemies_group.collide(arrow.rect):
+                enemy.life_value -= arrow.attack_power
+                self.arrows_group.remove(arrow)
+                del arrow
+                break
+        # --移动敌人
+        self.updateEnemies()
+    '''更新敌人: 结算死亡的敌人, 移动活着的敌人, 到达大本营的敌人扣血'''
+    def updateEnemies(self):
         for enemy in self.enemies_group:
             if enemy.life_value <= 0:
                 self.money += enemy.reward
                 self.enemies_group.remove(enemy)
                 del enemy
                 continue
+            enemy.prev_position = enemy.position
             res = enemy.move(self.element_size)
             if res:
                 coord = self.find_next_path(enemy)
                 if coord:
-                    enemy.reached_path.append(enemy.coord)
                     enemy.coord = coord
                     enemy.position = self.coord2pos(coord)
                     enemy.rect.left, enemy.rect.top = enemy.position
+                    self.enemies_group.refresh(enemy)
                 else:
                     self.health -= enemy.damage
                     self.enemies_group.remove(enemy)
                     del enemy
-                    continue
+    '''插值后的绘制位置, alpha为当前时刻在上一模拟帧和当前模拟帧之间的比例'''
+    def interpolate(self, sprite, alpha):
+        (x0, y0), (x1, y1) = sprite.prev_position, sprite.position
+        return x0 + (x1 - x0) * alpha, y0 + (y1 - y0) * alpha
+    '''将场景画到游戏界面上'''
+    def draw(self, screen, alpha=1.0):
+        self.drawToolbar(screen)
+        self.drawMap(screen)
+        self.drawMouseCarried(screen)
+        self.drawBuiltTurret(screen)
+        self.drawEnemies(screen, alpha)
+        self.drawArrows(screen, alpha)
+        pygame.display.flip()
+    '''画出所有射出的箭'''
+    def drawArrows(self, screen, alpha=1.0):
+        for arrow in self.arrows_group:
+            screen.blit(arrow.image, self.interpolate(arrow, alpha))
+    '''画敌人'''
+    def drawEnemies(self, screen, alpha=1.0):
+        for enemy in self.enemies_group:
+            position = self.interpolate(enemy, alpha)
             # 画血条
             green_len = max(0, enemy.life_value / enemy.max_life_value) * self.element_size
             if green_len > 0:
-                pygame.draw.line(screen, (0, 255, 0), (enemy.position), (enemy.position[0] + green_len, enemy.position[1]), 1)
+                pygame.draw.line(screen, (0, 255, 0), (position), (position[0] + green_len, position[1]), 1)
             if green_len < self.element_size:
-                pygame.draw.line(screen, (255, 0, 0), (enemy.position[0] + green_len, enemy.position[1]), (enemy.position[0] + self.element_size, enemy.position[1]), 1)
-            screen.blit(enemy.image, enemy.rect)
+                pygame.draw.line(screen, (255, 0, 0), (position[0] + green_len, position[1]), (position[0] + self.element_size, position[1]), 1)
+            screen.blit(enemy.image, position)
     '''画已经建造好的炮塔'''
     def drawBuiltTurret(self, screen):
         for turret in self.built_turret_group:
@@ -277,15 +319,17 @@ class GamingInterface():
         info_color = (120, 20, 50)
         # --左
         pygame.draw.rect(screen, info_color, self.leftinfo_rect)
-        left_title = self.info_font.render('Player info:', True, (255, 255, 255))
-        money_info = self.info_font.render('Money: ' + str(self.money), True, (255, 255, 255))
-        health_info = self.info_font.render('Health: ' + str(self.health), True, (255, 255, 255))
+        left_title = SharedTextCache.render(self.info_font, 'Player info:', (255, 255, 255))
+        money_info = SharedTextCache.render(self.info_font, 'Money: ' + str(self.money), (255, 255, 255))
+        health_info = SharedTextCache.render(self.info_font, 'Health: ' + str(self.health), (255, 255, 255))
         screen.blit(left_title, (self.leftinfo_rect.left + 5, self.leftinfo_rect.top + 5))
         screen.blit(money_info, (self.leftinfo_rect.left + 5, self.leftinfo_rect.top + 35))
         screen.blit(health_info, (self.leftinfo_rect.left + 5, self.leftinfo_rect.top + 55))
+        speed_info = SharedTextCache.render(self.info_font, 'Speed: x%d (F)' % self.cfg.FAST_FORWARD_MULTIPLIERS[self.speed_idx], (255, 255, 255))
+        screen.blit(speed_info, (self.leftinfo_rect.left + 5, self.leftinfo_rect.top + 75))
         # --右
         pygame.draw.rect(screen, info_color, self.rightinfo_rect)
-        right_title = self.info_font.render('Selected info:', True, (255, 255, 255))
+        right_title = SharedTextCache.render(self.info_font, 'Selected info:', (255, 255, 255))
         screen.blit(right_title, (self.rightinfo_rect.left + 5, self.rightinfo_rect.top + 5))
         # 中间部分
         pygame.draw.rect(screen, (127, 127, 127), self.toolbar_rect)
@@ -297,7 +341,7 @@ class GamingInterface():
             else:
                 button_color = (0, 100, 0)
             pygame.draw.rect(screen, button_color, button.rect)
-            button_text = self.button_font.render(button.text, True, (255, 255, 255))
+            button_text = SharedTextCache.render(self.button_font, button.text, (255, 255, 255))
             button_text_rect = button_text.get_rect()
             button_text_rect.center = (button.rect.centerx, button.rect.centery)
             screen.blit(button_text, button_text_rect)
@@ -305,20 +349,20 @@ class GamingInterface():
     def showSelectedInfo(self, screen, button):
         if button.text in ['T1', 'T2', 'T3']:
             turret = Turret({'T1': 0, 'T2': 1, 'T3': 2}[button.text], self.cfg, self.resource_loader)
-            selected_info1 = self.info_font.render('Cost: ' + str(turret.price), True, (255, 255, 255))
-            selected_info2 = self.info_font.render('Damage: ' + str(turret.arrow.attack_power), True, (255, 255, 255))
-            selected_info3 = self.info_font.render('Affordable: ' + str(self.money >= turret.price), True, (255, 255, 255))
+            selected_info1 = SharedTextCache.render(self.info_font, 'Cost: ' + str(turret.price), (255, 255, 255))
+            selected_info2 = SharedTextCache.render(self.info_font, 'Damage: ' + str(turret.arrow.attack_power), (255, 255, 255))
+            selected_info3 = SharedTextCache.render(self.info_font, 'Affordable: ' + str(self.money >= turret.price), (255, 255, 255))
             screen.blit(selected_info1, (self.rightinfo_rect.left + 5, self.rightinfo_rect.top + 35))
             screen.blit(selected_info2, (self.rightinfo_rect.left + 5, self.rightinfo_rect.top + 55))
             screen.blit(selected_info3, (self.rightinfo_rect.left + 5, self.rightinfo_rect.top + 75))
         elif button.text == 'XXX':
-            selected_info = self.info_font.render('Sell a turret', True, (255, 255, 255))
+            selected_info = SharedTextCache.render(self.info_font, 'Sell a turret', (255, 255, 255))
             screen.blit(selected_info, (self.rightinfo_rect.left + 5, self.rightinfo_rect.top + 35))
         elif button.text == 'Pause':
-            selected_info = self.info_font.render('Pause game', True, (255, 255, 255))
+            selected_info = SharedTextCache.render(self.info_font, 'Pause game', (255, 255, 255))
             screen.blit(selected_info, (self.rightinfo_rect.left + 5, self.rightinfo_rect.top + 35))
         elif button.text == 'Quit':
-            selected_info = self.info_font.render('Quit game', True, (255, 255, 255))
+            selected_info = SharedTextCache.render(self.info_font, 'Quit game', (255, 255, 255))
             screen.blit(selected_info, (self.rightinfo_rect.left + 5, self.rightinfo_rect.top + 35))
     '''出售炮塔(半价)'''
     def sellTurret(self, position):
@@ -371,56 +415,88 @@ class GamingInterface():
         self.mouse_carried = ['XXX', XXX]
     '''找下一个路径单元'''
     def find_next_path(self, enemy):
-        x, y = enemy.coord
-        # 优先级: 下右左上
-        neighbours = [(x, y+1), (x+1, y), (x-1, y), (x, y-1)]
-        for neighbour in neighbours:
-            if (neighbour in self.path_list) and (neighbour not in enemy.reached_path):
-                return neighbour
-        return None
+        return self.flow_field.get(enemy.coord)
+    '''计算流场: 从离大本营最近的道路单元开始在道路上做广度优先搜索, 每个单元指向离终点更近的邻居'''
+    def computeFlowField(self):
+        self.flow_field = dict()
+        if not self.path_set:
+            return
+        nexus_coord = self.pos2coord((740, 400))
+        goal = min(self.path_set, key=lambda coord: (abs(coord[0] - nexus_coord[0]) + abs(coord[1] - nexus_coord[1]), coord[1], coord[0]))
+        distances = {goal: 0}
+        queue = deque([goal])
+        while queue:
+            x, y = queue.popleft()
+            for neighbour in [(x, y+1), (x+1, y), (x-1, y), (x, y-1)]:
+                if neighbour in self.path_set and neighbour not in distances:
+                    distances[neighbour] = distances[x, y] + 1
+                    queue.append(neighbour)
+        for (x, y), distance in distances.items():
+            # 优先级: 下右左上
+            neighbours = [(x, y+1), (x+1, y), (x-1, y), (x, y-1)]
+            self.flow_field[x, y] = next((neighbour for neighbour in neighbours if distances.get(neighbour, distance) < distance), None)
+    '''射程内离position最近的敌人'''
+    def findTarget(self, position, radius):
+        area = pygame.Rect(position[0] - radius, position[1] - radius, radius * 2, radius * 2)
+        target, target_dist = None, radius ** 2
+        for enemy in self.enemies_group.collide(area):
+            dist = (enemy.rect.centerx - position[0]) ** 2 + (enemy.rect.centery - position[1]) ** 2
+            if dist <= target_dist:
+                target, target_dist = enemy, dist
+        return target
     '''将真实坐标转为地图坐标, 20个单位长度的真实坐标=地图坐标'''
     def pos2coord(self, position):
         return (position[0] // self.element_size, position[1] // self.element_size)
     '''将地图坐标转为真实坐标, 20个单位长度的真实坐标=地图坐标'''
     def coord2pos(self, coord):
         return (coord[0] * self.element_size, coord[1] * self.element_size)
-    '''导入地图'''
-    def loadMap(self, screen, map_path):
-        map_file = open(map_path, 'r')
+    '''导入地图, 只在切换地图时解析一次: 地形预先画到map_surface上, 道路记录在集合里'''
+    def loadMap(self, map_path):
+        if map_path == self.map_path:
+            return
+        self.map_path = map_path
+        self.current_map = dict()
+        self.path_set = set()
+        with open(map_path, 'r') as map_file:
+            lines = [line.strip() for line in map_file.readlines()]
         idx_j = -1
-        for line in map_file.readlines():
-            line = line.strip()
+        for line in lines:
             if not line:
                 continue
             idx_j += 1
             idx_i = -1
             for col in line:
+                # 非数字和未定义的地图元素直接跳过
                 try:
                     element_type = int(col)
-                    element_img = self.map_elements.get(element_type)
-                    element_rect = element_img.get_rect()
-                    idx_i += 1
-                    element_rect.left, element_rect.top = self.element_size * idx_i, self.element_size * idx_j
-                    self.map_surface.blit(element_img, element_rect)
-                    self.current_map[idx_i, idx_j] = element_type
-                    # 把道路记下来
-                    if element_type == 1:
-                        self.path_list.append((idx_i, idx_j))
-                except:
+                except ValueError:
+                    continue
+                if element_type not in self.map_elements:
                     continue
+                idx_i += 1
+                self.current_map[idx_i, idx_j] = element_type
+                # 把道路记下来
+                if element_type == 1:
+                    self.path_set.add((idx_i, idx_j))
+        # 静态地形层
+        for (idx_i, idx_j), element_type in self.current_map.items():
+            self.map_surface.blit(self.map_elements[element_type], (self.element_size * idx_i, self.element_size * idx_j))
         # 放洞穴和大本营
         self.map_surface.blit(self.cave, (0, 0))
         self.map_surface.blit(self.nexus, (740, 400))
+        self.computeFlowField()
+    '''画地图: 预先画好的地形层加上大本营的血条'''
+    def drawMap(self, screen):
+        screen.blit(self.map_surface, (0, 0))
         # 大本营的血条
         nexus_width = self.nexus.get_rect().width
         green_len = max(0, self.health / self.max_health) * nexus_width
         if green_len > 0:
-            pygame.draw.line(self.map_surface, (0, 255, 0), (740, 400), (740 + green_len, 400), 3)
+            pygame.draw.line(screen, (0, 255, 0), (740, 400), (740 + green_len, 400), 3)
         if green_len < nexus_width:
-            pygame.draw.line(self.map_surface, (255, 0, 0), (740 + green_len, 400), (740 + nexus_width, 400), 3)
-        screen.blit(self.map_surface, (0, 0))
-        map_file.close()
+            pygame.draw.line(screen, (255, 0, 0), (740 + green_len, 400), (740 + nexus_width, 400), 3)
     '''暂停游戏'''
     def pauseGame(self, screen):
         pause_interface = PauseInterface(self.cfg, self.resource_loader)
-        pause_interface.update(screen)
\ No newline at end of file
+        pause_interface.update(screen)
+        self.skip_frame_time = True
\ No newline at end of file
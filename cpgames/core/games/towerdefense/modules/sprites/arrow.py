@@ -14,6 +14,7 @@ class Arrow(pygame.sprite.Sprite):
         self.image = self.images[arrow_type]
         self.rect = self.image.get_rect()
         self.position = 0, 0
+        self.prev_position = self.position
         self.rect.left, self.rect.top = self.position
         # 与水平向左的直线所成的夹角, 顺时针为正
         self.angle = 0
@@ -28,6 +29,8 @@ class Arrow(pygame.sprite.Sprite):
             self.attack_power = 15
     '''不停移动'''
     def move(self):
+        # 上一模拟帧的位置, 绘制时用来插值
+        self.prev_position = self.position
         self.position = self.position[0] - self.speed * math.cos(self.angle), self.position[1] - self.speed * math.sin(self.angle)
         self.rect.left, self.rect.top = self.position
     '''重置箭的位置'''
@@ -35,6 +38,7 @@ class Arrow(pygame.sprite.Sprite):
         if angle is None:
             angle = random.random() * math.pi * 2
         self.position = position
+        self.prev_position = position
         self.angle = angle
         self.image = pygame.transform.rotate(self.image, -(self.angle / math.pi) * 180 + 90)
         self.rect = self.image.get_rect()
\ No newline at end of file
@@ -14,13 +14,13 @@ class Enemy(pygame.sprite.Sprite):
         ]
         self.image = self.images[enemy_type]
         self.rect = self.image.get_rect()
-        # 走过的路(避免重复走，保证去攻击城堡)
-        self.reached_path = []
         # 在道路某个单元中移动的距离, 当cell_move_dis大于单元长度时移动到下一个到了单元并置0该变量
         self.cell_move_dis = 0
         # 当前所在的位置
         self.coord = 3, 2
         self.position = 60, 40
+        # 上一模拟帧的位置, 绘制时用来插值
+        self.prev_position = self.position
         self.rect.left, self.rect.top = self.position
         if enemy_type == 0:
             # 最大生命值
@@ -41,11 +41,15 @@ class Turret(pygame.sprite.Sprite):
             self.cool_time = 30
             # 是否在冷却期
             self.is_cooling = False
+            # 射程(像素), 只瞄准射程内的敌人
+            self.range = 150
         elif self.turret_type == 1:
             self.price = 1000
             self.cool_time = 50
             self.is_cooling = False
+            self.range = 175
         elif self.turret_type == 2:
             self.price = 1500
             self.cool_time = 100
-            self.is_cooling = False
\ No newline at end of file
+            self.is_cooling = False
+            self.range = 200
\ No newline at end of file
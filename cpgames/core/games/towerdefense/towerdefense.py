@@ -11,6 +11,13 @@ class Config():
     rootdir = os.path.split(os.path.abspath(__file__))[0]
     # FPS
     FPS = 60
+    # 模拟频率(每秒模拟帧数), 敌人速度/炮塔冷却/箭速都以模拟帧为单位
+    SIM_HZ = 60
+    # 快进倍数, 游戏中按F键切换
+    FAST_FORWARD_MULTIPLIERS = [1, 2, 4]
+    # 每波敌人的间隔和同一波内出敌人的间隔(秒, 模拟时间)
+    WAVE_INTERVAL = 60
+    ENEMY_SPAWN_INTERVAL = 0.5
     # 屏幕大小
     SCREENSIZE = (800, 600)
     # 标题
@@ -75,6 +82,8 @@ class Config():
             'start_interface': os.path.join(rootdir, 'resources/images/start/start_interface.png'), 
         },
     }
+    # 首帧只需要开始界面的图片, 其余图片在后台加载
+    CRITICAL_RESOURCE_KEYS = {'image': ['start']}
     # 背景音乐路径
     BGM_PATH = os.path.join(rootdir.replace('towerdefense', 'base'), 'resources/audios/liuyuedeyu.mp3')
     # 不同难度的settings
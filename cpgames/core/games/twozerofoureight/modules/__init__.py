@@ -1,4 +1,5 @@
 '''初始化'''
 from .game2048 import Game2048
+from .bitboard2048 import BitboardGame2048, moveBoard
 from .endinterface import EndInterface
 from .utils import getColorByNumber, drawGameMatrix, drawScore, drawGameIntro
\ No newline at end of file
@@ -0,0 +1,137 @@
+import random
+from .game2048 import Game2048
+
+
+'''行查找表: 16位的行(4个4位指数, 低位为最左边) -> 移动后的行, 以及本次移动的得分'''
+ROW_LEFT_TABLE, ROW_RIGHT_TABLE, SCORE_LEFT_TABLE, SCORE_RIGHT_TABLE = [], [], [], []
+'''指数的上限, 4位最多表示2^15=32768, 两个32768不再合并'''
+MAX_EXPONENT = 15
+
+
+'''构建行查找表, 合并规则与Game2048.move完全一致'''
+def buildRowTables():
+    if ROW_LEFT_TABLE: return
+    # 提取非空数字(指数0表示空)
+    def extract(array):
+        return [item for item in array if item != 0]
+    # 合并非空数字
+    def merge(array):
+        score = 0
+        if len(array) < 2: return array, score
+        for i in range(len(array)-1):
+            if array[i] == 0:
+                break
+            if array[i] == array[i+1] and array[i] < MAX_EXPONENT:
+                array[i] += 1
+                array.pop(i+1)
+                array.append(0)
+                score += 1 << array[i]
+        return extract(array), score
+    # 指数列表打包成16位的行
+    def pack(array):
+        row = 0
+        for idx, item in enumerate(array): row |= item << (4 * idx)
+        return row
+    for row in range(65536):
+        cells = [(row >> (4 * idx)) & 0xF for idx in range(4)]
+        # 向左
+        array = extract(cells)
+        array.reverse()
+        array, score = merge(array)
+        array.reverse()
+        ROW_LEFT_TABLE.append(pack(array + [0] * (4 - len(array))))
+        SCORE_LEFT_TABLE.append(score)
+        # 向右
+        array, score = merge(extract(cells))
+        ROW_RIGHT_TABLE.append(pack([0] * (4 - len(array)) + array))
+        SCORE_RIGHT_TABLE.append(score)
+
+
+'''转置棋盘(第r行在16*r位, 第c列在行内4*c位)'''
+def transpose(board):
+    a1 = board & 0xF0F00F0FF0F00F0F
+    a2 = board & 0x0000F0F00000F0F0
+    a3 = board & 0x0F0F00000F0F0000
+    a = a1 | (a2 << 12) | (a3 >> 12)
+    b1 = a & 0xFF00FF0000FF00FF
+    b2 = a & 0x00FF00FF00000000
+    b3 = a & 0x00000000FF00FF00
+    return b1 | (b2 >> 24) | (b3 << 24)
+
+
+'''对每一行查表'''
+def moveRows(board, row_table, score_table):
+    new_board, score = 0, 0
+    for shift in (0, 16, 32, 48):
+        row = (board >> shift) & 0xFFFF
+        new_board |= row_table[row] << shift
+        score += score_table[row]
+    return new_board, score
+
+
+'''按方向移动棋盘, 返回(新棋盘, 得分), 供AI/批量模拟直接调用'''
+def moveBoard(board, direction):
+    buildRowTables()
+    if direction == 'left': return moveRows(board, ROW_LEFT_TABLE, SCORE_LEFT_TABLE)
+    if direction == 'right': return moveRows(board, ROW_RIGHT_TABLE, SCORE_RIGHT_TABLE)
+    if direction == 'up':
+        board, score = moveRows(transpose(board), ROW_LEFT_TABLE, SCORE_LEFT_TABLE)
+        return transpose(board), score
+    if direction == 'down':
+        board, score = moveRows(transpose(board), ROW_RIGHT_TABLE, SCORE_RIGHT_TABLE)
+        return transpose(board), score
+    raise ValueError(f'unknown direction {direction}')
+
+
+'''位棋盘版2048游戏, 整个4x4棋盘保存在一个64位整数里(每格4位指数), 接口与Game2048相同'''
+class BitboardGame2048(Game2048):
+    def __init__(self, matrix_size=(4, 4), max_score_filepath=None, **kwargs):
+        assert tuple(matrix_size) == (4, 4), 'BitboardGame2048 only supports 4x4 boards'
+        buildRowTables()
+        super(BitboardGame2048, self).__init__(matrix_size=(4, 4), max_score_filepath=max_score_filepath, **kwargs)
+    '''更新游戏状态'''
+    def update(self):
+        board_before = self.board
+        self.move()
+        if board_before != self.board: self.randomGenerateNumber()
+        if self.score > self.max_score: self.max_score = self.score
+    '''根据指定的方向, 移动所有数字块'''
+    def move(self):
+        if self.move_direction is None: return
+        self.board, score = moveBoard(self.board, self.move_direction)
+        self.score += score
+        self.move_direction = None
+    '''在新的位置随机生成数字, 与Game2048一样按行优先顺序选择空位'''
+    def randomGenerateNumber(self):
+        empty_pos = [idx for idx in range(16) if not (self.board >> (4 * idx)) & 0xF]
+        idx = random.choice(empty_pos)
+        self.board |= (1 if random.random() > 0.1 else 2) << (4 * idx)
+    '''初始化'''
+    def initialize(self):
+        self.board = 0
+        self.score = 0
+        self.max_score = self.readMaxScore()
+        self.move_direction = None
+        self.randomGenerateNumber()
+        self.randomGenerateNumber()
+    '''当前数字排列, 与Game2048.game_matrix格式相同(空位为'null'), 供绘制使用'''
+    @property
+    def game_matrix(self):
+        matrix = []
+        for i in range(4):
+            row = []
+            for j in range(4):
+                exponent = (self.board >> (16 * i + 4 * j)) & 0xF
+                row.append(1 << exponent if exponent else 'null')
+            matrix.append(row)
+        return matrix
+    '''游戏是否结束'''
+    @property
+    def isgameover(self):
+        # 有空位时一定还能移动: 把每格4位或到最低位, 再数非空格子
+        occupied = self.board | (self.board >> 2)
+        occupied = (occupied | (occupied >> 1)) & 0x1111111111111111
+        if bin(occupied).count('1') < 16: return False
+        for direction in ['up', 'down', 'left', 'right']:
+            if moveBoard(self.board, direction)[0] != self.board: return False
+        return True
@@ -1,5 +1,6 @@
 
 import pygame
+from ....utils import SharedTextCache
 
 
 '''根据方格当前的分数获得[方格背景颜色, 方格里的字体颜色]'''
@@ -26,8 +27,8 @@ def drawGameMatrix(screen, game_matrix, cfg):
             if number != 'null':
                 font_color = pygame.Color(getColorByNumber(number)[1])
                 font_size = cfg.BLOCK_SIZE - 10 * len(str(number))
-                font = pygame.font.Font(cfg.FONTPATH, font_size)
-                text = font.render(str(number), True, font_color)
+                font = SharedTextCache.getfont(cfg.FONTPATH, font_size)
+                text = SharedTextCache.render(font, str(number), font_color)
                 text_rect = text.get_rect()
                 text_rect.centerx, text_rect.centery = x + cfg.BLOCK_SIZE / 2, y + cfg.BLOCK_SIZE / 2
                 screen.blit(text, text_rect)
@@ -37,9 +38,9 @@ def drawGameMatrix(screen, game_matrix, cfg):
 def drawScore(screen, score, max_score, cfg):
     font_color = (255, 255, 255)
     font_size = 30
-    font = pygame.font.Font(cfg.FONTPATH, font_size)
-    text_max_score = font.render('Best: %s' % max_score, True, font_color)
-    text_score = font.render('Score: %s' % score, True, font_color)
+    font = SharedTextCache.getfont(cfg.FONTPATH, font_size)
+    text_max_score = SharedTextCache.render(font, 'Best: %s' % max_score, font_color)
+    text_score = SharedTextCache.render(font, 'Score: %s' % score, font_color)
     start_x = cfg.BLOCK_SIZE * cfg.GAME_MATRIX_SIZE[1] + cfg.MARGIN_SIZE * (cfg.GAME_MATRIX_SIZE[1] + 1)
     screen.blit(text_max_score, (start_x+10, 10))
     screen.blit(text_score, (start_x+10, 20+text_score.get_rect().height))
@@ -53,11 +54,10 @@ def drawGameIntro(screen, start_x, start_y, cfg):
     font_color = (255, 255, 255)
     font_size_big = 30
     font_size_small = 20
-    font_big = pygame.font.Font(cfg.FONTPATH, font_size_big)
-    font_small = pygame.font.Font(cfg.FONTPATH, font_size_small)
+    font_big = SharedTextCache.getfont(cfg.FONTPATH, font_size_big)
+    font_small = SharedTextCache.getfont(cfg.FONTPATH, font_size_small)
     intros = ['TIPS:', 'Use arrow keys to move the number blocks.', 'Adjacent blocks with the same number will', 'be merged. Just try to merge the blocks as', 'many as you can!']
     for idx, intro in enumerate(intros):
         font = font_big if idx == 0 else font_small
-        text = font.render(intro, True, font_color)
-        screen.blit(text, (start_x+10, start_y))
-        start_y += text.get_rect().height + 10
\ No newline at end of file
+        rect = SharedTextCache.blit(screen, font, intro, font_color, (start_x+10, start_y))
+        start_y += rect.height + 10
\ No newline at end of file
@@ -3,7 +3,7 @@ import os
 import pygame
 from ...utils import QuitGame
 from ..base import PygameBaseGame
-from .modules import getColorByNumber, drawGameMatrix, drawScore, drawGameIntro, EndInterface, Game2048
+from .modules import getColorByNumber, drawGameMatrix, drawScore, drawGameIntro, EndInterface, Game2048, BitboardGame2048
 
 
 '''配置类'''
@@ -24,6 +24,8 @@ class Config():
     MARGIN_SIZE = 10
     BLOCK_SIZE = 80
     GAME_MATRIX_SIZE = (4, 4)
+    # 游戏引擎, 'bitboard'为查表实现(仅支持4x4), 'matrix'为原始的列表实现
+    GAME_ENGINE = 'bitboard'
     # 背景音乐路径
     BGM_PATH = os.path.join(rootdir, 'resources/audios/bgm.mp3')
     # 字体路径
@@ -48,7 +50,8 @@ class TwoZeroFourEightGame(PygameBaseGame):
         # 播放背景音乐
         resource_loader.playbgm()
         # 实例化2048游戏
-        game_2048 = Game2048(matrix_size=cfg.GAME_MATRIX_SIZE, max_score_filepath=cfg.MAX_SCORE_FILEPATH)
+        use_bitboard = cfg.GAME_ENGINE == 'bitboard' and tuple(cfg.GAME_MATRIX_SIZE) == (4, 4)
+        game_2048 = (BitboardGame2048 if use_bitboard else Game2048)(matrix_size=cfg.GAME_MATRIX_SIZE, max_score_filepath=cfg.MAX_SCORE_FILEPATH)
         # 游戏主循环
         clock = pygame.time.Clock()
         is_running = True
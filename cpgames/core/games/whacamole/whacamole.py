@@ -2,7 +2,7 @@
 import os
 import pygame
 import random
-from ...utils import QuitGame
+from ...utils import QuitGame, SharedTextCache
 from ..base import PygameBaseGame
 from .modules import Mole, Hammer, endInterface, startInterface
 
@@ -66,7 +66,7 @@ class WhacAMoleGame(PygameBaseGame):
         resource_loader.playbgm()
         audios = resource_loader.sounds
         # 加载字体
-        font = pygame.font.Font(cfg.FONT_PATH, 40)
+        font = SharedTextCache.getfont(cfg.FONT_PATH, 40)
         # 加载背景图片
         bg_img = resource_loader.images['background']
         # 开始界面
@@ -108,7 +108,7 @@ class WhacAMoleGame(PygameBaseGame):
                 audios['count_down'].play()
             # --游戏结束
             if time_remain < 0: break
-            count_down_text = font.render('Time: '+str(time_remain), True, cfg.WHITE)
+            count_down_text = SharedTextCache.render(font, 'Time: '+str(time_remain), cfg.WHITE)
             # --按键检测
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
@@ -130,7 +130,7 @@ class WhacAMoleGame(PygameBaseGame):
                     mole.setBeHammered()
                     your_score += 10
             # --分数
-            your_score_text = font.render('Score: '+str(your_score), True, cfg.BROWN)
+            your_score_text = SharedTextCache.render(font, 'Score: '+str(your_score), cfg.BROWN)
             # --绑定必要的游戏元素到屏幕(注意顺序)
             screen.blit(bg_img, (0, 0))
             screen.blit(count_down_text, (875, 8))
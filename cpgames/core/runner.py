@@ -0,0 +1,281 @@
+'''
+Function:
+    Run the games in child processes and report their status back through a pipe
+Author:
+    Dannz
+'''
+import sys
+import time
+import traceback
+import importlib
+import multiprocessing
+from collections import deque
+from .games import GameRegistry
+
+
+'''messages sent by the child process, (kind, value)'''
+STATUS_MESSAGE, IMPORT_TIME_MESSAGE, FPS_MESSAGE, EXIT_MESSAGE, ERROR_MESSAGE = 'status', 'import_time', 'fps', 'exit', 'error'
+'''commands sent by the launcher, (kind, *args)'''
+RUN_COMMAND, QUIT_COMMAND, STOP_COMMAND = 'run', 'quit', 'stop'
+
+
+'''count the presented frames of the game and serve the control channel, installed in the child process only'''
+class FrameReporter():
+    def __init__(self, conn, interval=1.0):
+        self.conn = conn
+        self.interval = interval
+        self.num_frames = 0
+        self.last_report_time = time.perf_counter()
+    '''wrap pygame.display.flip / update so every presented frame is counted'''
+    def install(self):
+        import pygame
+        self.pygame = pygame
+        for name in ['flip', 'update']:
+            setattr(pygame.display, name, self.wrap(getattr(pygame.display, name)))
+    '''start counting a new game'''
+    def reset(self):
+        self.num_frames = 0
+        self.last_report_time = time.perf_counter()
+    '''wrap a display function'''
+    def wrap(self, func):
+        def wrapper(*args, **kwargs):
+            result = func(*args, **kwargs)
+            self.onframe()
+            return result
+        return wrapper
+    '''report the fps once per interval and handle the pending commands'''
+    def onframe(self):
+        self.num_frames += 1
+        now = time.perf_counter()
+        if now - self.last_report_time < self.interval: return
+        SendMessage(self.conn, FPS_MESSAGE, self.num_frames / (now - self.last_report_time))
+        self.num_frames, self.last_report_time = 0, now
+        while self.conn.poll():
+            if self.conn.recv()[0] == QUIT_COMMAND:
+                self.pygame.event.post(self.pygame.event.Event(self.pygame.QUIT))
+
+
+'''send a message to the launcher, the launcher may already be gone'''
+def SendMessage(conn, kind, value):
+    try:
+        conn.send((kind, value))
+    except (BrokenPipeError, EOFError, OSError):
+        pass
+
+
+'''pay for the interpreter, SDL and import costs before any game is requested'''
+def WarmUp(package, preimport_keys):
+    import pygame
+    pygame.init()
+    try:
+        pygame.mixer.init()
+    except pygame.error:
+        pass
+    importlib.import_module('.base', package=package)
+    registry = GameRegistry(package=package)
+    for key in preimport_keys:
+        if key not in registry: continue
+        try:
+            registry.load(key)
+        except Exception:
+            # the error is reported again when the game is actually requested
+            pass
+
+
+'''run one game inside the child process and return its exit code'''
+def RunOneGame(conn, key, entry, package):
+    exit_code = 0
+    try:
+        registry = GameRegistry(entries={key: entry}, package=package)
+        game_class = registry.load(key)
+        SendMessage(conn, IMPORT_TIME_MESSAGE, registry.getimporttime(key))
+        game = game_class()
+        SendMessage(conn, STATUS_MESSAGE, 'running')
+        game.run()
+    except SystemExit as error:
+        # QuitGame calls sys.exit, which now only ends this game
+        exit_code = error.code if isinstance(error.code, int) else (0 if error.code is None else 1)
+    except BaseException:
+        exit_code = 1
+        SendMessage(conn, ERROR_MESSAGE, traceback.format_exc())
+    return exit_code
+
+
+'''entry of the child process, runs up to max_games games sent by the launcher'''
+def WorkerMain(conn, package, max_games=1, preimport_keys=()):
+    WarmUp(package, preimport_keys)
+    reporter = FrameReporter(conn)
+    reporter.install()
+    num_games, exit_code = 0, 0
+    SendMessage(conn, STATUS_MESSAGE, 'idle')
+    while num_games < max_games:
+        try:
+            command = conn.recv()
+        except (EOFError, OSError):
+            break
+        if command[0] == STOP_COMMAND: break
+        if command[0] != RUN_COMMAND: continue
+        _, key, entry, game_package = command
+        SendMessage(conn, STATUS_MESSAGE, 'loading')
+        reporter.reset()
+        exit_code = RunOneGame(conn, key, entry, game_package)
+        num_games += 1
+        SendMessage(conn, EXIT_MESSAGE, exit_code)
+        if num_games < max_games:
+            import pygame
+            from .utils import SharedTextCache
+            # the fonts cached by the last game belong to the pygame session QuitGame shut down
+            SharedTextCache.clear()
+            pygame.init()
+            SendMessage(conn, STATUS_MESSAGE, 'idle')
+    conn.close()
+    sys.exit(exit_code)
+
+
+'''a spawned child process which has already initialised pygame and imported the games'''
+class GameWorker():
+    def __init__(self, package, max_games=1, preimport_keys=(), **kwargs):
+        self.max_games = max_games
+        self.num_games = 0
+        self.created_time = time.perf_counter()
+        context = multiprocessing.get_context('spawn')
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(
+            target=WorkerMain, args=(child_conn, package, max_games, tuple(preimport_keys)), name='cpgames-worker', daemon=True,
+        )
+        self.process.start()
+        child_conn.close()
+    '''hand a game to the worker'''
+    def run(self, key, entry, package):
+        self.num_games += 1
+        self.conn.send((RUN_COMMAND, key, entry, package))
+    '''whether the worker can take another game after the current one'''
+    def isreusable(self):
+        return self.process.is_alive() and self.num_games < self.max_games
+    '''whether the child process is still running'''
+    def isalive(self):
+        return self.process.is_alive()
+    '''drop the status messages sent while the worker was idle'''
+    def drain(self):
+        try:
+            while self.conn.poll(): self.conn.recv()
+        except (EOFError, OSError):
+            pass
+    '''let the worker exit, and kill it if it does not within the timeout'''
+    def stop(self, timeout=2.0):
+        try:
+            self.conn.send((STOP_COMMAND, ))
+        except (BrokenPipeError, OSError):
+            pass
+        self.process.join(timeout)
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join()
+
+
+'''a game running in a child process, a cold worker is spawned for it unless a warm one is given'''
+class GameProcess():
+    def __init__(self, key, registry, worker=None, **kwargs):
+        self.key = key
+        self.status = 'starting'
+        self.import_time = None
+        self.fps = None
+        self.exit_code = None
+        self.error = None
+        self.worker = GameWorker(registry.package) if worker is None else worker
+        self.worker.drain()
+        self.worker.run(key, registry.entries[key], registry.package)
+    '''read the pending messages of the child process and update the status'''
+    def poll(self):
+        if self.exit_code is not None: return self.status
+        try:
+            while self.exit_code is None and self.worker.conn.poll():
+                kind, value = self.worker.conn.recv()
+                if kind == STATUS_MESSAGE: self.status = value
+                elif kind == IMPORT_TIME_MESSAGE: self.import_time = value
+                elif kind == FPS_MESSAGE: self.fps = value
+                elif kind == ERROR_MESSAGE: self.error = value
+                elif kind == EXIT_MESSAGE: self.exit_code = value
+        except (EOFError, OSError):
+            pass
+        if self.exit_code is None and not self.worker.isalive():
+            self.exit_code = self.worker.process.exitcode
+        if self.exit_code is not None:
+            self.status = 'exited' if self.exit_code == 0 else 'failed'
+        return self.status
+    '''whether the game is still running'''
+    def isalive(self):
+        return self.poll() not in ('exited', 'failed')
+    '''ask the game to quit as if its window was closed'''
+    def requestquit(self):
+        try:
+            self.worker.conn.send((QUIT_COMMAND, ))
+        except (BrokenPipeError, OSError):
+            pass
+    '''ask the game to quit, and kill its process if it does not within the timeout'''
+    def stop(self, timeout=2.0):
+        self.requestquit()
+        deadline = time.perf_counter() + timeout
+        while self.isalive() and time.perf_counter() < deadline:
+            time.sleep(0.05)
+        if self.isalive():
+            self.worker.process.terminate()
+            self.worker.process.join()
+        self.poll()
+
+
+'''a pool of warm workers, launching a game hands it to an idle worker and spawns a replacement in the background'''
+class GameWorkerPool():
+    def __init__(self, registry, size=1, max_games_per_worker=1, max_idle_time=None, preimport_keys=None, **kwargs):
+        self.registry = registry
+        self.size = size
+        # a worker is recycled after running this many games, 1 gives every game a fresh process
+        self.max_games_per_worker = max_games_per_worker
+        # idle workers older than this (seconds) are replaced, None keeps them forever
+        self.max_idle_time = max_idle_time
+        # games imported by the workers while warming up, every registered game by default
+        self.preimport_keys = list(registry.keys()) if preimport_keys is None else list(preimport_keys)
+        self.idle_workers = deque()
+        self.game_processes = []
+        self.fill()
+    '''spawn workers until the pool has its configured number of idle ones'''
+    def fill(self):
+        while len(self.idle_workers) < self.size:
+            self.idle_workers.append(GameWorker(self.registry.package, self.max_games_per_worker, self.preimport_keys))
+    '''start a game on an idle worker (or a cold one if the pool is exhausted)'''
+    def launch(self, key):
+        worker = None
+        while self.idle_workers and worker is None:
+            worker = self.idle_workers.popleft()
+            if not worker.isalive(): worker = None
+        game_process = GameProcess(key, self.registry, worker=worker)
+        self.game_processes.append(game_process)
+        self.fill()
+        return game_process
+    '''return finished workers to the pool, recycle the used up or stale ones and refill'''
+    def poll(self):
+        for game_process in list(self.game_processes):
+            if game_process.isalive(): continue
+            self.game_processes.remove(game_process)
+            worker = game_process.worker
+            if worker.isreusable() and len(self.idle_workers) < self.size: self.idle_workers.append(worker)
+            elif worker.isalive(): worker.stop()
+        now = time.perf_counter()
+        for worker in list(self.idle_workers):
+            stale = self.max_idle_time is not None and now - worker.created_time > self.max_idle_time
+            if worker.isalive() and not stale: continue
+            self.idle_workers.remove(worker)
+            if worker.isalive(): worker.stop()
+        self.fill()
+    '''resize the pool'''
+    def resize(self, size):
+        self.size = size
+        while len(self.idle_workers) > size: self.idle_workers.pop().stop()
+        self.fill()
+    '''stop the idle workers and the running games'''
+    def shutdown(self, timeout=2.0):
+        while self.idle_workers: self.idle_workers.popleft().stop(timeout)
+        for game_process in self.game_processes:
+            game_process.stop(timeout)
+            game_process.worker.stop(timeout)
+        self.game_processes = []
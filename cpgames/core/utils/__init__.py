@@ -1,4 +1,7 @@
 '''initialize'''
 from .misc import QuitGame
 from .initialize import InitPygame
-from .io import PygameResourceLoader
\ No newline at end of file
+from .io import PygameResourceLoader, PygameResourceCache, SharedResourceCache
+from .preload import PygameResourcePreloader, StreamingResourceDict, ShowLoadingProgress
+from .spatial import SpatialHashGrid, SpatialHashGroup
+from .text import TextRenderCache, SharedTextCache
@@ -1,18 +1,159 @@
+import io
+import os
+import hashlib
+import threading
 import pygame
+from collections import OrderedDict
+
+
+
+'''Process-wide, content-addressed cache of decoded images and sounds with LRU eviction'''
+class PygameResourceCache():
+    def __init__(self, max_bytes=256 * 1024 * 1024, **kwargs):
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self.hits, self.misses = 0, 0
+        # (kind, content digest, variant) -> (resource, nbytes)
+        self.entries = OrderedDict()
+        # (abspath, mtime_ns, size) -> content digest, so unchanged files are not re-hashed
+        self.digests = dict()
+        # content digest -> image decoded ahead of time by predecode, waiting for its display conversion
+        self.decoded = dict()
+        # the launcher may run several games on threads of the same process
+        self.lock = threading.RLock()
+    '''Load an image, the returned surface is shared and should be copied before it is modified'''
+    def loadimage(self, path):
+        converted = pygame.display.get_init() and pygame.display.get_surface() is not None
+        def decode(digest, data):
+            with self.lock: image = self.decoded.pop(digest, None)
+            if image is None: image = self.decodeimage(path, data)
+            if not converted: return image
+            if image.get_flags() & pygame.SRCALPHA or image.get_colorkey() is not None: return image.convert_alpha()
+            return image.convert()
+        return self.fetch('image', path, converted, decode, self.surfacebytes)
+    '''Load a sound, entries are keyed by the mixer format since chunks are decoded for it'''
+    def loadsound(self, path):
+        mixer_format = pygame.mixer.get_init()
+        decode = lambda digest, data: self.decodesound(path, data)
+        return self.fetch('sound', path, mixer_format, decode, self.soundbytes)
+    '''Decode a file ahead of time, safe to call from worker threads (the display conversion is left to loadimage)'''
+    def predecode(self, kind, path):
+        data, digest = self.digest(path)
+        if kind == 'image':
+            with self.lock:
+                if digest in self.decoded or any(key[:2] == ('image', digest) for key in self.entries): return
+            image = self.decodeimage(path, data)
+            with self.lock: self.decoded[digest] = image
+        else:
+            key = ('sound', digest, pygame.mixer.get_init())
+            with self.lock:
+                if key in self.entries: return
+            sound = self.decodesound(path, data)
+            self.insert(key, sound, self.soundbytes(sound))
+    '''Return the cached resource or decode and insert it'''
+    def fetch(self, kind, path, variant, decode, sizeof):
+        data, digest = self.digest(path)
+        key = (kind, digest, variant)
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return self.entries[key][0]
+            self.misses += 1
+        resource = decode(digest, data)
+        self.insert(key, resource, sizeof(resource))
+        return resource
+    '''Decode an image from the file content, the file is read again if the content is not given'''
+    @staticmethod
+    def decodeimage(path, data=None):
+        if data is None: return pygame.image.load(path)
+        return pygame.image.load(io.BytesIO(data), os.path.basename(path))
+    '''Decode a sound from the file content, the file is read again if the content is not given'''
+    @staticmethod
+    def decodesound(path, data=None):
+        if data is None: return pygame.mixer.Sound(path)
+        return pygame.mixer.Sound(file=io.BytesIO(data))
+    '''Content digest of a file'''
+    def digest(self, path):
+        stat = os.stat(path)
+        stat_key = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+        with self.lock:
+            if stat_key in self.digests: return None, self.digests[stat_key]
+        with open(path, 'rb') as fp: data = fp.read()
+        digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+        with self.lock:
+            self.digests[stat_key] = digest
+        return data, digest
+    '''Insert a resource and evict the least recently used ones beyond the byte budget'''
+    def insert(self, key, resource, nbytes):
+        with self.lock:
+            if key in self.entries:
+                self.total_bytes -= self.entries.pop(key)[1]
+            self.entries[key] = (resource, nbytes)
+            self.total_bytes += nbytes
+            self.evict(keep=key)
+    '''Evict least recently used entries until the cache fits its budget'''
+    def evict(self, keep=None):
+        with self.lock:
+            for key in list(self.entries.keys()):
+                if self.total_bytes <= self.max_bytes: break
+                if key == keep: continue
+                self.total_bytes -= self.entries.pop(key)[1]
+    '''Change the byte budget'''
+    def setmaxbytes(self, max_bytes):
+        with self.lock:
+            self.max_bytes = max_bytes
+            self.evict()
+    '''Drop every cached resource'''
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.digests.clear()
+            self.decoded.clear()
+            self.total_bytes = 0
+    '''Estimate of the memory held by a surface'''
+    @staticmethod
+    def surfacebytes(surface):
+        return surface.get_pitch() * surface.get_height()
+    '''Estimate of the memory held by a sound chunk'''
+    @staticmethod
+    def soundbytes(sound):
+        mixer_format = pygame.mixer.get_init()
+        if mixer_format is None: return 0
+        frequency, size, channels = mixer_format
+        return int(sound.get_length() * frequency) * channels * (abs(size) // 8)
+
+
+'''the cache shared by every PygameResourceLoader of the process'''
+SharedResourceCache = PygameResourceCache()
+
 
 class PygameResourceLoader():
-    def __init__(self, image_paths_dict=None, sound_paths_dict=None, font_paths_dict=None, bgm_path=None, **kwargs):
-        
+    def __init__(self, image_paths_dict=None, sound_paths_dict=None, font_paths_dict=None, bgm_path=None, resource_cache=None, preloader=None, **kwargs):
+
         self.bgm_path = bgm_path
         self.font_paths_dict = font_paths_dict
         self.image_paths_dict = image_paths_dict
         self.sound_paths_dict = sound_paths_dict
+        self.resource_cache = SharedResourceCache if resource_cache is None else resource_cache
+        # Preloader decoding the files in the background, its non-critical resources are streamed in
+        self.preloader = preloader
         # Import fonts
         self.fonts = self.fontload(font_paths_dict)
         # Import image
-        self.images = self.defaultload(image_paths_dict, pygame.image.load)
+        self.images = self.streamload('image', image_paths_dict, self.resource_cache.loadimage)
         # Importing sounds
-        self.sounds = self.defaultload(sound_paths_dict, pygame.mixer.Sound)
+        self.sounds = self.streamload('sound', sound_paths_dict, self.resource_cache.loadsound)
+
+    '''Import the critical resources now and let the preloader stream in the others'''
+    def streamload(self, kind, resources_dict, load_func):
+        if self.preloader is None or resources_dict is None: return self.defaultload(resources_dict, load_func)
+        return self.preloader.stream(kind, resources_dict, lambda resources: self.defaultload(resources, load_func))
+
+    '''Finish the streamed resources which are ready, call it from the game loop to avoid blocking on first access'''
+    def pump(self):
+        for resources in (self.images, self.sounds):
+            if hasattr(resources, 'pump'): resources.pump()
 
     '''Default material import function'''
     def defaultload(self, resources_dict, load_func):
@@ -51,4 +192,4 @@ class PygameResourceLoader():
         if key in self.sounds:
             self.sounds[key].play()
         else:
-            print(f"Warning: Sound '{key}' not found in loaded sounds.")
\ No newline at end of file
+            print(f"Warning: Sound '{key}' not found in loaded sounds.")
@@ -0,0 +1,115 @@
+import pygame
+from collections.abc import MutableMapping
+from concurrent.futures import ThreadPoolExecutor, wait
+from .io import SharedResourceCache
+from .misc import QuitGame
+
+
+
+'''Decode images and sounds on a thread pool ahead of PygameResourceLoader'''
+class PygameResourcePreloader():
+    def __init__(self, image_paths_dict=None, sound_paths_dict=None, critical_keys=None, resource_cache=None, num_workers=4, **kwargs):
+        self.image_paths_dict = image_paths_dict or dict()
+        self.sound_paths_dict = sound_paths_dict or dict()
+        # {'image': [top level keys], 'sound': [top level keys]}, None means every resource is critical
+        self.critical_keys = None if critical_keys is None else {kind: set(keys) for kind, keys in critical_keys.items()}
+        self.resource_cache = SharedResourceCache if resource_cache is None else resource_cache
+        self.num_workers = num_workers
+        self.executor = None
+        # (kind, top level key) -> list of futures, one per file
+        self.futures = dict()
+    '''Submit every file to the thread pool, critical ones first'''
+    def start(self):
+        self.executor = ThreadPoolExecutor(max_workers=self.num_workers, thread_name_prefix='preload')
+        tasks = [('image', key, value) for key, value in self.image_paths_dict.items()] + [('sound', key, value) for key, value in self.sound_paths_dict.items()]
+        tasks.sort(key=lambda task: not self.iscritical(task[0], task[1]))
+        for kind, key, value in tasks:
+            self.futures[(kind, key)] = [self.executor.submit(self.resource_cache.predecode, kind, path) for path in self.flattenpaths(value)]
+        self.executor.shutdown(wait=False)
+        return self
+    '''Whether a top level resource key must be loaded before the first frame'''
+    def iscritical(self, kind, key):
+        if self.critical_keys is None: return True
+        return key in self.critical_keys.get(kind, set())
+    '''Number of (finished, total) files, optionally restricted to the critical ones'''
+    def progress(self, critical_only=False):
+        futures = [future for (kind, key), items in self.futures.items() if not critical_only or self.iscritical(kind, key) for future in items]
+        return sum(future.done() for future in futures), len(futures)
+    '''Whether the files of the given resource have been decoded, failures are left to the loader to raise'''
+    def isready(self, kind, key):
+        return all(future.done() for future in self.futures.get((kind, key), []))
+    '''Block until the files of the given resource have been decoded'''
+    def wait(self, kind, key):
+        wait(self.futures.get((kind, key), []))
+    '''Split the loaded resources into the critical ones and a dict streaming in the rest'''
+    def stream(self, kind, resources_dict, load_func):
+        critical, pending = dict(), dict()
+        for key, value in resources_dict.items():
+            if self.iscritical(kind, key): critical[key] = value
+            else: pending[key] = value
+        def load(key, value):
+            self.wait(kind, key)
+            return load_func({key: value})[key]
+        return StreamingResourceDict(load_func(critical), pending, load, lambda key: self.isready(kind, key), order=list(resources_dict.keys()))
+    '''All file paths of a (possibly nested) resource value'''
+    @staticmethod
+    def flattenpaths(value):
+        if isinstance(value, dict): return [path for item in value.values() for path in PygameResourcePreloader.flattenpaths(item)]
+        if isinstance(value, list): return list(value)
+        return [value]
+
+
+'''Dict of loaded resources whose pending entries are finished on first access'''
+class StreamingResourceDict(MutableMapping):
+    def __init__(self, loaded, pending, load_func, ready_func, order=None):
+        self.loaded = loaded
+        self.pending = pending
+        self.load_func = load_func
+        self.ready_func = ready_func
+        self.order = list(loaded.keys()) + list(pending.keys()) if order is None else list(order)
+    '''Finish the pending entries whose files are already decoded, cheap enough to call once per frame'''
+    def pump(self):
+        for key in [key for key in self.pending if self.ready_func(key)]:
+            self.loaded[key] = self.load_func(key, self.pending.pop(key))
+    '''Whether every entry has been loaded'''
+    def isfullyloaded(self):
+        return not self.pending
+    def __getitem__(self, key):
+        if key in self.pending: self.loaded[key] = self.load_func(key, self.pending.pop(key))
+        return self.loaded[key]
+    def __setitem__(self, key, value):
+        self.pending.pop(key, None)
+        if key not in self.loaded and key not in self.order: self.order.append(key)
+        self.loaded[key] = value
+    def __delitem__(self, key):
+        if key not in self.loaded and key not in self.pending: raise KeyError(key)
+        self.loaded.pop(key, None)
+        self.pending.pop(key, None)
+        self.order.remove(key)
+    def __iter__(self):
+        return iter(list(self.order))
+    def __len__(self):
+        return len(self.order)
+    def __contains__(self, key):
+        return key in self.loaded or key in self.pending
+
+
+'''Draw a progress frame until the critical resources are decoded'''
+def ShowLoadingProgress(screen, preloader, fps=30, bg_color=(20, 20, 30), bar_color=(0, 116, 217), text_color=(224, 224, 224)):
+    clock = pygame.time.Clock()
+    font = pygame.font.Font(None, 32)
+    while True:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                QuitGame()
+        finished, total = preloader.progress(critical_only=True)
+        if finished >= total: break
+        width, height = screen.get_size()
+        bar_rect = pygame.Rect(width // 4, height // 2 - 10, width // 2, 20)
+        screen.fill(bg_color)
+        pygame.draw.rect(screen, text_color, bar_rect, 2)
+        pygame.draw.rect(screen, bar_color, (bar_rect.left + 2, bar_rect.top + 2, (bar_rect.width - 4) * finished // total, bar_rect.height - 4))
+        text = font.render(f'Loading... {finished}/{total}', True, text_color)
+        screen.blit(text, text.get_rect(midbottom=(width // 2, bar_rect.top - 10)))
+        pygame.display.update()
+        clock.tick(fps)
@@ -0,0 +1,98 @@
+import pygame
+
+
+
+'''Uniform grid (spatial hash) of rects, updated incrementally so broadphase queries only touch nearby cells'''
+class SpatialHashGrid():
+    def __init__(self, cell_size=128, **kwargs):
+        self.cell_size = cell_size
+        # (cx, cy) -> {item: None}, dicts keep the insertion order of the items
+        self.cells = dict()
+        # item -> (cx0, cy0, cx1, cy1), the cells covered by the item
+        self.item_cells = dict()
+        # item -> insertion counter, used to return the query results in a stable order
+        self.item_orders = dict()
+        self.num_inserted = 0
+    '''cell range covered by a rect'''
+    def cellrange(self, rect):
+        size = self.cell_size
+        cx0, cy0 = rect.left // size, rect.top // size
+        return (cx0, cy0, max(cx0, (rect.right - 1) // size), max(cy0, (rect.bottom - 1) // size))
+    '''add an item with its current rect'''
+    def insert(self, item, rect):
+        if item in self.item_cells: return self.update(item, rect)
+        cell_range = self.cellrange(rect)
+        self.item_cells[item] = cell_range
+        self.item_orders[item] = self.num_inserted
+        self.num_inserted += 1
+        self.link(item, cell_range)
+    '''drop an item'''
+    def remove(self, item):
+        cell_range = self.item_cells.pop(item, None)
+        if cell_range is None: return
+        self.item_orders.pop(item, None)
+        self.unlink(item, cell_range)
+    '''re-bucket an item after its rect changed, nothing is done if it still covers the same cells'''
+    def update(self, item, rect):
+        old_range = self.item_cells.get(item)
+        if old_range is None: return self.insert(item, rect)
+        new_range = self.cellrange(rect)
+        if new_range == old_range: return
+        self.unlink(item, old_range)
+        self.item_cells[item] = new_range
+        self.link(item, new_range)
+    '''items whose cells overlap the rect (no exact test), in insertion order'''
+    def candidates(self, rect):
+        cx0, cy0, cx1, cy1 = self.cellrange(rect)
+        found = dict()
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                cell = self.cells.get((cx, cy))
+                if cell: found.update(cell)
+        return sorted(found, key=self.item_orders.__getitem__)
+    '''drop every item'''
+    def clear(self):
+        self.cells.clear()
+        self.item_cells.clear()
+        self.item_orders.clear()
+    '''add the item to the cells of a range'''
+    def link(self, item, cell_range):
+        cx0, cy0, cx1, cy1 = cell_range
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                self.cells.setdefault((cx, cy), dict())[item] = None
+    '''remove the item from the cells of a range'''
+    def unlink(self, item, cell_range):
+        cx0, cy0, cx1, cy1 = cell_range
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                cell = self.cells.get((cx, cy))
+                if cell is None: continue
+                cell.pop(item, None)
+                if not cell: del self.cells[(cx, cy)]
+    def __len__(self):
+        return len(self.item_cells)
+    def __contains__(self, item):
+        return item in self.item_cells
+
+
+'''Sprite group which keeps a SpatialHashGrid of its sprites in sync with add/remove/empty'''
+class SpatialHashGroup(pygame.sprite.Group):
+    def __init__(self, *sprites, cell_size=128):
+        self.grid = SpatialHashGrid(cell_size=cell_size)
+        pygame.sprite.Group.__init__(self, *sprites)
+    def add_internal(self, sprite, layer=None):
+        pygame.sprite.Group.add_internal(self, sprite, layer)
+        self.grid.insert(sprite, sprite.rect)
+    def remove_internal(self, sprite):
+        pygame.sprite.Group.remove_internal(self, sprite)
+        self.grid.remove(sprite)
+    '''re-bucket a sprite after its rect moved'''
+    def refresh(self, sprite):
+        self.grid.update(sprite, sprite.rect)
+    '''sprites colliding with the rect, optionally filtered, in the order they were added (like spritecollide)'''
+    def collide(self, rect, predicate=None):
+        collide_rect = rect.colliderect
+        return [
+            sprite for sprite in self.grid.candidates(rect) if collide_rect(sprite.rect) and (predicate is None or predicate(sprite))
+        ]
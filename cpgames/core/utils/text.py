@@ -0,0 +1,101 @@
+import threading
+import pygame
+from collections import OrderedDict
+
+
+
+'''Process-wide cache of rendered text with LRU eviction, HUD code draws the same strings every frame'''
+class TextRenderCache():
+    def __init__(self, max_entries=2048, **kwargs):
+        self.max_entries = max_entries
+        self.hits, self.misses = 0, 0
+        # (font, text, antialias, color, background, effect, effect_color, offset) -> surface
+        self.entries = OrderedDict()
+        # (path or name, size, system_font) -> font, so loops asking for the same font get the same object (and the same cache keys)
+        self.fonts = dict()
+        # the launcher may run several games on threads of the same process
+        self.lock = threading.RLock()
+        # fonts of a pygame session which was shut down crash when they are used, pygame.quit forgets its hooks so it is registered again per session
+        self.is_quit_hooked = False
+    '''Load a font once, a path of None is the pygame default font'''
+    def getfont(self, path, size, system_font=False):
+        key = (path, size, system_font)
+        with self.lock:
+            self.checksession()
+            if key not in self.fonts:
+                self.fonts[key] = pygame.font.SysFont(path, size) if system_font else pygame.font.Font(path, size)
+            return self.fonts[key]
+    '''Render a text, the returned surface is shared and should be copied before it is modified.
+    effect is None, 'glow' (four diagonal copies in effect_color under the text, brighter than color by default)
+    or 'outline' (a copy in effect_color at every shift of up to offset pixels on both axes, black by default)'''
+    def render(self, font, text, color, antialias=True, background=None, effect=None, effect_color=None, offset=1):
+        assert effect in [None, 'glow', 'outline']
+        # (255, 255, 255) and pygame.Color('white') should share an entry
+        text, color = str(text), tuple(pygame.Color(color))
+        if effect_color is None and effect == 'glow': effect_color = tuple(min(255, c + 50) for c in color[:3])
+        if effect_color is None and effect == 'outline': effect_color = (0, 0, 0)
+        if effect_color is not None: effect_color = tuple(pygame.Color(effect_color))
+        key = (font, text, antialias, color, None if background is None else tuple(pygame.Color(background)), effect, effect_color, offset)
+        with self.lock:
+            self.checksession()
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return self.entries[key]
+            self.misses += 1
+        if effect is None:
+            surface = font.render(text, antialias, color, background) if background is not None else font.render(text, antialias, color)
+        else:
+            surface = self.rendereffect(font, text, antialias, color, effect, effect_color, offset)
+        with self.lock:
+            self.entries[key] = surface
+            while len(self.entries) > self.max_entries: self.entries.popitem(last=False)
+        return surface
+    '''Compose a text over its glow or outline copies, the text itself sits offset pixels from the top left'''
+    @staticmethod
+    def rendereffect(font, text, antialias, color, effect, effect_color, offset):
+        text_surface = font.render(text, antialias, color)
+        effect_surface = font.render(text, antialias, effect_color)
+        if effect == 'glow':
+            shifts = [(offset, offset), (-offset, -offset), (offset, -offset), (-offset, offset)]
+        else:
+            # The whole square of shifts, the compass points alone leave gaps in outlines thicker than a pixel
+            shifts = [(dx, dy) for dx in range(-offset, offset + 1) for dy in range(-offset, offset + 1) if dx or dy]
+        width, height = text_surface.get_size()
+        surface = pygame.Surface((width + 2 * offset, height + 2 * offset), pygame.SRCALPHA)
+        for dx, dy in shifts:
+            surface.blit(effect_surface, (offset + dx, offset + dy))
+        surface.blit(text_surface, (offset, offset))
+        return surface
+    '''Draw a cached text with one of its rect anchors (topleft, center, midtop...) at the position, returns the rect drawn.
+    Texts with an effect are placed by the text itself, the glow or outline spills out of the rect'''
+    def blit(self, screen, font, text, color, position, anchor='topleft', **kwargs):
+        surface = self.render(font, text, color, **kwargs)
+        offset = kwargs.get('offset', 1) if kwargs.get('effect') else 0
+        rect = pygame.Rect(0, 0, surface.get_width() - 2 * offset, surface.get_height() - 2 * offset)
+        setattr(rect, anchor, position)
+        screen.blit(surface, (rect.left - offset, rect.top - offset))
+        return rect
+    '''Change the entry budget'''
+    def setmaxentries(self, max_entries):
+        with self.lock:
+            self.max_entries = max_entries
+            while len(self.entries) > self.max_entries: self.entries.popitem(last=False)
+    '''Drop the fonts and texts of a previous pygame session, and make sure the next pygame.quit drops the current ones'''
+    def checksession(self):
+        with self.lock:
+            # pygame.font.quit alone does not run the quit hooks
+            if not pygame.font.get_init(): self.clear()
+            if not self.is_quit_hooked:
+                pygame.register_quit(self.clear)
+                self.is_quit_hooked = True
+    '''Drop every cached text and font, called when pygame quits'''
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.fonts.clear()
+            self.is_quit_hooked = False
+
+
+'''the text cache shared by every game of the process'''
+SharedTextCache = TextRenderCache()
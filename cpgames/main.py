@@ -13,15 +13,17 @@ from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QLabel, QPushButton, QMessageBox,
     QGridLayout, QScrollArea, QGraphicsDropShadowEffect
 )
-from PyQt5.QtCore import Qt, pyqtSignal
+from PyQt5.QtCore import Qt, pyqtSignal, QTimer
 from PyQt5.QtGui import QIcon, QColor, QFont
 
-# Conditional import for core game implementations.
-# This assumes a 'core.py' file exists with your game classes.
-if __name__ == '__main__':
-    from core import *
+# Conditional import for the game registry. The game packages themselves are only
+# imported when a game is launched, so the card grid can be drawn without them.
+# Games are started in spawned processes which re-import this file as '__mp_main__',
+# so the script/package check is done on __package__ rather than __name__.
+if not __package__:
+    from core import GameRegistry, GameProcess, GameWorkerPool
 else:
-    from .core import *
+    from .core import GameRegistry, GameProcess, GameWorkerPool
 
 warnings.filterwarnings('ignore')
 
@@ -30,41 +32,18 @@ class CPGames():
     Manages the collection of supported games and their respective classes.
     """
     def __init__(self, **kwargs):
+        self.worker_pool = None
         for key, value in kwargs.items():
             setattr(self, key, value)
         self.supported_games = self.initialize()
 
     def initialize(self):
         """
-        Initializes and returns a dictionary of supported games.
-        Each game maps to its corresponding game class.
-        """
-        supported_games = {
-            'ski': SkiGame,
-            'maze': MazeGame,
-            'pacman': PacmanGame,
-            'gemgem': GemGemGame,
-            'tankwar': TankWarGame,
-            'sokoban': SokobanGame,
-            'pingpong': PingpongGame,
-            'trexrush': TRexRushGame,
-            'bomberman': BomberManGame,
-            'whacamole': WhacAMoleGame,
-            'catchcoins': CatchCoinsGame,
-            'flappybird': FlappyBirdGame,
-            'angrybirds': AngryBirdsGame,
-            'magictower': MagicTowerGame,
-            'aircraftwar': AircraftWarGame,
-            'bunnybadger': BunnyBadgerGame,
-            'minesweeper': MineSweeperGame,
-            'greedysnake': GreedySnakeGame,
-            'puzzlepieces': PuzzlePiecesGame,
-            'towerdefense': TowerDefenseGame,
-            'bloodfootball': BloodFootballGame,
-            'alieninvasion': AlienInvasionGame,
-            'breakoutclone': BreakoutcloneGame,
-            'twozerofoureight': TwoZeroFourEightGame,
-        }
+        Initializes and returns the registry of supported games.
+        Each game key maps to its module path and entry class name; indexing the
+        registry imports the module on first use.
+        """
+        supported_games = GameRegistry()
         return supported_games
 
     def get_game_keys(self):
@@ -73,6 +52,37 @@ class CPGames():
         """
         return list(self.supported_games.keys())
 
+    def load_game(self, game_name):
+        """
+        Imports (on first use) and returns the entry class of the given game.
+        """
+        return self.supported_games.load(game_name)
+
+    def start_worker_pool(self, size=1, max_games_per_worker=1, max_idle_time=None):
+        """
+        Starts a pool of warm worker processes which have already initialised pygame and
+        imported the games, so launching only costs the game's own setup.
+        """
+        self.worker_pool = GameWorkerPool(
+            self.supported_games, size=size, max_games_per_worker=max_games_per_worker, max_idle_time=max_idle_time,
+        )
+        return self.worker_pool
+
+    def start_game(self, game_name):
+        """
+        Starts the given game in a child process (a warm one from the pool if there is a pool)
+        and returns its GameProcess handle.
+        """
+        if self.worker_pool is not None:
+            return self.worker_pool.launch(game_name)
+        return GameProcess(game_name, self.supported_games)
+
+    def get_import_time(self, game_name):
+        """
+        Returns the seconds spent importing the given game, or None if it has not been imported yet.
+        """
+        return self.supported_games.getimporttime(game_name)
+
 # --- New Custom GameCard Widget ---
 class GameCard(QWidget):
     """
@@ -230,6 +240,12 @@ class GameLauncherWindow(QMainWindow):
     The main window for the game launcher, featuring a grid-based selection
     of game cards instead of a dropdown.
     """
+    # Warm worker pool: number of idle pre-initialised processes, games run by a worker
+    # before it is recycled, and seconds after which an idle worker is replaced (None: never).
+    WORKER_POOL_SIZE = 1
+    MAX_GAMES_PER_WORKER = 1
+    MAX_WORKER_IDLE_TIME = None
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Game Launcher")
@@ -239,6 +255,12 @@ class GameLauncherWindow(QMainWindow):
         self.setGeometry(100, 100, 800, 600) # Increased window size for card display
         self.selected_game_card = None # To keep track of the currently selected GameCard widget
         self.cp_games = CPGames()
+        self.cp_games.start_worker_pool(
+            size=self.WORKER_POOL_SIZE,
+            max_games_per_worker=self.MAX_GAMES_PER_WORKER,
+            max_idle_time=self.MAX_WORKER_IDLE_TIME,
+        )
+        self.game_processes = [] # GameProcess handles of the launched games
         # The self.qt_games list is no longer needed as we're performing a dynamic check.
         # However, to maintain the structure and for potential future use if specific
         # PyQt5 games need special handling, an empty list or a very minimal one can be kept.
@@ -343,6 +365,19 @@ class GameLauncherWindow(QMainWindow):
         self.launch_button.setEnabled(False) # Initially disabled until a game is selected
         main_layout.addWidget(self.launch_button, alignment=Qt.AlignCenter) # Center the button
 
+        # Status of the games running in child processes, refreshed by a timer.
+        self.status_label = QLabel("")
+        self.status_label.setAlignment(Qt.AlignCenter)
+        self.status_label.setStyleSheet("""
+            color: #E0E0E0;
+            font-size: 10pt;
+            margin-top: 10px;
+        """)
+        main_layout.addWidget(self.status_label)
+        self.status_timer = QTimer(self)
+        self.status_timer.timeout.connect(self.update_game_status)
+        self.status_timer.start(500)
+
     def populate_game_grid(self):
         """
         Populates the QGridLayout with GameCard widgets for each available game.
@@ -399,19 +434,42 @@ class GameLauncherWindow(QMainWindow):
             return
 
         selected_game_name = self.selected_game_card.game_name
-        game_class = self.cp_games.supported_games[selected_game_name]
-
-        # Dynamically check if the game class is a PyQt5 QWidget (or subclass)
-        # This is more robust than maintaining a manual list.
-        if issubclass(game_class, QWidget):
-            game_window = game_class()
-            game_window.setWindowTitle(f"{selected_game_name.replace('_', ' ').title()} - Game")
-            game_window.show()  # Display the game window.
-        else:
-            # For non-GUI games (like Pygame ones or console apps), use a thread to keep the launcher responsive.
-            import threading
-            threading.Thread(target=game_class().run, daemon=True).start()
-            QMessageBox.information(self, "Game Launched", f"{selected_game_name.replace('_', ' ').title()} is running in the background.")
+        # Games run in their own spawned process, so SDL never touches the Qt thread and
+        # QuitGame's sys.exit only ends that process. Several games can run at once.
+        self.game_processes.append(self.cp_games.start_game(selected_game_name))
+        self.update_game_status()
+        QMessageBox.information(self, "Game Launched", f"{selected_game_name.replace('_', ' ').title()} is running in a separate process.")
+
+    def update_game_status(self):
+        """
+        Polls the running game processes and shows their status, FPS and exit codes.
+        """
+        self.cp_games.worker_pool.poll() # Recycle finished workers and top the pool up
+        lines = []
+        for game_process in self.game_processes:
+            status = game_process.poll()
+            line = f"{game_process.key.replace('_', ' ').title()}: {status}"
+            if status in ('exited', 'failed'):
+                line += f" (exit code {game_process.exit_code})"
+            elif game_process.fps is not None:
+                line += f" - {game_process.fps:.1f} FPS"
+            lines.append(line)
+        # Keep the running games and only the last few finished ones.
+        running = [p for p in self.game_processes if p.isalive()]
+        finished = [p for p in self.game_processes if not p.isalive()]
+        self.game_processes = finished[-3:] + running
+        self.status_label.setText("\n".join(lines))
+
+    def closeEvent(self, event):
+        """
+        Asks the running games to quit before the launcher closes.
+        """
+        self.status_timer.stop()
+        for game_process in self.game_processes:
+            if game_process.isalive():
+                game_process.stop()
+        self.cp_games.worker_pool.shutdown()
+        super().closeEvent(event)
 
 if __name__ == '__main__':
     app = QApplication(sys.argv)
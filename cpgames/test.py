@@ -17,9 +17,9 @@ from PyQt5.QtGui import QIcon
 
 # Conditional import for core game implementations.
 if __name__ == '__main__':
-    from core import *
+    from core import GameRegistry
 else:
-    from .core import *
+    from .core import GameRegistry
 
 warnings.filterwarnings('ignore')
 
@@ -31,32 +31,7 @@ class CPGames():
         self.supported_games = self.initialize()
 
     def initialize(self):
-        supported_games = {
-            'ski': SkiGame,
-            'maze': MazeGame,
-            'pacman': PacmanGame,
-            'gemgem': GemGemGame,
-            'tankwar': TankWarGame,
-            'sokoban': SokobanGame,
-            'pingpong': PingpongGame,
-            'trexrush': TRexRushGame,
-            'bomberman': BomberManGame,
-            'whacamole': WhacAMoleGame,
-            'catchcoins': CatchCoinsGame,
-            'flappybird': FlappyBirdGame,
-            'angrybirds': AngryBirdsGame,
-            'magictower': MagicTowerGame,
-            'aircraftwar': AircraftWarGame,
-            'bunnybadger': BunnyBadgerGame,
-            'minesweeper': MineSweeperGame,
-            'greedysnake': GreedySnakeGame,
-            'puzzlepieces': PuzzlePiecesGame,
-            'towerdefense': TowerDefenseGame,
-            'bloodfootball': BloodFootballGame,
-            'alieninvasion': AlienInvasionGame,
-            'breakoutclone': BreakoutcloneGame,
-            'twozerofoureight': TwoZeroFourEightGame,
-        }
+        supported_games = GameRegistry()
         return supported_games
 
     def get_game_keys(self):
@@ -0,0 +1,51 @@
+'''Regression checks for the sleeping bodies of the angrybirds physics loop'''
+import os
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+import pytest
+pygame = pytest.importorskip('pygame')
+from cpgames.core.utils import io
+from cpgames.core.games.angrybirds.angrybirds import AngryBirdsGame
+from cpgames.core.games.angrybirds.modules import gamelevels
+from cpgames.core.games.angrybirds.modules.misc import VelocityVector
+from cpgames.core.games.angrybirds.modules.sprites import Bird, Pig, Slab
+
+
+class StopLevel(Exception):
+    pass
+
+
+'''Run GameLevels.start on a hand made level for a number of frames, returns the y of the first bird after every frame'''
+def runlevel(monkeypatch, buildlevel, num_frames):
+    monkeypatch.setattr(io.PygameResourceLoader, 'playbgm', lambda self, *args, **kwargs: None)
+    game = AngryBirdsGame()
+    levels = gamelevels.GameLevels(game.cfg, game.resource_loader, game.screen)
+    sprites = buildlevel(game.screen, game.resource_loader.images)
+    trace = []
+    class FakeClock():
+        def tick(self, fps=0):
+            trace.append((sprites['birds'][0].loc_info[1], getattr(sprites['birds'][0], 'is_sleeping', False)))
+            if len(trace) >= num_frames: raise StopLevel()
+    monkeypatch.setattr(levels, 'loadlevelmap', lambda: sprites)
+    monkeypatch.setattr(levels, 'switchlevelinterface', lambda: (_ for _ in ()).throw(StopLevel()))
+    monkeypatch.setattr(levels, 'failureinterface', lambda: (_ for _ in ()).throw(StopLevel()))
+    monkeypatch.setattr(pygame.time, 'Clock', FakeClock)
+    monkeypatch.setattr(pygame.event, 'get', lambda: [])
+    monkeypatch.setattr(pygame.display, 'update', lambda *args: None)
+    with pytest.raises(StopLevel):
+        levels.start()
+    return sprites, trace
+
+
+def test_bird_sleeping_on_slab_stays_on_it(monkeypatch):
+    def buildlevel(screen, images):
+        # The bird drops off the slingshot onto a slab, the pig keeps bouncing so the level is never still
+        birds = [Bird(screen, images['bird'], (200, 500, 20), velocity=VelocityVector(0.5, 0)) for _ in range(2)]
+        birds[0].start_flying = True
+        pig = Pig(screen, images['pig'], (1500, 100, 20), velocity=VelocityVector(8, 0))
+        slab = Slab(screen, images['wall'], 100, 560, 200, 20)
+        return {'birds': birds, 'pigs': [pig], 'blocks': [], 'walls': [slab]}
+    sprites, trace = runlevel(monkeypatch, buildlevel, 350)
+    slab, bird = sprites['walls'][0], sprites['birds'][0]
+    assert any(is_sleeping for _, is_sleeping in trace)
+    assert max(y for y, _ in trace) + bird.loc_info[2] <= slab.y + 1
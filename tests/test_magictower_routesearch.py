@@ -0,0 +1,52 @@
+'''Regression checks for the offline route search of magictower'''
+import os
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+import pytest
+pytest.importorskip('pygame')
+from cpgames.core.games.magictower.magictower import Config
+from cpgames.core.games.magictower.modules.gamelevels import GameLevels
+from cpgames.core.games.magictower.modules.routesearch import RouteSearch, TowerState, verifytower
+
+
+def test_first_floors_are_beatable():
+    result = verifytower(Config.MAPPATHS[:3])
+    assert result['found'] and not result['exhausted']
+    assert result['nodes'] <= 10
+    assert result['best_floor'] == 2
+    assert result['route'][0] == (0, (5, 8), '24')
+    assert result['route'][-1][0] == 1
+    assert result['state'].vector() == (860, 10, 10, 1, 1, 1, 4, 4, 1)
+
+
+def test_budget_exhaustion_is_reported_as_unknown():
+    result = verifytower(Config.MAPPATHS[:5], max_nodes=1)
+    assert not result['found'] and not result['exhausted']
+    assert result['nodes'] == 1
+
+
+def test_buy_applies_costs_and_refuses_unaffordable_choices():
+    state = TowerState(num_coins=30)
+    GameLevels.buy(state, coins_cost=25, add_attack_power=4)
+    assert (state.num_coins, state.attack_power) == (5, 14)
+    GameLevels.buy(state, coins_cost=25, add_defense_power=4)
+    assert (state.num_coins, state.defense_power) == (5, 10)
+    state = TowerState(experience=100)
+    GameLevels.buy(state, experience_cost=100, add_level=1)
+    assert state.vector() == TowerState(level=2, life_value=2000, attack_power=17, defense_power=17).vector()
+
+
+def test_shop_choices_are_search_actions():
+    search = RouteSearch(map_paths=Config.MAPPATHS[:4])
+    shop_cells = [
+        (3, col_idx, row_idx) for row_idx, row in enumerate(search.map_parsers[3].map_matrix) for col_idx, elem in enumerate(row)
+        if 'buy_from_shop' in search.collide(TowerState(), {}, (3, col_idx, row_idx))[2]
+    ]
+    assert shop_cells
+    choices = GameLevels.getshopchoices(3, 'buy_from_shop')
+    # The last choice of every menu leaves it
+    assert len(choices) == 4
+    actions = [action for action in search.actions(TowerState(num_coins=25), {}, {shop_cells[0]}) if action[3] == {}]
+    assert [choice for _, choice, _, _ in actions] == [choice for choice, _ in choices[:-1]]
+    assert [new_state.vector()[:3] for _, _, new_state, _ in actions] == [(1800, 10, 10), (1000, 14, 10), (1000, 10, 14)]
+    assert search.actions(TowerState(num_coins=24), {}, {shop_cells[0]}) == []
@@ -0,0 +1,54 @@
+'''Regression checks for the shared text render cache'''
+import os
+import sys
+import subprocess
+import pytest
+pytest.importorskip('pygame')
+
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+'''Run a snippet in a fresh interpreter, fonts of a quit pygame session crash the whole process when they are used'''
+def runheadless(code):
+    env = dict(os.environ, SDL_VIDEODRIVER='dummy', SDL_AUDIODRIVER='dummy', PYTHONPATH=ROOT_DIR)
+    return subprocess.run([sys.executable, '-c', code], cwd=ROOT_DIR, env=env, capture_output=True, text=True, timeout=60)
+
+
+def test_fonts_are_reloaded_after_pygame_quit():
+    result = runheadless('''
+import pygame
+from cpgames.core.utils import SharedTextCache, QuitGame
+from cpgames.core.games.twozerofoureight.twozerofoureight import Config
+pygame.init()
+screen = pygame.display.set_mode((200, 100))
+font = SharedTextCache.getfont(Config.FONTPATH, 20)
+SharedTextCache.blit(screen, font, 'Score: 1', (255, 255, 255), (0, 0))
+try:
+    QuitGame()
+except SystemExit:
+    pass
+pygame.init()
+screen = pygame.display.set_mode((200, 100))
+new_font = SharedTextCache.getfont(Config.FONTPATH, 20)
+assert new_font is not font
+SharedTextCache.blit(screen, new_font, 'Score: 2', (255, 255, 255), (0, 0))
+print('ok')
+''')
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip().endswith('ok')
+
+
+def test_clear_drops_fonts():
+    result = runheadless('''
+import pygame
+from cpgames.core.utils import SharedTextCache
+pygame.init()
+font = SharedTextCache.getfont(None, 20)
+SharedTextCache.render(font, 'a', (0, 0, 0))
+SharedTextCache.clear()
+assert not SharedTextCache.fonts and not SharedTextCache.entries
+assert SharedTextCache.getfont(None, 20) is not font
+print('ok')
+''')
+    assert result.returncode == 0, result.stderr